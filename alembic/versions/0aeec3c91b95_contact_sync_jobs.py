@@ -0,0 +1,62 @@
+"""contact sync jobs
+
+Revision ID: 0aeec3c91b95
+Revises: 284831d78d4c
+Create Date: 2026-10-18 12:41:23.590184
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0aeec3c91b95'
+down_revision: Union[str, None] = '284831d78d4c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+
+    # create_tables() may already have created the (empty) tables at startup
+    if not inspector.has_table('contact_sync_jobs'):
+        op.create_table(
+            'contact_sync_jobs',
+            sa.Column('id', sa.String(length=36), nullable=False),
+            sa.Column('owner_id', sa.Integer(), nullable=False),
+            sa.Column('status', sa.Enum('QUEUED', 'RUNNING', 'COMPLETED', 'FAILED', name='contactsyncjobstatus'), nullable=False),
+            sa.Column('contacts', sa.JSON(), nullable=False),
+            sa.Column('total_contacts', sa.Integer(), nullable=False),
+            sa.Column('processed_contacts', sa.Integer(), nullable=False),
+            sa.Column('chunks_completed', sa.Integer(), nullable=False),
+            sa.Column('match_count', sa.Integer(), nullable=False),
+            sa.Column('error', sa.String(length=1000), nullable=True),
+            sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+            sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+            sa.Column('completed_at', sa.DateTime(timezone=True), nullable=True),
+            sa.ForeignKeyConstraint(['owner_id'], ['users.id'], ondelete='CASCADE'),
+            sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index(op.f('ix_contact_sync_jobs_owner_id'), 'contact_sync_jobs', ['owner_id'], unique=False)
+        op.create_index('idx_contact_sync_job_status', 'contact_sync_jobs', ['status', 'updated_at'], unique=False)
+
+    if not inspector.has_table('contact_sync_job_chunks'):
+        op.create_table(
+            'contact_sync_job_chunks',
+            sa.Column('job_id', sa.String(length=36), nullable=False),
+            sa.Column('chunk_index', sa.Integer(), nullable=False),
+            sa.Column('matches', sa.JSON(), nullable=False),
+            sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+            sa.ForeignKeyConstraint(['job_id'], ['contact_sync_jobs.id'], ondelete='CASCADE'),
+            sa.PrimaryKeyConstraint('job_id', 'chunk_index')
+        )
+
+
+def downgrade() -> None:
+    op.drop_table('contact_sync_job_chunks')
+    op.drop_index('idx_contact_sync_job_status', table_name='contact_sync_jobs')
+    op.drop_index(op.f('ix_contact_sync_jobs_owner_id'), table_name='contact_sync_jobs')
+    op.drop_table('contact_sync_jobs')
@@ -0,0 +1,55 @@
+"""room participant counters
+
+Revision ID: 0e3d62fefbc6
+Revises: 2e69f4337af9
+Create Date: 2026-10-18 21:02:14.658930
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0e3d62fefbc6'
+down_revision: Union[str, None] = '2e69f4337af9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Counter -> participant status it counts (None counts every participant)
+COUNTERS = {'approved_count': 'approved', 'pending_count': 'pending', 'total_count': None}
+# Statuses older code stored verbatim from the participant action
+ACTION_STATUSES = {'approve': 'approved', 'reject': 'rejected', 'ban': 'banned'}
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+
+    columns = {column['name'] for column in sa.inspect(bind).get_columns('rooms')}
+    for counter in COUNTERS:
+        if counter not in columns:
+            op.add_column('rooms', sa.Column(counter, sa.Integer(), server_default='0', nullable=False))
+
+    rooms = sa.table('rooms', sa.column('id', sa.String), *[sa.column(counter, sa.Integer) for counter in COUNTERS])
+    participants = sa.table('room_participants', sa.column('room_id', sa.String), sa.column('status', sa.String))
+
+    # Rewrite action verbs to their statuses first, so the backfill counts them
+    bind.execute(
+        participants.update()
+        .where(participants.c.status.in_(list(ACTION_STATUSES)))
+        .values(status=sa.case(ACTION_STATUSES, value=participants.c.status))
+    )
+
+    # Backfill from room_participants
+    bind.execute(rooms.update().values(**{
+        counter: sa.select(sa.func.count()).select_from(participants)
+        .where(participants.c.room_id == rooms.c.id, *([] if status is None else [participants.c.status == status]))
+        .scalar_subquery()
+        for counter, status in COUNTERS.items()
+    }))
+
+
+def downgrade() -> None:
+    for counter in COUNTERS:
+        op.drop_column('rooms', counter)
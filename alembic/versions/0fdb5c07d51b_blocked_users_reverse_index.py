@@ -0,0 +1,29 @@
+"""blocked users reverse index
+
+Revision ID: 0fdb5c07d51b
+Revises: 51e2ec1b94e9
+Create Date: 2026-10-18 17:48:10.664052
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0fdb5c07d51b'
+down_revision: Union[str, None] = '51e2ec1b94e9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Block sets look users up from the blocked side as well
+    indexes = {index['name'] for index in sa.inspect(op.get_bind()).get_indexes('blocked_users')}
+    if 'idx_blocked_users_blocked' not in indexes:
+        op.create_index('idx_blocked_users_blocked', 'blocked_users', ['blocked_id', 'blocker_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('idx_blocked_users_blocked', table_name='blocked_users')
@@ -0,0 +1,44 @@
+"""friend suggestions
+
+Revision ID: 196257343320
+Revises: 0fdb5c07d51b
+Create Date: 2026-10-18 18:35:27.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '196257343320'
+down_revision: Union[str, None] = '0fdb5c07d51b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Filled by the suggestion engine on its first run
+    if not sa.inspect(op.get_bind()).has_table('friend_suggestions'):
+        op.create_table(
+            'friend_suggestions',
+            sa.Column('user_id', sa.Integer(), nullable=False),
+            sa.Column('suggested_user_id', sa.Integer(), nullable=False),
+            sa.Column('rank', sa.Integer(), nullable=False),
+            sa.Column('score', sa.Float(), nullable=False),
+            sa.Column('mutual_friends', sa.Integer(), nullable=False),
+            sa.Column('shared_contacts', sa.Integer(), nullable=False),
+            sa.Column('in_contacts', sa.Boolean(), nullable=False),
+            sa.Column('run_id', sa.Integer(), nullable=False),
+            sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+            sa.ForeignKeyConstraint(['suggested_user_id'], ['users.id'], ondelete='CASCADE'),
+            sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+            sa.PrimaryKeyConstraint('user_id', 'suggested_user_id')
+        )
+        op.create_index('idx_friend_suggestion_rank', 'friend_suggestions', ['user_id', 'rank'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('idx_friend_suggestion_rank', table_name='friend_suggestions')
+    op.drop_table('friend_suggestions')
@@ -0,0 +1,37 @@
+"""contact sync state
+
+Revision ID: 1d1d2b6ad733
+Revises: 8331980524ca
+Create Date: 2026-10-18 10:34:52.861930
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '1d1d2b6ad733'
+down_revision: Union[str, None] = '8331980524ca'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # create_tables() may already have created the (empty) table at startup.
+    # Owners without a row get no fingerprint and fall back to a full sync.
+    if not sa.inspect(op.get_bind()).has_table('contact_sync_state'):
+        op.create_table(
+            'contact_sync_state',
+            sa.Column('owner_id', sa.Integer(), nullable=False),
+            sa.Column('fingerprint', sa.String(length=64), nullable=False),
+            sa.Column('contact_count', sa.Integer(), nullable=True),
+            sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+            sa.ForeignKeyConstraint(['owner_id'], ['users.id'], ondelete='CASCADE'),
+            sa.PrimaryKeyConstraint('owner_id')
+        )
+
+
+def downgrade() -> None:
+    op.drop_table('contact_sync_state')
@@ -0,0 +1,38 @@
+"""contact adjacency
+
+Revision ID: 284831d78d4c
+Revises: 7ddc269f4a7f
+Create Date: 2026-10-18 11:52:09.317642
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '284831d78d4c'
+down_revision: Union[str, None] = '7ddc269f4a7f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # create_tables() may already have created the (empty) table at startup.
+    # Arrays are built from contact_registry on first read, so there is nothing to backfill.
+    if not sa.inspect(op.get_bind()).has_table('contact_adjacency'):
+        op.create_table(
+            'contact_adjacency',
+            sa.Column('owner_id', sa.Integer(), nullable=False),
+            # A 4 MiB length makes MySQL pick MEDIUMBLOB
+            sa.Column('contact_ids', sa.LargeBinary(length=4 * 1024 * 1024), nullable=False),
+            sa.Column('contact_count', sa.Integer(), nullable=True),
+            sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+            sa.ForeignKeyConstraint(['owner_id'], ['users.id'], ondelete='CASCADE'),
+            sa.PrimaryKeyConstraint('owner_id')
+        )
+
+
+def downgrade() -> None:
+    op.drop_table('contact_adjacency')
@@ -0,0 +1,44 @@
+"""user birthday key
+
+Revision ID: 29cf01f0223d
+Revises: 196257343320
+Create Date: 2026-10-18 19:12:40.532961
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '29cf01f0223d'
+down_revision: Union[str, None] = '196257343320'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+
+    columns = {column['name'] for column in inspector.get_columns('users')}
+    if 'birthday_key' not in columns:
+        op.add_column('users', sa.Column('birthday_key', sa.SmallInteger(), nullable=True))
+
+    indexes = {index['name'] for index in inspector.get_indexes('users')}
+    if 'ix_users_birthday_key' not in indexes:
+        op.create_index('ix_users_birthday_key', 'users', ['birthday_key'], unique=False)
+
+    # Backfill month * 100 + day from date_of_birth
+    users = sa.table('users', sa.column('date_of_birth', sa.Date), sa.column('birthday_key', sa.SmallInteger))
+    bind.execute(
+        users.update()
+        .where(users.c.date_of_birth.isnot(None))
+        .values(birthday_key=sa.extract('month', users.c.date_of_birth) * 100 + sa.extract('day', users.c.date_of_birth))
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_users_birthday_key', table_name='users')
+    op.drop_column('users', 'birthday_key')
@@ -0,0 +1,35 @@
+"""cache change log
+
+Revision ID: 2db8f5e84527
+Revises: 0e3d62fefbc6
+Create Date: 2026-10-18 22:14:37.208416
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2db8f5e84527'
+down_revision: Union[str, None] = '0e3d62fefbc6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # create_tables() may already have created the (empty) table at startup.
+    # Caches treat generations missing from the log as a gap and rebuild.
+    if not sa.inspect(op.get_bind()).has_table('cache_changes'):
+        op.create_table(
+            'cache_changes',
+            sa.Column('name', sa.String(length=64), nullable=False),
+            sa.Column('generation', sa.Integer(), nullable=False),
+            sa.Column('key', sa.String(length=64), nullable=False),
+            sa.PrimaryKeyConstraint('name', 'generation', 'key')
+        )
+
+
+def downgrade() -> None:
+    op.drop_table('cache_changes')
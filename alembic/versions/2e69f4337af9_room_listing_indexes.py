@@ -0,0 +1,38 @@
+"""room listing indexes
+
+Revision ID: 2e69f4337af9
+Revises: d2bd87c5907e
+Create Date: 2026-10-18 20:21:37.904118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2e69f4337af9'
+down_revision: Union[str, None] = 'd2bd87c5907e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+
+    indexes = {index['name'] for index in inspector.get_indexes('rooms')}
+    if 'idx_room_archived_created' not in indexes:
+        op.create_index('idx_room_archived_created', 'rooms', ['is_archived', 'created_at', 'id'], unique=False)
+    if 'idx_room_owner_created' not in indexes:
+        op.create_index('idx_room_owner_created', 'rooms', ['owner_id', 'created_at', 'id'], unique=False)
+
+    indexes = {index['name'] for index in inspector.get_indexes('room_participants')}
+    if 'idx_participant_user_status' not in indexes:
+        op.create_index('idx_participant_user_status', 'room_participants', ['user_id', 'status', 'room_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('idx_participant_user_status', table_name='room_participants')
+    op.drop_index('idx_room_owner_created', table_name='rooms')
+    op.drop_index('idx_room_archived_created', table_name='rooms')
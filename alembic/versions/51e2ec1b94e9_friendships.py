@@ -0,0 +1,65 @@
+"""friendships
+
+Revision ID: 51e2ec1b94e9
+Revises: 9a7ccf17c3bb
+Create Date: 2026-10-18 16:21:54.330918
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '51e2ec1b94e9'
+down_revision: Union[str, None] = '9a7ccf17c3bb'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 5000
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+
+    if not sa.inspect(bind).has_table('friendships'):
+        op.create_table(
+            'friendships',
+            sa.Column('user_id', sa.Integer(), nullable=False),
+            sa.Column('friend_id', sa.Integer(), nullable=False),
+            sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+            sa.ForeignKeyConstraint(['friend_id'], ['users.id'], ondelete='CASCADE'),
+            sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+            sa.PrimaryKeyConstraint('user_id', 'friend_id')
+        )
+
+    # Backfill both directions of every accepted request
+    friend_requests = sa.table(
+        'friend_requests',
+        sa.column('requester_id', sa.Integer),
+        sa.column('receiver_id', sa.Integer),
+        sa.column('status', sa.String)
+    )
+    friendships = sa.table('friendships', sa.column('user_id', sa.Integer), sa.column('friend_id', sa.Integer))
+
+    edges = set()
+    for requester_id, receiver_id in bind.execute(
+        sa.select(friend_requests.c.requester_id, friend_requests.c.receiver_id)
+        .where(friend_requests.c.status == 'ACCEPTED')
+    ):
+        if requester_id != receiver_id:
+            edges.add((requester_id, receiver_id))
+            edges.add((receiver_id, requester_id))
+
+    bind.execute(friendships.delete())
+    edges = sorted(edges)
+    for i in range(0, len(edges), BATCH_SIZE):
+        bind.execute(friendships.insert(), [
+            {'user_id': user_id, 'friend_id': friend_id}
+            for user_id, friend_id in edges[i:i + BATCH_SIZE]
+        ])
+
+
+def downgrade() -> None:
+    op.drop_table('friendships')
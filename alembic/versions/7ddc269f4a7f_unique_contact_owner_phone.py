@@ -0,0 +1,39 @@
+"""unique contact owner phone
+
+Revision ID: 7ddc269f4a7f
+Revises: 1d1d2b6ad733
+Create Date: 2026-10-18 11:03:27.118406
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7ddc269f4a7f'
+down_revision: Union[str, None] = '1d1d2b6ad733'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    indexes = {index['name'] for index in sa.inspect(op.get_bind()).get_indexes('contact_registry')}
+    if 'uq_contact_owner_phone' in indexes:
+        return
+
+    # Keep one row per (owner_id, phone_number) before enforcing uniqueness.
+    # The derived table lets MySQL delete from the table it selects from.
+    op.execute(
+        "DELETE FROM contact_registry WHERE id NOT IN ("
+        " SELECT id FROM ("
+        "  SELECT MIN(id) AS id FROM contact_registry GROUP BY owner_id, phone_number"
+        " ) AS keep_rows"
+        ")"
+    )
+    op.create_index('uq_contact_owner_phone', 'contact_registry', ['owner_id', 'phone_number'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index('uq_contact_owner_phone', table_name='contact_registry')
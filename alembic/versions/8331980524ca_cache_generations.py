@@ -0,0 +1,35 @@
+"""cache generations
+
+Revision ID: 8331980524ca
+Revises: 8dc09f243b54
+Create Date: 2026-10-18 09:58:16.430275
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8331980524ca'
+down_revision: Union[str, None] = '8dc09f243b54'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # create_tables() may already have created the (empty) table at startup.
+    # A missing row reads as generation 0, so there is nothing to backfill.
+    if not sa.inspect(op.get_bind()).has_table('cache_generations'):
+        op.create_table(
+            'cache_generations',
+            sa.Column('name', sa.String(length=64), nullable=False),
+            sa.Column('generation', sa.Integer(), nullable=False),
+            sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+            sa.PrimaryKeyConstraint('name')
+        )
+
+
+def downgrade() -> None:
+    op.drop_table('cache_generations')
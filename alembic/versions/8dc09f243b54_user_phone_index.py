@@ -0,0 +1,82 @@
+"""user phone index
+
+Revision ID: 8dc09f243b54
+Revises:
+Create Date: 2026-10-18 09:12:41.502113
+
+"""
+from typing import List, Optional, Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8dc09f243b54'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 5000
+
+
+# The phone index keys as of this revision, frozen so later changes to
+# feature.utils.phone_utils cannot change what it writes
+def get_index_keys(phone: Optional[str]) -> List[str]:
+    normalized = ''.join(filter(str.isdigit, phone or ""))
+    if len(normalized) < 8:  # Not a valid phone length
+        return []
+
+    keys = [normalized]
+
+    # Also index the number without its country code
+    if len(normalized) > 10:
+        keys.append(normalized[-10:])
+        keys.append(normalized[-9:])
+
+    return keys
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+
+    # create_tables() may already have created the (empty) table at startup
+    if not sa.inspect(bind).has_table('user_phone_index'):
+        op.create_table(
+            'user_phone_index',
+            sa.Column('phone_key', sa.String(length=20), nullable=False),
+            sa.Column('user_id', sa.Integer(), nullable=False),
+            sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+            sa.PrimaryKeyConstraint('phone_key', 'user_id')
+        )
+        op.create_index(op.f('ix_user_phone_index_user_id'), 'user_phone_index', ['user_id'], unique=False)
+
+    # Backfill from existing users
+    users = sa.table('users', sa.column('id', sa.Integer), sa.column('phone', sa.String))
+    phone_index = sa.table('user_phone_index', sa.column('phone_key', sa.String), sa.column('user_id', sa.Integer))
+
+    bind.execute(phone_index.delete())
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(users.c.id, users.c.phone)
+            .where(users.c.phone.isnot(None), users.c.id > last_id)
+            .order_by(users.c.id)
+            .limit(BATCH_SIZE)
+        ).fetchall()
+        if not rows:
+            break
+
+        mappings = {}
+        for user_id, phone in rows:
+            for key in get_index_keys(phone):
+                mappings[(key, user_id)] = {'phone_key': key, 'user_id': user_id}
+        if mappings:
+            bind.execute(phone_index.insert(), list(mappings.values()))
+
+        last_id = rows[-1][0]
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_user_phone_index_user_id'), table_name='user_phone_index')
+    op.drop_table('user_phone_index')
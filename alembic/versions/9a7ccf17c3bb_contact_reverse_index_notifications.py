@@ -0,0 +1,182 @@
+"""contact reverse index and notifications
+
+Revision ID: 9a7ccf17c3bb
+Revises: d15e603270dc
+Create Date: 2026-10-18 15:02:33.871406
+
+"""
+import os
+import re
+from typing import Dict, Optional, Sequence, Tuple, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9a7ccf17c3bb'
+down_revision: Union[str, None] = 'd15e603270dc'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 5000
+
+# The phone canonicalization rules as of this revision, frozen so later
+# changes to feature.utils.phone_normalizer cannot change what it writes
+CALLING_CODES: Dict[str, Tuple[int, ...]] = {
+    "1": (10,), "7": (10,), "20": (10,), "27": (9,), "30": (10,), "31": (9,),
+    "32": (8, 9), "33": (9,), "34": (9,), "36": (8, 9), "39": tuple(range(6, 12)),
+    "40": (9,), "41": (9,), "43": tuple(range(7, 14)), "44": (9, 10), "45": (8,),
+    "46": tuple(range(7, 11)), "47": (8,), "48": (9,), "49": tuple(range(6, 14)),
+    "51": (9,), "52": (10,), "54": (10,), "55": (10, 11), "56": (9,), "57": (10,),
+    "60": (9, 10), "61": (9,), "62": tuple(range(9, 13)), "63": (10,), "64": (8, 9, 10),
+    "65": (8,), "66": (9,), "81": (9, 10), "82": (9, 10), "84": (9, 10), "86": (10, 11),
+    "90": (10,), "91": (10,), "92": (10,), "93": (9,), "94": (9,), "95": (8, 9, 10),
+    "98": (10,), "212": (9,), "234": (10,), "254": (9,), "255": (9,), "256": (9,),
+    "351": (9,), "353": (9,), "358": tuple(range(6, 11)), "852": (8,), "880": (10,),
+    "886": (9,), "961": (7, 8), "962": (9,), "965": (8,), "966": (9,), "971": (8, 9),
+    "972": (9,), "974": (8,), "977": (10,),
+}
+
+REGIONS: Dict[str, Tuple[str, str]] = {
+    "US": ("1", "1"), "CA": ("1", "1"), "RU": ("7", "8"), "EG": ("20", "0"),
+    "ZA": ("27", "0"), "GR": ("30", ""), "NL": ("31", "0"), "BE": ("32", "0"),
+    "FR": ("33", "0"), "ES": ("34", ""), "HU": ("36", "06"), "IT": ("39", ""),
+    "RO": ("40", "0"), "CH": ("41", "0"), "AT": ("43", "0"), "GB": ("44", "0"),
+    "DK": ("45", ""), "SE": ("46", "0"), "NO": ("47", ""), "PL": ("48", ""),
+    "DE": ("49", "0"), "PE": ("51", "0"), "MX": ("52", ""), "AR": ("54", "0"),
+    "BR": ("55", "0"), "CL": ("56", ""), "CO": ("57", ""), "MY": ("60", "0"),
+    "AU": ("61", "0"), "ID": ("62", "0"), "PH": ("63", "0"), "NZ": ("64", "0"),
+    "SG": ("65", ""), "TH": ("66", "0"), "JP": ("81", "0"), "KR": ("82", "0"),
+    "VN": ("84", "0"), "CN": ("86", "0"), "TR": ("90", "0"), "IN": ("91", "0"),
+    "PK": ("92", "0"), "AF": ("93", "0"), "LK": ("94", "0"), "MM": ("95", "0"),
+    "IR": ("98", "0"), "MA": ("212", "0"), "NG": ("234", "0"), "KE": ("254", "0"),
+    "TZ": ("255", "0"), "UG": ("256", "0"), "PT": ("351", ""), "IE": ("353", "0"),
+    "FI": ("358", "0"), "HK": ("852", ""), "BD": ("880", "0"), "TW": ("886", "0"),
+    "LB": ("961", "0"), "JO": ("962", "0"), "KW": ("965", ""), "SA": ("966", "0"),
+    "AE": ("971", "0"), "IL": ("972", "0"), "QA": ("974", ""), "NP": ("977", "0"),
+}
+
+_REGION_BY_CODE: Dict[str, str] = {}
+for _region, (_code, _trunk) in REGIONS.items():
+    _REGION_BY_CODE.setdefault(_code, _region)
+
+_STRIP = re.compile(r"[^\d+]+")
+
+
+def _split_international(digits: str) -> Optional[str]:
+    for length in range(1, 4):
+        national_lengths = CALLING_CODES.get(digits[:length])
+        if national_lengths and len(digits) - length in national_lengths:
+            return "+" + digits
+    return None
+
+
+def to_e164(phone: Optional[str], region: str) -> Optional[str]:
+    if not phone:
+        return None
+    cleaned = _STRIP.sub("", phone)
+    digits = cleaned.replace("+", "")
+    if cleaned.startswith("+"):
+        return "+" + digits if 8 <= len(digits) <= 15 else None
+
+    country_code, trunk = REGIONS.get(region, ("", "0"))
+    for prefix in (("011",) if country_code == "1" else ("00",)):
+        if digits.startswith(prefix):
+            digits = digits[len(prefix):]
+            return "+" + digits if 8 <= len(digits) <= 15 else None
+
+    if country_code:
+        national_lengths = CALLING_CODES.get(country_code, ())
+        if len(digits) in national_lengths:
+            return "+" + country_code + digits
+        if trunk and digits.startswith(trunk) and len(digits) - len(trunk) in national_lengths:
+            return "+" + country_code + digits[len(trunk):]
+
+    return _split_international(digits)
+
+
+def region_for_phone(phone: Optional[str], default_region: str) -> str:
+    if not phone or not phone.startswith("+"):
+        return default_region
+    digits = phone[1:]
+    for length in range(3, 0, -1):
+        region = _REGION_BY_CODE.get(digits[:length])
+        if region:
+            return region
+    return default_region
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+
+    columns = {column['name'] for column in inspector.get_columns('contact_registry')}
+    if 'normalized_phone' not in columns:
+        op.add_column('contact_registry', sa.Column('normalized_phone', sa.String(length=20), nullable=True))
+
+    indexes = {index['name'] for index in inspector.get_indexes('contact_registry')}
+    if 'idx_contact_normalized_phone' not in indexes:
+        op.create_index('idx_contact_normalized_phone', 'contact_registry', ['normalized_phone', 'registered_user_id'], unique=False)
+    if 'idx_contact_registered_user' not in indexes:
+        op.create_index('idx_contact_registered_user', 'contact_registry', ['registered_user_id', 'owner_id'], unique=False)
+
+    if not inspector.has_table('notifications'):
+        op.create_table(
+            'notifications',
+            sa.Column('id', sa.String(length=36), nullable=False),
+            sa.Column('user_id', sa.Integer(), nullable=False),
+            sa.Column('type', sa.Enum('CONTACT_JOINED', name='notificationtype'), nullable=False),
+            sa.Column('actor_user_id', sa.Integer(), nullable=True),
+            sa.Column('message', sa.String(length=500), nullable=False),
+            sa.Column('is_read', sa.Boolean(), nullable=False),
+            sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+            sa.ForeignKeyConstraint(['actor_user_id'], ['users.id'], ondelete='CASCADE'),
+            sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+            sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index('idx_notification_user_created', 'notifications', ['user_id', 'created_at'], unique=False)
+
+    # Backfill normalized_phone, reading each number in its owner's region
+    users = sa.table('users', sa.column('id', sa.Integer), sa.column('phone', sa.String))
+    registry = sa.table(
+        'contact_registry',
+        sa.column('id', sa.String),
+        sa.column('owner_id', sa.Integer),
+        sa.column('phone_number', sa.String),
+        sa.column('normalized_phone', sa.String)
+    )
+
+    default_region = os.environ.get('DEFAULT_PHONE_REGION', 'IN').upper()
+    last_id = ''
+    while True:
+        rows = bind.execute(
+            sa.select(registry.c.id, registry.c.phone_number, users.c.phone)
+            .select_from(registry.join(users, users.c.id == registry.c.owner_id))
+            .where(registry.c.id > last_id)
+            .order_by(registry.c.id)
+            .limit(BATCH_SIZE)
+        ).fetchall()
+        if not rows:
+            break
+
+        updates = []
+        for contact_id, phone_number, owner_phone in rows:
+            e164 = to_e164(phone_number, region_for_phone(owner_phone, default_region))
+            if e164:
+                updates.append({'contact_id': contact_id, 'e164': e164})
+        if updates:
+            bind.execute(
+                registry.update().where(registry.c.id == sa.bindparam('contact_id')).values(normalized_phone=sa.bindparam('e164')),
+                updates
+            )
+
+        last_id = rows[-1][0]
+
+
+def downgrade() -> None:
+    op.drop_index('idx_notification_user_created', table_name='notifications')
+    op.drop_table('notifications')
+    op.drop_index('idx_contact_registered_user', table_name='contact_registry')
+    op.drop_index('idx_contact_normalized_phone', table_name='contact_registry')
+    op.drop_column('contact_registry', 'normalized_phone')
@@ -0,0 +1,154 @@
+"""canonical user phones
+
+Revision ID: d15e603270dc
+Revises: 0aeec3c91b95
+Create Date: 2026-10-18 13:40:07.219845
+
+"""
+import os
+import re
+from typing import Dict, Optional, Sequence, Tuple, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd15e603270dc'
+down_revision: Union[str, None] = '0aeec3c91b95'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 5000
+
+# The phone canonicalization rules as of this revision, frozen so later
+# changes to feature.utils.phone_normalizer cannot change what it writes
+CALLING_CODES: Dict[str, Tuple[int, ...]] = {
+    "1": (10,), "7": (10,), "20": (10,), "27": (9,), "30": (10,), "31": (9,),
+    "32": (8, 9), "33": (9,), "34": (9,), "36": (8, 9), "39": tuple(range(6, 12)),
+    "40": (9,), "41": (9,), "43": tuple(range(7, 14)), "44": (9, 10), "45": (8,),
+    "46": tuple(range(7, 11)), "47": (8,), "48": (9,), "49": tuple(range(6, 14)),
+    "51": (9,), "52": (10,), "54": (10,), "55": (10, 11), "56": (9,), "57": (10,),
+    "60": (9, 10), "61": (9,), "62": tuple(range(9, 13)), "63": (10,), "64": (8, 9, 10),
+    "65": (8,), "66": (9,), "81": (9, 10), "82": (9, 10), "84": (9, 10), "86": (10, 11),
+    "90": (10,), "91": (10,), "92": (10,), "93": (9,), "94": (9,), "95": (8, 9, 10),
+    "98": (10,), "212": (9,), "234": (10,), "254": (9,), "255": (9,), "256": (9,),
+    "351": (9,), "353": (9,), "358": tuple(range(6, 11)), "852": (8,), "880": (10,),
+    "886": (9,), "961": (7, 8), "962": (9,), "965": (8,), "966": (9,), "971": (8, 9),
+    "972": (9,), "974": (8,), "977": (10,),
+}
+
+REGIONS: Dict[str, Tuple[str, str]] = {
+    "US": ("1", "1"), "CA": ("1", "1"), "RU": ("7", "8"), "EG": ("20", "0"),
+    "ZA": ("27", "0"), "GR": ("30", ""), "NL": ("31", "0"), "BE": ("32", "0"),
+    "FR": ("33", "0"), "ES": ("34", ""), "HU": ("36", "06"), "IT": ("39", ""),
+    "RO": ("40", "0"), "CH": ("41", "0"), "AT": ("43", "0"), "GB": ("44", "0"),
+    "DK": ("45", ""), "SE": ("46", "0"), "NO": ("47", ""), "PL": ("48", ""),
+    "DE": ("49", "0"), "PE": ("51", "0"), "MX": ("52", ""), "AR": ("54", "0"),
+    "BR": ("55", "0"), "CL": ("56", ""), "CO": ("57", ""), "MY": ("60", "0"),
+    "AU": ("61", "0"), "ID": ("62", "0"), "PH": ("63", "0"), "NZ": ("64", "0"),
+    "SG": ("65", ""), "TH": ("66", "0"), "JP": ("81", "0"), "KR": ("82", "0"),
+    "VN": ("84", "0"), "CN": ("86", "0"), "TR": ("90", "0"), "IN": ("91", "0"),
+    "PK": ("92", "0"), "AF": ("93", "0"), "LK": ("94", "0"), "MM": ("95", "0"),
+    "IR": ("98", "0"), "MA": ("212", "0"), "NG": ("234", "0"), "KE": ("254", "0"),
+    "TZ": ("255", "0"), "UG": ("256", "0"), "PT": ("351", ""), "IE": ("353", "0"),
+    "FI": ("358", "0"), "HK": ("852", ""), "BD": ("880", "0"), "TW": ("886", "0"),
+    "LB": ("961", "0"), "JO": ("962", "0"), "KW": ("965", ""), "SA": ("966", "0"),
+    "AE": ("971", "0"), "IL": ("972", "0"), "QA": ("974", ""), "NP": ("977", "0"),
+}
+
+_STRIP = re.compile(r"[^\d+]+")
+
+
+def _split_international(digits: str) -> Optional[str]:
+    for length in range(1, 4):
+        national_lengths = CALLING_CODES.get(digits[:length])
+        if national_lengths and len(digits) - length in national_lengths:
+            return "+" + digits
+    return None
+
+
+def to_e164(phone: Optional[str], region: str) -> Optional[str]:
+    if not phone:
+        return None
+    cleaned = _STRIP.sub("", phone)
+    digits = cleaned.replace("+", "")
+    if cleaned.startswith("+"):
+        return "+" + digits if 8 <= len(digits) <= 15 else None
+
+    country_code, trunk = REGIONS.get(region, ("", "0"))
+    for prefix in (("011",) if country_code == "1" else ("00",)):
+        if digits.startswith(prefix):
+            digits = digits[len(prefix):]
+            return "+" + digits if 8 <= len(digits) <= 15 else None
+
+    if country_code:
+        national_lengths = CALLING_CODES.get(country_code, ())
+        if len(digits) in national_lengths:
+            return "+" + country_code + digits
+        if trunk and digits.startswith(trunk) and len(digits) - len(trunk) in national_lengths:
+            return "+" + country_code + digits[len(trunk):]
+
+    return _split_international(digits)
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    users = sa.table('users', sa.column('id', sa.Integer), sa.column('phone', sa.String))
+    phone_index = sa.table('user_phone_index', sa.column('phone_key', sa.String), sa.column('user_id', sa.Integer))
+    generations = sa.table(
+        'cache_generations',
+        sa.column('name', sa.String),
+        sa.column('generation', sa.Integer),
+        sa.column('updated_at', sa.DateTime)
+    )
+
+    # Rewrite users.phone to E.164 and re-key the phone index in the same pass.
+    # Accounts sharing a number are all indexed; lookups resolve a shared key
+    # to the oldest account, as PhoneIndexCache does.
+    region = os.environ.get('DEFAULT_PHONE_REGION', 'IN').upper()
+    bind.execute(phone_index.delete())
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(users.c.id, users.c.phone)
+            .where(users.c.phone.isnot(None), users.c.id > last_id)
+            .order_by(users.c.id)
+            .limit(BATCH_SIZE)
+        ).fetchall()
+        if not rows:
+            break
+
+        updates = []
+        mappings = []
+        for user_id, phone in rows:
+            e164 = to_e164(phone, region)
+            if not e164:
+                continue
+            mappings.append({'phone_key': e164, 'user_id': user_id})
+            if e164 != phone:
+                updates.append({'user_id': user_id, 'e164': e164})
+
+        if updates:
+            bind.execute(
+                users.update().where(users.c.id == sa.bindparam('user_id')).values(phone=sa.bindparam('e164')),
+                updates
+            )
+        if mappings:
+            bind.execute(phone_index.insert(), mappings)
+
+        last_id = rows[-1][0]
+
+    # Make every running worker drop its cached copy of the old keys
+    updated = bind.execute(
+        generations.update()
+        .where(generations.c.name == 'user_phone_index')
+        .values(generation=generations.c.generation + 1, updated_at=sa.func.now())
+    )
+    if not updated.rowcount:
+        bind.execute(generations.insert().values(name='user_phone_index', generation=1, updated_at=sa.func.now()))
+
+
+def downgrade() -> None:
+    # Canonical numbers are a valid input format, so there is nothing to undo
+    pass
@@ -0,0 +1,58 @@
+"""user social counters
+
+Revision ID: d2bd87c5907e
+Revises: 29cf01f0223d
+Create Date: 2026-10-18 19:48:06.271544
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2bd87c5907e'
+down_revision: Union[str, None] = '29cf01f0223d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COUNTERS = ('friend_count', 'incoming_pending_count', 'outgoing_pending_count')
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+
+    columns = {column['name'] for column in inspector.get_columns('users')}
+    for counter in COUNTERS:
+        if counter not in columns:
+            op.add_column('users', sa.Column(counter, sa.Integer(), server_default='0', nullable=False))
+
+    indexes = {index['name'] for index in inspector.get_indexes('friend_requests')}
+    if 'idx_friend_request_receiver_status' not in indexes:
+        op.create_index('idx_friend_request_receiver_status', 'friend_requests', ['receiver_id', 'status'], unique=False)
+
+    # Backfill from friendships and pending requests
+    users = sa.table('users', sa.column('id', sa.Integer), *[sa.column(counter, sa.Integer) for counter in COUNTERS])
+    friendships = sa.table('friendships', sa.column('user_id', sa.Integer))
+    friend_requests = sa.table(
+        'friend_requests',
+        sa.column('requester_id', sa.Integer),
+        sa.column('receiver_id', sa.Integer),
+        sa.column('status', sa.String)
+    )
+    bind.execute(users.update().values(
+        friend_count=sa.select(sa.func.count()).select_from(friendships)
+        .where(friendships.c.user_id == users.c.id).scalar_subquery(),
+        incoming_pending_count=sa.select(sa.func.count()).select_from(friend_requests)
+        .where(friend_requests.c.receiver_id == users.c.id, friend_requests.c.status == 'PENDING').scalar_subquery(),
+        outgoing_pending_count=sa.select(sa.func.count()).select_from(friend_requests)
+        .where(friend_requests.c.requester_id == users.c.id, friend_requests.c.status == 'PENDING').scalar_subquery()
+    ))
+
+
+def downgrade() -> None:
+    op.drop_index('idx_friend_request_receiver_status', table_name='friend_requests')
+    for counter in COUNTERS:
+        op.drop_column('users', counter)
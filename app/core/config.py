@@ -24,6 +24,36 @@ class Settings(BaseSettings):
     GOOGLE_CLIENT_SECRET: str = Field(default="")
     GOOGLE_REDIRECT_URI: str = Field(default="http://localhost:8000/api/v1/auth/google/callback")
 
+    # Phone numbers without a country code are read in this region
+    DEFAULT_PHONE_REGION: str = Field(default="IN")
+
+    # Caches
+    PHONE_INDEX_CACHE_TTL_SECONDS: int = Field(default=30)
+    FRIEND_SET_CACHE_TTL_SECONDS: int = Field(default=60)
+    FRIEND_SET_CACHE_MAX_BYTES: int = Field(default=16 * 1024 * 1024)
+    BLOCK_SET_CACHE_TTL_SECONDS: int = Field(default=30)
+    BLOCK_SET_CACHE_MAX_ENTRIES: int = Field(default=10000)
+    COUNT_CACHE_TTL_SECONDS: int = Field(default=15)
+    COUNT_CACHE_MAX_ENTRIES: int = Field(default=10000)
+    COUNT_ESTIMATE_CAP: int = Field(default=1000)  # Listings larger than this report an estimated total
+    CACHE_CHANGE_LOG_RETENTION: int = Field(default=10000)  # Generations of changed keys kept for catching up
+
+    # Room views and participant heartbeats are buffered and written this often
+    ROOM_ACTIVITY_FLUSH_SECONDS: int = Field(default=5)
+    PARTICIPANT_HEARTBEAT_FLUSH_SECONDS: int = Field(default=5)
+
+    # Friend suggestions ("people you may know")
+    FRIEND_SUGGESTION_TOP_K: int = Field(default=20)
+    FRIEND_SUGGESTION_INTERVAL_SECONDS: int = Field(default=6 * 60 * 60)
+
+    # Recount users' friend / pending request counters to repair any drift
+    SOCIAL_COUNTER_REPAIR_INTERVAL_SECONDS: int = Field(default=24 * 60 * 60)
+
+    # Background contact sync jobs
+    CONTACT_SYNC_JOB_WORKERS: int = Field(default=2)
+    CONTACT_SYNC_JOB_STALE_SECONDS: int = Field(default=120)
+    CONTACT_SYNC_JOB_RETENTION_HOURS: int = Field(default=7 * 24)  # Finished jobs and their results are purged after this
+
     # CORS
     FRONTEND_URL: str = Field(default="http://localhost:3000")
     BACKEND_CORS_ORIGINS: List[str] = ["http://localhost:3000"]
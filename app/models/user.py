@@ -1,4 +1,5 @@
-from sqlalchemy import Boolean, Column, String, Integer, DateTime
+from sqlalchemy import Boolean, Column, String, Integer, SmallInteger, DateTime
+from sqlalchemy.orm import validates
 from sqlalchemy.sql import func
 from ..core.database import Base
 from sqlalchemy import Date
@@ -17,5 +18,15 @@ class User(Base):
     hashed_password = Column(String(length=255), nullable=True)  # Increased length
     is_active = Column(Boolean, default=True)
     date_of_birth = Column(Date, nullable=True)
+    birthday_key = Column(SmallInteger, nullable=True, index=True)  # month * 100 + day, kept in sync with date_of_birth
+    # Maintained by FriendRepository in the same transaction as the change; repaired by SocialCounterRepairJob
+    friend_count = Column(Integer, nullable=False, default=0, server_default='0')
+    incoming_pending_count = Column(Integer, nullable=False, default=0, server_default='0')
+    outgoing_pending_count = Column(Integer, nullable=False, default=0, server_default='0')
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
\ No newline at end of file
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+    @validates('date_of_birth')
+    def _set_birthday_key(self, key, value):
+        self.birthday_key = value.month * 100 + value.day if value else None
+        return value
@@ -36,6 +36,9 @@ class UserUpdate(BaseModel):
 
 class UserInDBBase(UserBase):
     id: int
+    friend_count: int = 0
+    incoming_pending_count: int = 0
+    outgoing_pending_count: int = 0
     created_at: datetime
     updated_at: Optional[datetime] = None
 
@@ -3,6 +3,8 @@ from typing import Optional
 from ..models.user import User
 from ..schemas.user import UserCreate, UserUpdate
 from ..core.security import get_password_hash,verify_password
+from feature.services.phone_index_service import PhoneIndexService
+from feature.utils.phone_utils import PhoneUtils
 
 class UserService:
     @staticmethod
@@ -30,15 +32,26 @@ class UserService:
         if 'password' in update_data:
             update_data['hashed_password'] = get_password_hash(update_data.pop('password'))
 
+        if update_data.get('phone'):
+            # Read a local number in the context of the user's current country
+            region = PhoneUtils.region_for_phone(user.phone)
+            update_data['phone'] = PhoneUtils.to_e164(update_data['phone'], region) or update_data['phone']
+
+        phone_changed = 'phone' in update_data and update_data['phone'] != user.phone
+
         for field, value in update_data.items():
             setattr(user, field, value)
 
         db.add(user)
-        db.commit()
+        if phone_changed:
+            PhoneIndexService.index_user(db, user)  # Commits the update with the index
+        else:
+            db.commit()
         db.refresh(user)
         return user
     @staticmethod
     def authenticate_phone(db: Session, phone: str, password: str) -> Optional[User]:
+        phone = PhoneUtils.to_e164(phone) or phone
         user = db.query(User).filter(User.phone == phone).first()
         if not user or not user.hashed_password:
             return None
@@ -0,0 +1,331 @@
+"""
+Contact sync benchmark.
+
+Builds a synthetic SQLite database of registered users and times
+ContactService.sync_contacts for address books of several sizes, reporting
+per sync size:
+
+- p50 / p99 latency of a first sync and of an unchanged re-sync
+- SQL statements issued per sync (an executemany counts once)
+- rows written (inserted / updated / deleted) per sync
+- peak Python memory of one sync (measured on a separate, untimed run)
+
+Usage (from the repository root):
+
+    python -m benchmarks.contact_sync_bench --users 100000 --sizes 100,1000,5000
+    python -m benchmarks.contact_sync_bench --users 1000000 --runs 20 --json results.json
+
+The database is written to a temporary file unless --db is given; a --db file
+that already holds the requested number of users (same --seed) is reused.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import TYPE_CHECKING, Dict, List
+
+from sqlalchemy import event, func, insert
+
+if TYPE_CHECKING:
+    from feature.schemas.contact_schema import ContactInfo
+    from feature.services.contact_service import ContactService
+
+
+INSERT_BATCH = 10000
+
+# Region -> (calling code, share of generated users)
+REGIONS = {"IN": ("91", 0.7), "US": ("1", 0.15), "GB": ("44", 0.15)}
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark ContactService.sync_contacts against SQLite")
+    parser.add_argument("--users", type=int, default=100000, help="Registered users to generate")
+    parser.add_argument("--sizes", default="100,1000,5000", help="Comma separated address book sizes")
+    parser.add_argument("--runs", type=int, default=10, help="Timed syncs per address book size")
+    parser.add_argument("--hit-rate", type=float, default=0.3, help="Share of contacts that are registered users")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--db", help="SQLite file to use (default: a temporary file)")
+    parser.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc run")
+    parser.add_argument("--json", dest="json_path", help="Also write the results to this file")
+    return parser.parse_args()
+
+
+# The app modules below (app.core.*, feature.*) read settings when first
+# imported, so they are imported inside the functions that need them, after
+# main() has pointed DATABASE_URL at the benchmark database.
+
+
+class QueryCounter:
+    """Counts statements and written rows on the engine while enabled"""
+
+    def __init__(self):
+        from app.core.database import engine
+
+        self.enabled = False
+        self.queries = 0
+        self.rows_written = 0
+        event.listen(engine, "before_cursor_execute", self._before)
+        event.listen(engine, "after_cursor_execute", self._after)
+
+    def reset(self) -> None:
+        self.queries = 0
+        self.rows_written = 0
+
+    def _before(self, conn, cursor, statement, parameters, context, executemany):
+        if self.enabled:
+            self.queries += 1
+
+    def _after(self, conn, cursor, statement, parameters, context, executemany):
+        if self.enabled and statement.lstrip()[:6].upper() in ("INSERT", "UPDATE", "DELETE"):
+            self.rows_written += max(cursor.rowcount, 0)
+
+
+def national_number(rng: random.Random, region: str) -> str:
+    if region == "IN":
+        return str(rng.randint(6, 9)) + "".join(rng.choices("0123456789", k=9))
+    if region == "US":
+        return str(rng.randint(2, 9)) + "".join(rng.choices("0123456789", k=2)) + \
+            str(rng.randint(2, 9)) + "".join(rng.choices("0123456789", k=6))
+    return "7" + "".join(rng.choices("0123456789", k=9))
+
+
+def random_phone(rng: random.Random) -> tuple:
+    """(region, national number) drawn with the configured region mix"""
+    region = rng.choices(list(REGIONS), weights=[share for _, share in REGIONS.values()])[0]
+    return region, national_number(rng, region)
+
+
+def format_as_saved(rng: random.Random, region: str, number: str) -> str:
+    """How an Indian owner's phone might have stored the number"""
+    if region == "IN":
+        return rng.choice([
+            number,
+            f"0{number}",
+            f"91{number}",
+            f"+91{number}",
+            f"+91 {number[:5]} {number[5:]}",
+            f"+91-{number[:5]}-{number[5:]}",
+            f"0091 {number}",
+            f"{number[:5]} {number[5:]}",
+        ])
+    code = REGIONS[region][0]
+    if region == "US":
+        return rng.choice([
+            f"+1 ({number[:3]}) {number[3:6]}-{number[6:]}",
+            f"+1{number}",
+            f"001 {number[:3]} {number[3:6]} {number[6:]}",
+        ])
+    return rng.choice([f"+{code} {number[:4]} {number[4:]}", f"00{code}{number}", f"+{code}{number}"])
+
+
+def populate(rng: random.Random, user_count: int, db_path: str) -> List[tuple]:
+    """Create user_count registered users and their phone index; returns their (region, number)"""
+    from app.core.database import SessionLocal
+    from app.models.user import User
+    from feature.models.contact import UserPhoneIndex
+    from feature.utils.phone_utils import PhoneUtils
+
+    db = SessionLocal()
+    try:
+        existing = db.query(func.count(User.id)).filter(User.id <= user_count).scalar()
+        if existing and existing != user_count:
+            sys.exit(f"{db_path} already holds {existing} users; pass a fresh --db")
+
+        phones = {}
+        while len(phones) < user_count:
+            region, number = random_phone(rng)
+            phones.setdefault(REGIONS[region][0] + number, (region, number))
+        registered = list(phones.values())
+
+        if existing:
+            print(f"Reusing {existing} users in {db_path} (generated with the same --seed)")
+            return registered
+
+        started = time.perf_counter()
+        for offset in range(0, user_count, INSERT_BATCH):
+            batch = registered[offset:offset + INSERT_BATCH]
+            db.execute(insert(User), [
+                {
+                    "id": offset + i + 1,
+                    "phone": "+" + REGIONS[region][0] + number,
+                    "first_name": f"user{offset + i + 1}",
+                    "phone_verified": "verified",
+                    "account_status": "registered",
+                }
+                for i, (region, number) in enumerate(batch)
+            ])
+            db.execute(insert(UserPhoneIndex), [
+                {"phone_key": key, "user_id": offset + i + 1}
+                for i, (region, number) in enumerate(batch)
+                for key in PhoneUtils.get_index_keys("+" + REGIONS[region][0] + number)
+            ])
+        db.commit()
+        print(f"Generated {user_count} users in {time.perf_counter() - started:.1f}s ({db_path})")
+        return registered
+    finally:
+        db.close()
+
+
+def address_book(rng: random.Random, registered: List[tuple], size: int, hit_rate: float) -> List["ContactInfo"]:
+    from feature.schemas.contact_schema import ContactInfo
+
+    contacts = []
+    for i in range(size):
+        if rng.random() < hit_rate:
+            region, number = rng.choice(registered)
+        elif rng.random() < 0.02:
+            contacts.append(ContactInfo(name=f"Service {i}", phone_number=rng.choice(["121", "*123#", "1800-180-1234"])))
+            continue
+        else:
+            region, number = random_phone(rng)  # Almost always unregistered
+        contacts.append(ContactInfo(name=f"Contact {i}", phone_number=format_as_saved(rng, region, number)))
+    return contacts
+
+
+def create_owner(db, owner_id: int) -> int:
+    from app.models.user import User
+
+    db.execute(insert(User), [{"id": owner_id, "phone": f"+916{owner_id % 10**9:09d}", "first_name": "owner"}])
+    db.commit()
+    return owner_id
+
+
+def percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+
+async def timed_sync(
+        service: "ContactService",
+        counter: QueryCounter,
+        owner_id: int,
+        contacts: List["ContactInfo"]
+) -> Dict:
+    from app.core.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        counter.reset()
+        counter.enabled = True
+        started = time.perf_counter()
+        matches = await service.sync_contacts(db, owner_id, contacts)
+        elapsed = time.perf_counter() - started
+        counter.enabled = False
+        return {
+            "seconds": elapsed,
+            "queries": counter.queries,
+            "rows_written": counter.rows_written,
+            "matches": len(matches),
+        }
+    finally:
+        counter.enabled = False
+        db.close()
+
+
+def summarize(samples: List[Dict]) -> Dict:
+    latencies = [sample["seconds"] * 1000 for sample in samples]
+    return {
+        "p50_ms": round(percentile(latencies, 50), 2),
+        "p99_ms": round(percentile(latencies, 99), 2),
+        "mean_ms": round(statistics.mean(latencies), 2),
+        "queries": max(sample["queries"] for sample in samples),
+        "rows_written": max(sample["rows_written"] for sample in samples),
+        "matches": samples[-1]["matches"],
+    }
+
+
+async def run(args: argparse.Namespace, db_path: str) -> List[Dict]:
+    from app.core.database import SessionLocal, create_tables
+    from app.models.user import User
+    from feature.models import cache_state, contact, contact_job, friend, notification, otp, room  # noqa: F401
+    from feature.services.contact_service import ContactService
+    from feature.services.phone_index_cache import phone_index_cache
+
+    rng = random.Random(args.seed)
+    sizes = [int(size) for size in args.sizes.split(",") if size]
+
+    create_tables()
+    registered = populate(rng, args.users, db_path)
+
+    # Build the phone index cache up front so it is not billed to the first sync
+    db = SessionLocal()
+    started = time.perf_counter()
+    phone_index_cache.lookup(db, [])
+    db.close()
+    print(f"Phone index cache built in {time.perf_counter() - started:.2f}s: {phone_index_cache.stats()}")
+
+    service = ContactService()
+    counter = QueryCounter()
+    db = SessionLocal()
+    next_owner_id = db.query(func.max(User.id)).scalar() + 1  # Owners from earlier runs stay behind
+    db.close()
+    results = []
+
+    for size in sizes:
+        first_syncs, resyncs = [], []
+        for _ in range(args.runs):
+            contacts = address_book(rng, registered, size, args.hit_rate)
+            db = SessionLocal()
+            owner_id = create_owner(db, next_owner_id)
+            db.close()
+            next_owner_id += 1
+
+            first_syncs.append(await timed_sync(service, counter, owner_id, contacts))
+            resyncs.append(await timed_sync(service, counter, owner_id, contacts))
+
+        result = {"size": size, "first_sync": summarize(first_syncs), "resync": summarize(resyncs)}
+
+        if not args.no_memory:
+            contacts = address_book(rng, registered, size, args.hit_rate)
+            db = SessionLocal()
+            owner_id = create_owner(db, next_owner_id)
+            db.close()
+            next_owner_id += 1
+
+            tracemalloc.start()
+            await timed_sync(service, counter, owner_id, contacts)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            result["peak_memory_kb"] = round(peak / 1024)
+
+        results.append(result)
+        print_result(result)
+
+    return results
+
+
+def print_result(result: Dict) -> None:
+    for phase in ("first_sync", "resync"):
+        stats = result[phase]
+        print(
+            f"size={result['size']:>7} {phase:<10} "
+            f"p50={stats['p50_ms']:>9.2f}ms p99={stats['p99_ms']:>9.2f}ms "
+            f"queries={stats['queries']:>5} rows_written={stats['rows_written']:>7} "
+            f"matches={stats['matches']:>6}"
+            + (f" peak_mem={result['peak_memory_kb']}KB" if phase == "first_sync" and "peak_memory_kb" in result else "")
+        )
+
+
+def main() -> None:
+    args = parse_args()
+
+    # Settings are read at import time, so point the app at the benchmark database first
+    db_path = args.db or os.path.join(tempfile.mkdtemp(prefix="contact_bench_"), "bench.db")
+    os.environ["DATABASE_URL"] = f"sqlite:///{db_path}"
+    os.environ.setdefault("DATABASE_PASSWORD", "")
+
+    results = asyncio.run(run(args, db_path))
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump({"users": args.users, "runs": args.runs, "hit_rate": args.hit_rate, "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,23 +1,37 @@
 # feature/controllers/contact_controller.py
-from fastapi import APIRouter, Depends, HTTPException, status
+import json
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from app.core.database import get_db_dependency
+from app.core.database import get_db, get_db_dependency
 from app.api.deps import get_current_user
-from ..schemas.contact_schema import ContactSyncRequest, ContactSyncResponse
+from ..schemas.contact_schema import (
+    ContactSyncRequest,
+    ContactSyncResponse,
+    ContactDeltaSyncRequest,
+    ContactDeltaSyncResponse,
+    ContactSyncJobResponse,
+    ContactSyncJobResultsResponse
+)
 from ..services.contact_service import ContactService
+from ..services.contact_job_service import ContactSyncJobService
 from app.core.error_handler import create_success_response
 
 router = APIRouter(tags=["contacts"])
+contact_job_service = ContactSyncJobService()
 
 
 @router.post("/sync", response_model=ContactSyncResponse)
 async def sync_contacts(
         request: ContactSyncRequest,
+        response: Response,
         current_user=Depends(get_current_user),
         db: Session = Depends(get_db_dependency)
 ):
     """
-    Synchronize user's phone contacts and discover matches
+    Synchronize user's phone contacts and discover matches.
+    The X-Contact-Fingerprint header carries the fingerprint for delta syncs.
     """
     try:
         contact_service = ContactService()
@@ -26,6 +40,7 @@ async def sync_contacts(
             current_user.id,
             request.contacts
         )
+        response.headers["X-Contact-Fingerprint"] = await contact_service.get_fingerprint(db, current_user.id)
 
         return create_success_response(
             message="Contacts synced successfully",
@@ -36,4 +51,159 @@ async def sync_contacts(
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e)
-        )
\ No newline at end of file
+        )
+
+
+@router.post("/sync/delta", response_model=ContactDeltaSyncResponse)
+async def sync_contacts_delta(
+        request: ContactDeltaSyncRequest,
+        current_user=Depends(get_current_user),
+        db: Session = Depends(get_db_dependency)
+):
+    """
+    Apply only the contacts added/removed since the last sync. If the
+    fingerprint does not match the server's, full_sync_required is set and
+    the client should call /sync with its whole address book.
+    """
+    try:
+        contact_service = ContactService()
+        result = await contact_service.sync_contacts_delta(
+            db,
+            current_user.id,
+            request.fingerprint,
+            request.added,
+            request.removed
+        )
+
+        message = "Full contact sync required" if result.full_sync_required \
+            else "Contacts synced successfully"
+        return create_success_response(
+            message=message,
+            data=result
+        )
+
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+
+@router.post("/sync/stream")
+async def sync_contacts_stream(
+        request: ContactSyncRequest,
+        current_user=Depends(get_current_user)
+):
+    """
+    Synchronize contacts and stream matches as NDJSON, one line per processed
+    chunk, followed by a final summary line
+    """
+    owner_id = current_user.id
+    contacts = request.contacts
+
+    async def stream_matches():
+        contact_service = ContactService()
+        total_matches = 0
+        chunk_index = 0
+
+        # The stream outlives the request dependencies, so it owns its session
+        with get_db() as db:
+            try:
+                async for chunk_matches in contact_service.iter_sync_chunks(db, owner_id, contacts):
+                    total_matches += len(chunk_matches)
+                    yield json.dumps({
+                        "type": "chunk",
+                        "chunk": chunk_index,
+                        "processed": min((chunk_index + 1) * contact_service.chunk_size, len(contacts)),
+                        "matches": jsonable_encoder(chunk_matches)
+                    }) + "\n"
+                    chunk_index += 1
+                fingerprint = await contact_service.finish_full_sync(
+                    db, owner_id, [contact.phone_number for contact in contacts]
+                )
+            except Exception as e:
+                db.rollback()
+                yield json.dumps({
+                    "type": "error",
+                    "message": f"Contact sync failed: {str(e)}"
+                }) + "\n"
+                return
+
+        yield json.dumps({
+            "type": "summary",
+            "total_contacts": len(contacts),
+            "total_matches": total_matches,
+            "chunks": chunk_index,
+            "fingerprint": fingerprint
+        }) + "\n"
+
+    return StreamingResponse(stream_matches(), media_type="application/x-ndjson")
+
+
+@router.post("/sync/jobs", response_model=ContactSyncJobResponse)
+async def submit_sync_job(
+        request: ContactSyncRequest,
+        current_user=Depends(get_current_user),
+        db: Session = Depends(get_db_dependency)
+):
+    """
+    Queue a contact sync to run in the background and return its job ID
+    immediately. Intended for very large address books.
+    """
+    job = await contact_job_service.submit_job(db, current_user.id, request.contacts)
+
+    return create_success_response(
+        message="Contact sync job queued",
+        data=job
+    )
+
+
+@router.get("/sync/jobs/{job_id}", response_model=ContactSyncJobResponse)
+async def get_sync_job(
+        job_id: str,
+        current_user=Depends(get_current_user),
+        db: Session = Depends(get_db_dependency)
+):
+    """
+    Get the status and progress of a contact sync job
+    """
+    success, message, job = await contact_job_service.get_job(db, current_user.id, job_id)
+
+    if not success:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=message
+        )
+
+    return create_success_response(
+        message=message,
+        data=job
+    )
+
+
+@router.get("/sync/jobs/{job_id}/results", response_model=ContactSyncJobResultsResponse)
+async def get_sync_job_results(
+        job_id: str,
+        after_chunk: int = Query(-1, ge=-1, description="Last chunk index already received"),
+        limit: int = Query(20, ge=1, le=100, description="Maximum chunks to return"),
+        current_user=Depends(get_current_user),
+        db: Session = Depends(get_db_dependency)
+):
+    """
+    Get the matches of a contact sync job chunk by chunk; poll with the
+    returned last_chunk until the job is completed
+    """
+    success, message, results = await contact_job_service.get_results(
+        db, current_user.id, job_id, after_chunk, limit
+    )
+
+    if not success:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=message
+        )
+
+    return create_success_response(
+        message=message,
+        data=results
+    )
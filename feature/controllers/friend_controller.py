@@ -1,5 +1,6 @@
 # feature/controllers/friend_controller.py
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+from typing import List, Optional
 from ..schemas.friend_schema import (
     FriendRequestCreate,
     BlockUserRequest,
@@ -7,7 +8,15 @@ from ..schemas.friend_schema import (
     FriendRequestListResponse,
     BlockedUserResponse,
     BlockedUserListResponse,
-FriendListResponse
+FriendListResponse,
+    FriendPageResponse,
+    FriendSuggestionListResponse,
+    FriendRequestBulkCreate,
+    FriendRequestBulkResponse,
+    UpcomingBirthdayListResponse,
+    MutualFriendsListResponse,
+    SocialCounts,
+    SocialCountsResponse
 )
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
@@ -42,6 +51,113 @@ async def get_friends(
         data=friends
     )
 
+@router.get("/friends/page", response_model=FriendPageResponse)
+async def get_friends_page(
+    after: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    limit: int = Query(20, ge=1, le=100),
+    current_user=Depends(get_current_user),
+    db: Session = Depends(get_db_dependency)
+):
+    """
+    Get a page of current user's friends ordered by first name, using a cursor
+    """
+    try:
+        page = await friend_service.get_friends_page(
+            db,
+            current_user.id,
+            after,
+            limit
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+    return create_success_response(
+        message="Friends retrieved successfully",
+        data=page
+    )
+
+@router.get("/friends/suggestions", response_model=FriendSuggestionListResponse)
+async def get_friend_suggestions(
+    limit: int = Query(20, ge=1, le=50),
+    current_user=Depends(get_current_user),
+    db: Session = Depends(get_db_dependency)
+):
+    """
+    Get "people you may know", precomputed by the suggestion engine
+    """
+    try:
+        suggestions = await friend_service.get_suggestions(db, current_user.id, limit)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+    return create_success_response(
+        message="Friend suggestions retrieved successfully",
+        data=suggestions
+    )
+
+@router.get("/friends/upcoming-birthdays", response_model=UpcomingBirthdayListResponse)
+async def get_upcoming_birthdays(
+    days: int = Query(30, ge=0, le=366, description="Look-ahead window in days, 0 for today only"),
+    limit: int = Query(50, ge=1, le=200),
+    current_user=Depends(get_current_user),
+    db: Session = Depends(get_db_dependency)
+):
+    """
+    Get current user's friends with a birthday in the next N days, soonest first
+    """
+    try:
+        birthdays = await friend_service.get_upcoming_birthdays(db, current_user.id, days, limit)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+    return create_success_response(
+        message="Upcoming birthdays retrieved successfully",
+        data=birthdays
+    )
+
+@router.get("/friends/counts", response_model=SocialCountsResponse)
+async def get_social_counts(
+    current_user=Depends(get_current_user)
+):
+    """
+    Get current user's friend and pending request counts, for badges
+    """
+    return create_success_response(
+        message="Counts retrieved successfully",
+        data=SocialCounts.model_validate(current_user)
+    )
+
+@router.get("/friends/mutual", response_model=MutualFriendsListResponse)
+async def get_mutual_friends(
+    user_ids: List[int] = Query(..., max_length=100, description="Users to compare with, e.g. search results"),
+    current_user=Depends(get_current_user),
+    db: Session = Depends(get_db_dependency)
+):
+    """
+    Get how many friends the current user shares with each of the given users
+    """
+    try:
+        mutual = await friend_service.get_mutual_friends(db, current_user.id, user_ids)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+    return create_success_response(
+        message="Mutual friends retrieved successfully",
+        data=mutual
+    )
+
 @router.post("/friends/request", response_model=FriendRequestResponse)
 async def create_friend_request(
         request: FriendRequestCreate,
@@ -69,6 +185,35 @@ async def create_friend_request(
     )
 
 
+@router.post("/friends/requests/bulk", response_model=FriendRequestBulkResponse)
+async def create_friend_requests_bulk(
+        request: FriendRequestBulkCreate,
+        current_user=Depends(get_current_user),
+        db: Session = Depends(get_db_dependency)
+):
+    """
+    Send friend requests to several users, e.g. after a contact sync.
+    Each receiver gets its own outcome; only "sent" creates a request.
+    """
+    try:
+        results = await friend_service.create_friend_requests_bulk(
+            db,
+            current_user.id,
+            request.receiver_ids
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+    sent = sum(1 for result in results if result.status == "sent")
+    return create_success_response(
+        message=f"{sent} friend requests sent",
+        data=results
+    )
+
+
 @router.get("/friends/requests/incoming", response_model=FriendRequestListResponse)
 async def get_incoming_requests(
         skip: int = Query(0, ge=0),
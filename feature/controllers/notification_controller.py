@@ -0,0 +1,44 @@
+# feature/controllers/notification_controller.py
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from app.core.database import get_db_dependency
+from app.api.deps import get_current_user
+from app.core.error_handler import create_success_response
+from app.schemas.response import SuccessResponse
+from ..schemas.notification_schema import NotificationFeedResponse
+from ..services.notification_service import NotificationService
+
+router = APIRouter(tags=["notifications"])
+notification_service = NotificationService()
+
+
+@router.get("/notifications", response_model=NotificationFeedResponse)
+async def get_notifications(
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    current_user=Depends(get_current_user),
+    db: Session = Depends(get_db_dependency)
+):
+    """
+    Get the current user's notifications, newest first
+    """
+    feed = await notification_service.get_feed(db, current_user.id, skip, limit)
+    return create_success_response(
+        message="Notifications retrieved successfully",
+        data=feed
+    )
+
+
+@router.post("/notifications/read", response_model=SuccessResponse[dict])
+async def mark_notifications_read(
+    current_user=Depends(get_current_user),
+    db: Session = Depends(get_db_dependency)
+):
+    """
+    Mark all of the current user's notifications as read
+    """
+    updated = await notification_service.mark_all_read(db, current_user.id)
+    return create_success_response(
+        message="Notifications marked as read",
+        data={"updated": updated}
+    )
@@ -9,6 +9,7 @@ from app.core.error_handler import create_success_response
 from app.models.user import User
 from app.schemas.response import SuccessResponse
 from ..services.room_service import RoomService
+from ..services.count_cache import CountMode
 from typing import Optional, List
 from fastapi import status
 from ..schemas.room_schema import (
@@ -16,6 +17,7 @@ from ..schemas.room_schema import (
     RoomUpdate,
     RoomResponse,
     RoomListResponse,
+    RoomPageResponse,
     RoomFilter,
     RoomStatsResponse,
     ParticipantUpdate, RoomInvitation, ParticipantListResponse
@@ -28,6 +30,8 @@ router = APIRouter(prefix="/rooms", tags=["rooms"])
 async def get_pending_invitations(
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(10, ge=1, le=100, description="Items per page"),
+    include_total: bool = Query(True, description="Set false to skip counting, e.g. for infinite scroll"),
+    count_mode: CountMode = Query(CountMode.EXACT, description="exact, or estimate to cap the count on large sets"),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db_dependency)
 ):
@@ -37,7 +41,9 @@ async def get_pending_invitations(
             db,
             current_user.id,
             page,
-            page_size
+            page_size,
+            include_total,
+            count_mode
         )
 
         return create_success_response(
@@ -54,6 +60,8 @@ async def get_pending_join_requests(
     room_id: str,
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(10, ge=1, le=100, description="Items per page"),
+    include_total: bool = Query(True, description="Set false to skip counting, e.g. for infinite scroll"),
+    count_mode: CountMode = Query(CountMode.EXACT, description="exact, or estimate to cap the count on large sets"),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db_dependency)
 ):
@@ -64,7 +72,9 @@ async def get_pending_join_requests(
             room_id,
             current_user.id,
             page,
-            page_size
+            page_size,
+            include_total,
+            count_mode
         )
 
         return create_success_response(
@@ -122,6 +132,8 @@ async def list_rooms(
     is_archived: Optional[bool] = Query(False),
     friends_only: Optional[bool] = Query(False, description="Filter to show only rooms created by friends"),
     my_rooms: Optional[bool] = Query(False, description="Show only rooms where I'm owner or participant"),
+    include_total: bool = Query(True, description="Set false to skip counting, e.g. for infinite scroll"),
+    count_mode: CountMode = Query(CountMode.EXACT, description="exact, or estimate to cap the count on large sets"),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db_dependency)
 ):
@@ -145,7 +157,59 @@ async def list_rooms(
             current_user.id,
             filter_params,
             page,
-            page_size
+            page_size,
+            include_total,
+            count_mode
+        )
+
+        return create_success_response(
+            message="Rooms retrieved successfully",
+            data=result
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+@router.get("/page", response_model=RoomPageResponse)
+async def list_rooms_page(
+    after: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    limit: int = Query(20, ge=1, le=100, description="Items per page"),
+    query: Optional[str] = Query(None, min_length=1, max_length=100),
+    room_type: Optional[List[str]] = Query(None),
+    status: Optional[List[str]] = Query(None),
+    from_date: Optional[datetime] = Query(None),
+    to_date: Optional[datetime] = Query(None),
+    birthday_from_date: Optional[date] = Query(None, description="Filter by celebrant birthday from date"),
+    birthday_to_date: Optional[date] = Query(None, description="Filter by celebrant birthday to date"),
+    is_archived: Optional[bool] = Query(False),
+    friends_only: Optional[bool] = Query(False, description="Filter to show only rooms created by friends"),
+    my_rooms: Optional[bool] = Query(False, description="Show only rooms where I'm owner or participant"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db_dependency)
+):
+    """List rooms newest first with the same filters as the room list, using a cursor."""
+    filter_params = RoomFilter(
+        query=query,
+        room_type=room_type,
+        status=status,
+        from_date=from_date,
+        to_date=to_date,
+        birthday_from_date=birthday_from_date,
+        birthday_to_date=birthday_to_date,
+        is_archived=is_archived,
+        friends_only=friends_only,
+        my_rooms=my_rooms
+    )
+
+    try:
+        result = await RoomService.list_rooms_page(
+            db,
+            current_user.id,
+            filter_params,
+            after,
+            limit
         )
 
         return create_success_response(
@@ -180,6 +244,25 @@ async def get_room(
         data=room
     )
 
+@router.post("/{room_id}/heartbeat", response_model=SuccessResponse[dict])
+async def room_heartbeat(
+    room_id: str,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db_dependency)
+):
+    """Mark the current user as active in the room (buffered, written within a few seconds)."""
+    last_active_at = await RoomService.update_participant_activity(db, room_id, current_user.id)
+    if last_active_at is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Room not found or you are not a participant"
+        )
+
+    return create_success_response(
+        message="Heartbeat recorded",
+        data={"room_id": room_id, "last_active_at": last_active_at}
+    )
+
 @router.get("/{room_id}/stats", response_model=RoomStatsResponse)
 async def get_room_stats(
     room_id: str,
@@ -0,0 +1,22 @@
+# feature/models/cache_state.py
+from sqlalchemy import Column, String, Integer, DateTime
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+
+class CacheGeneration(Base):
+    """Shared version counter that lets per-process caches detect remote writes"""
+    __tablename__ = "cache_generations"
+
+    name = Column(String(64), primary_key=True)
+    generation = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+
+class CacheChange(Base):
+    """Keys changed by each generation bump, so caches can patch themselves instead of rebuilding"""
+    __tablename__ = "cache_changes"
+
+    name = Column(String(64), primary_key=True)
+    generation = Column(Integer, primary_key=True)
+    key = Column(String(64), primary_key=True)  # "" marks a bump that changed no key
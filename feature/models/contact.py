@@ -1,5 +1,5 @@
 # feature/models/contact.py
-from sqlalchemy import Column, String, Integer, Boolean, DateTime, ForeignKey, Index
+from sqlalchemy import Column, String, Integer, Boolean, DateTime, ForeignKey, Index, LargeBinary
 from sqlalchemy.sql import func
 from app.core.database import Base
 import uuid
@@ -10,6 +10,7 @@ class ContactRegistry(Base):
     id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     owner_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
     phone_number = Column(String(20), nullable=False, index=True)
+    normalized_phone = Column(String(20), nullable=True)  # E.164, read in the owner's region
     contact_name = Column(String(255))
     registered_user_id = Column(Integer, ForeignKey("users.id"), nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -17,4 +18,39 @@ class ContactRegistry(Base):
 
     __table_args__ = (
         Index('idx_contact_phone_owner', 'phone_number', 'owner_id'),
-    )
\ No newline at end of file
+        Index('uq_contact_owner_phone', 'owner_id', 'phone_number', unique=True),
+        # Reverse lookups: who holds this number / who has this user as a contact
+        Index('idx_contact_normalized_phone', 'normalized_phone', 'registered_user_id'),
+        Index('idx_contact_registered_user', 'registered_user_id', 'owner_id'),
+    )
+
+
+class UserPhoneIndex(Base):
+    """Canonical (E.164) phone key -> registered user"""
+    __tablename__ = "user_phone_index"
+
+    phone_key = Column(String(20), primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True, index=True)
+
+
+class ContactSyncState(Base):
+    """Fingerprint of each owner's synced contact set, used by delta sync"""
+    __tablename__ = "contact_sync_state"
+
+    owner_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    fingerprint = Column(String(64), nullable=False)
+    contact_count = Column(Integer, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+
+class ContactAdjacency(Base):
+    """
+    Registered users in each owner's contact book, stored as a packed sorted
+    int32 array (see IdArrayUtils) so mutual counts never re-read the registry
+    """
+    __tablename__ = "contact_adjacency"
+
+    owner_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    contact_ids = Column(LargeBinary(length=4 * 1024 * 1024), nullable=False)  # MEDIUMBLOB on MySQL
+    contact_count = Column(Integer, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -0,0 +1,48 @@
+# feature/models/contact_job.py
+from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, Index, JSON, Enum as SQLEnum
+from sqlalchemy.sql import func
+from app.core.database import Base
+import uuid
+import enum
+
+
+class ContactSyncJobStatus(str, enum.Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class ContactSyncJob(Base):
+    __tablename__ = "contact_sync_jobs"
+
+    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    owner_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    status = Column(SQLEnum(ContactSyncJobStatus), default=ContactSyncJobStatus.QUEUED, nullable=False)
+
+    # The uploaded contacts; processed_contacts is the resume offset into this
+    # list. Cleared once the job finishes.
+    contacts = Column(JSON, nullable=False)
+    total_contacts = Column(Integer, nullable=False, default=0)
+    processed_contacts = Column(Integer, nullable=False, default=0)
+    chunks_completed = Column(Integer, nullable=False, default=0)
+    match_count = Column(Integer, nullable=False, default=0)
+    error = Column(String(1000), nullable=True)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    completed_at = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        Index('idx_contact_sync_job_status', 'status', 'updated_at'),
+    )
+
+
+class ContactSyncJobChunk(Base):
+    """Matches of one processed chunk, appended as the job checkpoints"""
+    __tablename__ = "contact_sync_job_chunks"
+
+    job_id = Column(String(36), ForeignKey("contact_sync_jobs.id", ondelete="CASCADE"), primary_key=True)
+    chunk_index = Column(Integer, primary_key=True)
+    matches = Column(JSON, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -1,5 +1,5 @@
 # feature/models/friend.py
-from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, Index, Enum as SQLEnum
+from sqlalchemy import Boolean, Column, Float, String, Integer, DateTime, ForeignKey, Index, Enum as SQLEnum
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
@@ -37,6 +37,7 @@ class FriendRequest(Base):
     )
     __table_args__ = (
         Index('idx_friend_request_users', 'requester_id', 'receiver_id'),
+        Index('idx_friend_request_receiver_status', 'receiver_id', 'status'),
     )
 
 class BlockedUser(Base):
@@ -54,4 +55,35 @@ class BlockedUser(Base):
 
     __table_args__ = (
         Index('idx_blocked_users', 'blocker_id', 'blocked_id', unique=True),
-    )
\ No newline at end of file
+        Index('idx_blocked_users_blocked', 'blocked_id', 'blocker_id'),
+    )
+
+class Friendship(Base):
+    """
+    Accepted friendships, stored once in each direction so "friends of X"
+    is a range scan on the primary key
+    """
+    __tablename__ = "friendships"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    friend_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+class FriendSuggestion(Base):
+    """Top ranked "people you may know" per user, written by the batch suggestion engine"""
+    __tablename__ = "friend_suggestions"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    suggested_user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    rank = Column(Integer, nullable=False)
+    score = Column(Float, nullable=False)
+    mutual_friends = Column(Integer, nullable=False, default=0)
+    shared_contacts = Column(Integer, nullable=False, default=0)
+    in_contacts = Column(Boolean, nullable=False, default=False)
+    run_id = Column(Integer, nullable=False)  # Engine run that produced the row
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        Index('idx_friend_suggestion_rank', 'user_id', 'rank'),
+    )
@@ -0,0 +1,26 @@
+# feature/models/notification.py
+from sqlalchemy import Column, String, Integer, Boolean, DateTime, ForeignKey, Index, Enum as SQLEnum
+from sqlalchemy.sql import func
+from app.core.database import Base
+import uuid
+import enum
+
+
+class NotificationType(str, enum.Enum):
+    CONTACT_JOINED = "contact_joined"
+
+
+class Notification(Base):
+    __tablename__ = "notifications"
+
+    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    type = Column(SQLEnum(NotificationType), nullable=False)
+    actor_user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=True)
+    message = Column(String(500), nullable=False)
+    is_read = Column(Boolean, nullable=False, default=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        Index('idx_notification_user_created', 'user_id', 'created_at'),
+    )
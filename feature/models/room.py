@@ -45,6 +45,10 @@ class Room(Base):
 
     # Room Settings
     max_participants = Column(Integer, default=100)
+    # Participants by status, maintained by RoomService with each status change
+    approved_count = Column(Integer, nullable=False, default=0, server_default='0')
+    pending_count = Column(Integer, nullable=False, default=0, server_default='0')
+    total_count = Column(Integer, nullable=False, default=0, server_default='0')  # every status
     auto_approve_participants = Column(Boolean, default=False)
     is_archived = Column(Boolean, default=False)
 
@@ -67,6 +71,9 @@ class Room(Base):
     __table_args__ = (
         Index('idx_room_status_timing', 'status', 'activation_time', 'expiration_time'),
         Index('idx_room_type_privacy', 'room_type', 'privacy_type'),
+        # Keyset listing order, overall and per owner
+        Index('idx_room_archived_created', 'is_archived', 'created_at', 'id'),
+        Index('idx_room_owner_created', 'owner_id', 'created_at', 'id'),
     )
 
     def is_active(self) -> bool:
@@ -83,8 +90,8 @@ class Room(Base):
         """Check if new participants can join the room."""
         return (
                 self.is_active() and
-                (self.max_participants is None or
-                 len(self.participants) < self.max_participants)
+                (not self.max_participants or
+                 self.approved_count < self.max_participants)
         )
 
 
@@ -112,4 +119,5 @@ class RoomParticipant(Base):
     __table_args__ = (
         Index('idx_room_participant', 'room_id', 'user_id', unique=True),
         Index('idx_participant_status', 'status'),
+        Index('idx_participant_user_status', 'user_id', 'status', 'room_id'),  # "rooms I'm in" semi-join
     )
\ No newline at end of file
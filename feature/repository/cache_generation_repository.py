@@ -0,0 +1,90 @@
+# feature/repository/cache_generation_repository.py
+from datetime import datetime
+from typing import Iterable, Optional, Set
+from sqlalchemy import or_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from ..models.cache_state import CacheGeneration, CacheChange
+
+
+class CacheGenerationRepository:
+    @staticmethod
+    def get_generation(db: Session, name: str) -> int:
+        generation = db.query(CacheGeneration.generation).filter(
+            CacheGeneration.name == name
+        ).scalar()
+        return generation or 0
+
+    @staticmethod
+    def bump_generation(db: Session, name: str) -> int:
+        """Increment a generation inside the caller's transaction and return it"""
+        updated = db.query(CacheGeneration).filter(
+            CacheGeneration.name == name
+        ).update(
+            {CacheGeneration.generation: CacheGeneration.generation + 1},
+            synchronize_session=False
+        )
+        if not updated:
+            db.add(CacheGeneration(name=name, generation=1))
+            db.flush()
+            return 1
+
+        return CacheGenerationRepository.get_generation(db, name)
+
+    @staticmethod
+    def record_changes(db: Session, name: str, generation: int, keys: Iterable[str]) -> None:
+        """
+        Log the keys a generation changed, inside the caller's transaction.
+        Entries older than CACHE_CHANGE_LOG_RETENTION generations are pruned;
+        a cache that far behind rebuilds instead.
+        """
+        db.bulk_insert_mappings(CacheChange, [
+            {'name': name, 'generation': generation, 'key': key}
+            for key in set(keys) or {""}
+        ])
+        if generation % 100 == 0:
+            db.query(CacheChange).filter(
+                CacheChange.name == name,
+                CacheChange.generation <= generation - settings.CACHE_CHANGE_LOG_RETENTION
+            ).delete(synchronize_session=False)
+
+    @staticmethod
+    def get_changes(db: Session, name: str, after: int, upto: int) -> Optional[Set[str]]:
+        """Keys changed by the generations after..upto, or None if any of them is missing from the log"""
+        if not 0 <= upto - after <= settings.CACHE_CHANGE_LOG_RETENTION:
+            return None
+
+        rows = db.query(CacheChange.generation, CacheChange.key).filter(
+            CacheChange.name == name,
+            CacheChange.generation > after,
+            CacheChange.generation <= upto
+        ).all()
+        if len({generation for generation, _ in rows}) != upto - after:
+            return None
+        return {key for _, key in rows if key}
+
+    @staticmethod
+    def claim_run(db: Session, name: str, due_before: datetime) -> int:
+        """
+        Claim a periodic run across workers: bump the generation if the last
+        run started before due_before. Commits; returns the new generation,
+        or 0 if another worker ran it more recently.
+        """
+        if db.query(CacheGeneration.name).filter(CacheGeneration.name == name).scalar() is None:
+            db.add(CacheGeneration(name=name, generation=1, updated_at=datetime.utcnow()))
+            try:
+                db.commit()
+                return 1
+            except IntegrityError:
+                db.rollback()  # Another worker created it first
+
+        claimed = db.query(CacheGeneration).filter(
+            CacheGeneration.name == name,
+            or_(CacheGeneration.updated_at.is_(None), CacheGeneration.updated_at < due_before)
+        ).update({
+            CacheGeneration.generation: CacheGeneration.generation + 1,
+            CacheGeneration.updated_at: datetime.utcnow()
+        }, synchronize_session=False)
+        db.commit()
+        return CacheGenerationRepository.get_generation(db, name) if claimed else 0
@@ -0,0 +1,98 @@
+# feature/repository/contact_graph_repository.py
+from array import array
+from sqlalchemy.orm import Session
+from typing import Dict, Iterable, List
+from ..models.contact import ContactAdjacency, ContactRegistry
+from ..utils.id_array import IdArrayUtils
+
+
+class ContactGraphRepository:
+    @staticmethod
+    async def get_adjacency(db: Session, user_ids: List[int]) -> Dict[int, array]:
+        """
+        Load the contact adjacency arrays for the given users. Users without a
+        stored row are built from contact_registry in one query and persisted
+        (without committing); a row another sync stored meanwhile is kept.
+        """
+        user_ids = list(set(user_ids))
+        if not user_ids:
+            return {}
+
+        adjacency = {
+            owner_id: IdArrayUtils.unpack(contact_ids)
+            for owner_id, contact_ids in db.query(
+                ContactAdjacency.owner_id,
+                ContactAdjacency.contact_ids
+            ).filter(ContactAdjacency.owner_id.in_(user_ids)).all()
+        }
+
+        missing = [user_id for user_id in user_ids if user_id not in adjacency]
+        if missing:
+            contacts = {user_id: [] for user_id in missing}
+            for owner_id, registered_user_id in db.query(
+                ContactRegistry.owner_id,
+                ContactRegistry.registered_user_id
+            ).filter(
+                ContactRegistry.owner_id.in_(missing),
+                ContactRegistry.registered_user_id.isnot(None)
+            ).all():
+                contacts[owner_id].append(registered_user_id)
+
+            built = {owner_id: IdArrayUtils.from_ids(ids) for owner_id, ids in contacts.items()}
+            ContactGraphRepository._insert_missing(db, [
+                {
+                    'owner_id': owner_id,
+                    'contact_ids': IdArrayUtils.pack(ids),
+                    'contact_count': len(ids)
+                } for owner_id, ids in built.items()
+            ])
+            adjacency.update(built)
+
+        return adjacency
+
+    @staticmethod
+    def _insert_missing(db: Session, rows: List[Dict]) -> None:
+        """
+        Insert adjacency rows, skipping owners that already have one, with
+        the dialect's native upsert. Two syncs sharing a matched contact
+        both build its array; the later insert must not fail the sync.
+        Other dialects keep the arrays in memory only.
+        """
+        table = ContactAdjacency.__table__
+        dialect = db.get_bind().dialect.name
+
+        if dialect == "mysql":
+            from sqlalchemy.dialects.mysql import insert
+            stmt = insert(table)
+            stmt = stmt.on_duplicate_key_update(owner_id=table.c.owner_id)
+        elif dialect in ("sqlite", "postgresql"):
+            if dialect == "sqlite":
+                from sqlalchemy.dialects.sqlite import insert
+            else:
+                from sqlalchemy.dialects.postgresql import insert
+            stmt = insert(table).on_conflict_do_nothing(index_elements=[table.c.owner_id])
+        else:
+            return
+
+        db.execute(stmt, rows)
+
+    @staticmethod
+    async def add_contacts(db: Session, owner_id: int, current: array, new_ids: Iterable[int]) -> array:
+        """Merge newly registered contacts into an owner's stored array (no commit)"""
+        merged = IdArrayUtils.merge(current, new_ids)
+        if len(merged) != len(current):
+            db.query(ContactAdjacency).filter(
+                ContactAdjacency.owner_id == owner_id
+            ).update({
+                'contact_ids': IdArrayUtils.pack(merged),
+                'contact_count': len(merged)
+            }, synchronize_session=False)
+        return merged
+
+    @staticmethod
+    async def invalidate(db: Session, owner_ids: List[int]) -> None:
+        """Drop stored arrays so they are rebuilt from the registry on next use"""
+        if owner_ids:
+            db.query(ContactAdjacency).filter(
+                ContactAdjacency.owner_id.in_(owner_ids)
+            ).delete(synchronize_session=False)
@@ -0,0 +1,126 @@
+# feature/repository/contact_job_repository.py
+from datetime import datetime
+from sqlalchemy.orm import Session
+from sqlalchemy import and_, or_
+from typing import Dict, List, Optional
+from ..models.contact_job import ContactSyncJob, ContactSyncJobChunk, ContactSyncJobStatus
+
+
+class ContactJobRepository:
+    @staticmethod
+    async def create_job(db: Session, owner_id: int, contacts: List[Dict]) -> ContactSyncJob:
+        job = ContactSyncJob(
+            owner_id=owner_id,
+            contacts=contacts,
+            total_contacts=len(contacts),
+            updated_at=datetime.utcnow()
+        )
+        db.add(job)
+        db.commit()
+        db.refresh(job)
+        return job
+
+    @staticmethod
+    async def get_job(db: Session, job_id: str) -> Optional[ContactSyncJob]:
+        return db.query(ContactSyncJob).filter(ContactSyncJob.id == job_id).first()
+
+    @staticmethod
+    async def get_runnable_job_ids(db: Session, stale_before: datetime) -> List[str]:
+        """Queued jobs plus running jobs whose worker stopped checkpointing"""
+        return [job_id for (job_id,) in db.query(ContactSyncJob.id).filter(
+            or_(
+                ContactSyncJob.status == ContactSyncJobStatus.QUEUED,
+                and_(
+                    ContactSyncJob.status == ContactSyncJobStatus.RUNNING,
+                    ContactSyncJob.updated_at < stale_before
+                )
+            )
+        ).order_by(ContactSyncJob.created_at).all()]
+
+    @staticmethod
+    async def claim_job(db: Session, job_id: str, stale_before: datetime) -> bool:
+        """Atomically mark a runnable job as running; False if another worker owns it"""
+        claimed = db.query(ContactSyncJob).filter(
+            ContactSyncJob.id == job_id,
+            or_(
+                ContactSyncJob.status == ContactSyncJobStatus.QUEUED,
+                and_(
+                    ContactSyncJob.status == ContactSyncJobStatus.RUNNING,
+                    ContactSyncJob.updated_at < stale_before
+                )
+            )
+        ).update({
+            ContactSyncJob.status: ContactSyncJobStatus.RUNNING,
+            ContactSyncJob.updated_at: datetime.utcnow()
+        }, synchronize_session=False)
+        db.commit()
+        return claimed > 0
+
+    @staticmethod
+    async def add_chunk(
+            db: Session,
+            job: ContactSyncJob,
+            chunk_index: int,
+            matches: List[Dict],
+            processed_contacts: int
+    ) -> None:
+        """Record a chunk's matches and advance the resume offset (caller commits)"""
+        db.add(ContactSyncJobChunk(
+            job_id=job.id,
+            chunk_index=chunk_index,
+            matches=matches
+        ))
+        job.chunks_completed = chunk_index + 1
+        job.processed_contacts = processed_contacts
+        job.match_count = (job.match_count or 0) + len(matches)
+        job.updated_at = datetime.utcnow()
+
+    @staticmethod
+    async def mark_finished(
+            db: Session,
+            job_id: str,
+            status: ContactSyncJobStatus,
+            error: Optional[str] = None
+    ) -> None:
+        now = datetime.utcnow()
+        db.query(ContactSyncJob).filter(ContactSyncJob.id == job_id).update({
+            ContactSyncJob.status: status,
+            ContactSyncJob.contacts: [],  # Nothing left to resume; don't keep the upload
+            ContactSyncJob.error: error[:1000] if error else None,
+            ContactSyncJob.updated_at: now,
+            ContactSyncJob.completed_at: now
+        }, synchronize_session=False)
+        db.commit()
+
+    @staticmethod
+    async def purge_finished_jobs(db: Session, finished_before: datetime, batch_size: int = 500) -> int:
+        """Delete finished jobs last updated before finished_before, with their chunks, in committed batches"""
+        purged = 0
+        while True:
+            job_ids = [job_id for (job_id,) in db.query(ContactSyncJob.id).filter(
+                ContactSyncJob.status.in_([ContactSyncJobStatus.COMPLETED, ContactSyncJobStatus.FAILED]),
+                ContactSyncJob.updated_at < finished_before
+            ).limit(batch_size).all()]
+            if not job_ids:
+                return purged
+
+            db.query(ContactSyncJobChunk).filter(
+                ContactSyncJobChunk.job_id.in_(job_ids)
+            ).delete(synchronize_session=False)
+            db.query(ContactSyncJob).filter(
+                ContactSyncJob.id.in_(job_ids)
+            ).delete(synchronize_session=False)
+            db.commit()
+            purged += len(job_ids)
+
+    @staticmethod
+    async def get_chunks(
+            db: Session,
+            job_id: str,
+            after_chunk: int = -1,
+            limit: int = 20
+    ) -> List[ContactSyncJobChunk]:
+        return db.query(ContactSyncJobChunk).filter(
+            ContactSyncJobChunk.job_id == job_id,
+            ContactSyncJobChunk.chunk_index > after_chunk
+        ).order_by(ContactSyncJobChunk.chunk_index).limit(limit).all()
@@ -1,7 +1,8 @@
 # feature/repository/contact_repository.py
 from sqlalchemy.orm import Session
-from typing import List, Optional
-from ..models.contact import ContactRegistry
+from sqlalchemy import func, or_
+from typing import Dict, List, Optional, Tuple
+from ..models.contact import ContactRegistry, ContactSyncState
 
 class ContactRepository:
     @staticmethod
@@ -26,4 +27,159 @@ class ContactRepository:
         db.add(contact)
         db.commit()
         db.refresh(contact)
-        return contact
\ No newline at end of file
+        return contact
+
+    @staticmethod
+    async def get_sync_state(db: Session, owner_id: int) -> Optional[ContactSyncState]:
+        return db.query(ContactSyncState).filter(
+            ContactSyncState.owner_id == owner_id
+        ).first()
+
+    @staticmethod
+    async def save_sync_state(db: Session, owner_id: int, fingerprint: str, contact_count: int) -> ContactSyncState:
+        state = db.query(ContactSyncState).filter(
+            ContactSyncState.owner_id == owner_id
+        ).first()
+        if state:
+            state.fingerprint = fingerprint
+            state.contact_count = contact_count
+        else:
+            state = ContactSyncState(
+                owner_id=owner_id,
+                fingerprint=fingerprint,
+                contact_count=contact_count
+            )
+            db.add(state)
+        db.commit()
+        return state
+
+    @staticmethod
+    async def get_owner_phone_numbers(db: Session, owner_id: int) -> List[Tuple[str, Optional[str], Optional[int]]]:
+        """(phone_number, normalized_phone, registered_user_id) of every registry row the owner holds"""
+        return db.query(
+            ContactRegistry.phone_number,
+            ContactRegistry.normalized_phone,
+            ContactRegistry.registered_user_id
+        ).filter(
+            ContactRegistry.owner_id == owner_id
+        ).all()
+
+    @staticmethod
+    async def get_registered_user_ids(db: Session, owner_id: int, phone_numbers: List[str]) -> Dict[str, int]:
+        """phone_number -> registered_user_id of the owner's already matched rows among phone_numbers"""
+        return dict(db.query(ContactRegistry.phone_number, ContactRegistry.registered_user_id).filter(
+            ContactRegistry.owner_id == owner_id,
+            ContactRegistry.phone_number.in_(phone_numbers),
+            ContactRegistry.registered_user_id.isnot(None)
+        ).all())
+
+    @staticmethod
+    async def delete_contacts(
+            db: Session,
+            owner_id: int,
+            phone_numbers: List[str],
+            normalized_phones: Optional[List[str]] = None
+    ) -> int:
+        """Delete the owner's rows stored as any of phone_numbers or normalized to any of normalized_phones (no commit)"""
+        conditions = []
+        if phone_numbers:
+            conditions.append(ContactRegistry.phone_number.in_(phone_numbers))
+        if normalized_phones:
+            conditions.append(ContactRegistry.normalized_phone.in_(normalized_phones))
+        if not conditions:
+            return 0
+        deleted = db.query(ContactRegistry).filter(
+            ContactRegistry.owner_id == owner_id,
+            or_(*conditions)
+        ).delete(synchronize_session=False)
+        return deleted
+
+    @staticmethod
+    async def get_unlinked_holders(db: Session, normalized_phone: str, user_id: int) -> List[tuple]:
+        """(owner_id, contact_name) of every registry row holding this number but not yet linked to the user"""
+        return db.query(
+            ContactRegistry.owner_id,
+            ContactRegistry.contact_name
+        ).filter(
+            ContactRegistry.normalized_phone == normalized_phone,
+            ContactRegistry.registered_user_id.is_(None),
+            ContactRegistry.owner_id != user_id
+        ).all()
+
+    @staticmethod
+    async def link_registered_user(db: Session, normalized_phone: str, user_id: int) -> int:
+        """Point every unlinked registry row holding this number at the user in one UPDATE (no commit)"""
+        return db.query(ContactRegistry).filter(
+            ContactRegistry.normalized_phone == normalized_phone,
+            ContactRegistry.registered_user_id.is_(None),
+            ContactRegistry.owner_id != user_id
+        ).update({
+            'registered_user_id': user_id,
+            'updated_at': func.now()
+        }, synchronize_session=False)
+
+    @staticmethod
+    async def bulk_upsert_contacts(db: Session, rows: List[Dict]) -> None:
+        """
+        Insert or update registry rows for one owner keyed on the unique
+        (owner_id, phone_number) index, using the dialect's native upsert.
+        Rows must share the same keys. Does not commit.
+        """
+        if not rows:
+            return
+
+        table = ContactRegistry.__table__
+        dialect = db.get_bind().dialect.name
+
+        if dialect == "mysql":
+            from sqlalchemy.dialects.mysql import insert
+            stmt = insert(table)
+            stmt = stmt.on_duplicate_key_update(
+                contact_name=stmt.inserted.contact_name,
+                normalized_phone=stmt.inserted.normalized_phone,
+                registered_user_id=stmt.inserted.registered_user_id,
+                updated_at=func.now()
+            )
+        elif dialect in ("sqlite", "postgresql"):
+            if dialect == "sqlite":
+                from sqlalchemy.dialects.sqlite import insert
+            else:
+                from sqlalchemy.dialects.postgresql import insert
+            stmt = insert(table)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[table.c.owner_id, table.c.phone_number],
+                set_={
+                    "contact_name": stmt.excluded.contact_name,
+                    "normalized_phone": stmt.excluded.normalized_phone,
+                    "registered_user_id": stmt.excluded.registered_user_id,
+                    "updated_at": func.now()
+                }
+            )
+        else:
+            await ContactRepository._select_then_upsert(db, rows)
+            return
+
+        db.execute(stmt, rows)
+
+    @staticmethod
+    async def _select_then_upsert(db: Session, rows: List[Dict]) -> None:
+        """Portable fallback for dialects without a native upsert"""
+        existing = db.query(ContactRegistry).filter(
+            ContactRegistry.owner_id == rows[0]['owner_id'],
+            ContactRegistry.phone_number.in_([row['phone_number'] for row in rows])
+        ).all()
+        existing_map = {c.phone_number: c for c in existing}
+
+        inserts = []
+        for row in rows:
+            contact = existing_map.get(row['phone_number'])
+            if contact:
+                contact.contact_name = row['contact_name']
+                contact.normalized_phone = row['normalized_phone']
+                contact.registered_user_id = row['registered_user_id']
+            else:
+                inserts.append(row)
+
+        if inserts:
+            db.bulk_insert_mappings(ContactRegistry, inserts)
+        db.flush()
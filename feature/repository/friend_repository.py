@@ -1,11 +1,12 @@
 # feature/repository/friend_repository.py
-from sqlalchemy.orm import Session, joinedload
-from ..models.friend import FriendRequest, BlockedUser, FriendRequestStatus
+from sqlalchemy.orm import Session, aliased, joinedload
+from ..models.friend import FriendRequest, BlockedUser, FriendRequestStatus, Friendship
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
-from typing import List, Optional
+from sqlalchemy import Row, Select, and_, case, or_, select, func, update
+from typing import Dict, Iterator, List, Optional, Set, Tuple
 from ..models.friend import FriendRequest, FriendRequestStatus
 from app.models.user import User
+import uuid
 
 class FriendRepository:
     @staticmethod
@@ -40,6 +41,47 @@ class FriendRepository:
             )
         ).first()
 
+    @staticmethod
+    def _bump_counters(db: Session, user_ids: List[int], **deltas: int) -> None:
+        """Atomically add deltas to users' social counters, in the caller's transaction"""
+        db.query(User).filter(User.id.in_(user_ids)).update(
+            {getattr(User, counter): getattr(User, counter) + delta for counter, delta in deltas.items()},
+            synchronize_session=False
+        )
+
+    @staticmethod
+    def recount_social_counters(db: Session, first_id: int, last_id: int) -> int:
+        """
+        Recompute the counters of users first_id..last_id from friendships and
+        pending requests (no commit); returns how many users had drifted
+        """
+        friend_count = select(func.count()).select_from(Friendship) \
+            .where(Friendship.user_id == User.id).scalar_subquery()
+        incoming = select(func.count()).select_from(FriendRequest) \
+            .where(FriendRequest.receiver_id == User.id, FriendRequest.status == FriendRequestStatus.PENDING) \
+            .scalar_subquery()
+        outgoing = select(func.count()).select_from(FriendRequest) \
+            .where(FriendRequest.requester_id == User.id, FriendRequest.status == FriendRequestStatus.PENDING) \
+            .scalar_subquery()
+
+        return db.execute(
+            update(User)
+            .where(
+                User.id.between(first_id, last_id),
+                or_(
+                    User.friend_count != friend_count,
+                    User.incoming_pending_count != incoming,
+                    User.outgoing_pending_count != outgoing
+                )
+            )
+            .values(friend_count=friend_count, incoming_pending_count=incoming, outgoing_pending_count=outgoing)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+
+    @staticmethod
+    def get_max_user_id(db: Session) -> int:
+        return db.query(func.max(User.id)).scalar() or 0
+
     @staticmethod
     async def create_friend_request(
             db: Session,
@@ -51,6 +93,8 @@ class FriendRepository:
             receiver_id=receiver_id
         )
         db.add(friend_request)
+        FriendRepository._bump_counters(db, [requester_id], outgoing_pending_count=1)
+        FriendRepository._bump_counters(db, [receiver_id], incoming_pending_count=1)
         db.commit()
         db.refresh(friend_request)
 
@@ -63,24 +107,79 @@ class FriendRepository:
             .filter(FriendRequest.id == friend_request.id) \
             .first()
 
+    @staticmethod
+    async def get_pending_receiver_ids(
+            db: Session,
+            requester_id: int,
+            receiver_ids: List[int]
+    ) -> Set[int]:
+        """Receivers among receiver_ids that already have a pending request from requester_id"""
+        return {receiver_id for (receiver_id,) in db.query(FriendRequest.receiver_id).filter(
+            FriendRequest.requester_id == requester_id,
+            FriendRequest.receiver_id.in_(receiver_ids),
+            FriendRequest.status == FriendRequestStatus.PENDING
+        ).all()}
+
+    @staticmethod
+    async def bulk_create_friend_requests(
+            db: Session,
+            requester_id: int,
+            receiver_ids: List[int]
+    ) -> Dict[int, str]:
+        """Insert pending requests in one statement and commit; returns receiver_id -> request id"""
+        request_ids = {receiver_id: str(uuid.uuid4()) for receiver_id in receiver_ids}
+        if request_ids:
+            db.bulk_insert_mappings(FriendRequest, [
+                {
+                    'id': request_id,
+                    'requester_id': requester_id,
+                    'receiver_id': receiver_id,
+                    'status': FriendRequestStatus.PENDING
+                } for receiver_id, request_id in request_ids.items()
+            ])
+            FriendRepository._bump_counters(db, [requester_id], outgoing_pending_count=len(request_ids))
+            FriendRepository._bump_counters(db, list(request_ids), incoming_pending_count=1)
+        db.commit()
+        return request_ids
+
+    # User columns a request listing shows for each side
+    REQUEST_USER_COLUMNS = ('id', 'first_name', 'last_name', 'profile_picture_url', 'date_of_birth')
+
+    @staticmethod
+    def _request_rows_select() -> Select:
+        """
+        Friend requests with both users' listing columns, as plain rows: no
+        User entities are hydrated and nothing enters the identity map
+        """
+        requester = aliased(User)
+        receiver = aliased(User)
+        return select(
+            FriendRequest.id,
+            FriendRequest.status,
+            FriendRequest.created_at,
+            FriendRequest.updated_at,
+            *[getattr(requester, column).label(f'requester_{column}') for column in FriendRepository.REQUEST_USER_COLUMNS],
+            *[getattr(receiver, column).label(f'receiver_{column}') for column in FriendRepository.REQUEST_USER_COLUMNS]
+        ) \
+            .join(requester, requester.id == FriendRequest.requester_id) \
+            .join(receiver, receiver.id == FriendRequest.receiver_id)
+
     @staticmethod
     async def get_incoming_requests(
             db: Session,
             user_id: int,
             skip: int = 0,
             limit: int = 10
-    ) -> List[FriendRequest]:
-        return db.query(FriendRequest) \
-            .join(User, User.id == FriendRequest.requester_id).options(
-            joinedload(FriendRequest.requester),
-            joinedload(FriendRequest.receiver)
-        ) \
-            .filter(
-            and_(
+    ) -> List[Row]:
+        return db.execute(
+            FriendRepository._request_rows_select()
+            .where(
                 FriendRequest.receiver_id == user_id,
                 FriendRequest.status == FriendRequestStatus.PENDING
             )
-        ).offset(skip).limit(limit).all()
+            .offset(skip)
+            .limit(limit)
+        ).all()
 
     @staticmethod
     async def get_outgoing_requests(
@@ -88,27 +187,39 @@ class FriendRepository:
             user_id: int,
             skip: int = 0,
             limit: int = 10
-    ) -> List[FriendRequest]:
-        return db.query(FriendRequest) \
-            .options(
-            joinedload(FriendRequest.requester),
-            joinedload(FriendRequest.receiver)
-        ) \
-            .filter(
-            and_(
+    ) -> List[Row]:
+        return db.execute(
+            FriendRepository._request_rows_select()
+            .where(
                 FriendRequest.requester_id == user_id,
                 FriendRequest.status == FriendRequestStatus.PENDING
             )
-        ).offset(skip).limit(limit).all()
+            .offset(skip)
+            .limit(limit)
+        ).all()
 
     @staticmethod
     async def update_request_status(
             db: Session,
             request: FriendRequest,
             status: FriendRequestStatus
-    ) -> FriendRequest:
-        request.status = status
-        db.add(request)
+    ) -> Optional[FriendRequest]:
+        """
+        Move a pending request to status and commit, along with anything the
+        caller staged. The UPDATE only matches a request that is still
+        pending, so of two concurrent handlers only one moves the pending
+        counters; the other gets None and its changes are rolled back.
+        """
+        updated = db.query(FriendRequest).filter(
+            FriendRequest.id == request.id,
+            FriendRequest.status == FriendRequestStatus.PENDING
+        ).update({FriendRequest.status: status}, synchronize_session=False)
+        if updated != 1:
+            db.rollback()
+            return None
+
+        FriendRepository._bump_counters(db, [request.requester_id], outgoing_pending_count=-1)
+        FriendRepository._bump_counters(db, [request.receiver_id], incoming_pending_count=-1)
         db.commit()
         db.refresh(request)
 
@@ -136,6 +247,25 @@ class FriendRepository:
             )
         ).first() is not None
 
+    @staticmethod
+    def iter_block_pairs(db: Session, batch_size: int = 10000) -> Iterator[Tuple[int, int]]:
+        """Stream every (blocker_id, blocked_id) pair"""
+        return db.query(
+            BlockedUser.blocker_id,
+            BlockedUser.blocked_id
+        ).yield_per(batch_size)
+
+    @staticmethod
+    async def get_block_set(db: Session, user_id: int) -> Set[int]:
+        """Ids of users this user blocked or was blocked by"""
+        blocked = db.query(BlockedUser.blocked_id.label('other_id')).filter(
+            BlockedUser.blocker_id == user_id
+        )
+        blocked_by = db.query(BlockedUser.blocker_id.label('other_id')).filter(
+            BlockedUser.blocked_id == user_id
+        )
+        return {other_id for (other_id,) in blocked.union_all(blocked_by).all()}
+
     @staticmethod
     async def block_user(
             db: Session,
@@ -143,14 +273,14 @@ class FriendRepository:
             blocked_id: int,
             reason: Optional[str] = None
     ) -> BlockedUser:
+        """Insert the block (no commit; the caller commits it with the cache generation bump)"""
         blocked = BlockedUser(
             blocker_id=blocker_id,
             blocked_id=blocked_id,
             reason=reason
         )
         db.add(blocked)
-        db.commit()
-        db.refresh(blocked)
+        db.flush()
         return blocked
 
     @staticmethod
@@ -159,40 +289,125 @@ class FriendRepository:
             blocker_id: int,
             blocked_id: int
     ) -> bool:
+        """Delete the block (no commit); returns whether there was one"""
         result = db.query(BlockedUser).filter(
             and_(
                 BlockedUser.blocker_id == blocker_id,
                 BlockedUser.blocked_id == blocked_id
             )
-        ).delete()
-        db.commit()
+        ).delete(synchronize_session=False)
         return result > 0
 
     @staticmethod
-    async def get_friends(
+    async def add_friendship(
             db: Session,
             user_id: int,
-            skip: int = 0,
+            friend_id: int
+    ) -> None:
+        """Write the friendship in both directions (no commit)"""
+        existing = set(db.query(Friendship.user_id, Friendship.friend_id).filter(
+            or_(
+                and_(Friendship.user_id == user_id, Friendship.friend_id == friend_id),
+                and_(Friendship.user_id == friend_id, Friendship.friend_id == user_id)
+            )
+        ).all())
+        for edge in ((user_id, friend_id), (friend_id, user_id)):
+            if edge not in existing:
+                db.add(Friendship(user_id=edge[0], friend_id=edge[1]))
+                FriendRepository._bump_counters(db, [edge[0]], friend_count=1)
+
+    @staticmethod
+    def friend_ids_select(user_id: int) -> Select:
+        """SELECT friend_id FROM friendships WHERE user_id = ?, for use in IN / joins"""
+        return select(Friendship.friend_id).where(Friendship.user_id == user_id)
+
+    @staticmethod
+    async def get_friend_ids(db: Session, user_id: int) -> List[int]:
+        return [friend_id for (friend_id,) in db.query(Friendship.friend_id).filter(
+            Friendship.user_id == user_id
+        ).all()]
+
+    @staticmethod
+    async def get_mutual_friend_pairs(db: Session, user_id: int, target_ids: List[int]) -> List[Tuple[int, int]]:
+        """(target_id, mutual friend id) for every friend user_id shares with each target"""
+        if not target_ids:
+            return []
+        theirs = aliased(Friendship)
+        return db.query(theirs.user_id, theirs.friend_id) \
+            .join(Friendship, Friendship.friend_id == theirs.friend_id) \
+            .filter(
+                Friendship.user_id == user_id,
+                theirs.user_id.in_(target_ids)
+            ) \
+            .all()
+
+    @staticmethod
+    async def get_user_names(db: Session, user_ids: List[int]) -> Dict[int, Optional[str]]:
+        """First names by user id"""
+        if not user_ids:
+            return {}
+        return dict(db.query(User.id, User.first_name).filter(User.id.in_(user_ids)).all())
+
+    @staticmethod
+    async def get_users_by_ids(db: Session, user_ids: List[int]) -> List[User]:
+        """Users with the given ids, in id order"""
+        if not user_ids:
+            return []
+        return db.query(User).filter(User.id.in_(user_ids)).order_by(User.id).all()
+
+    @staticmethod
+    async def get_friends_after(
+            db: Session,
+            user_id: int,
+            after: Optional[Tuple[str, int]] = None,
             limit: int = 10
     ) -> List[User]:
-        # Get all accepted friend requests where the user is either the requester or receiver
-        friend_requests = db.query(FriendRequest).filter(
-            and_(
+        """Friends ordered by (first_name, id), starting after the given sort key"""
+        sort_name = func.coalesce(User.first_name, '')
+        query = db.query(User) \
+            .join(Friendship, Friendship.friend_id == User.id) \
+            .filter(Friendship.user_id == user_id)
+
+        if after:
+            after_name, after_id = after
+            query = query.filter(
                 or_(
-                    FriendRequest.requester_id == user_id,
-                    FriendRequest.receiver_id == user_id
-                ),
-                FriendRequest.status == FriendRequestStatus.ACCEPTED
+                    sort_name > after_name,
+                    and_(sort_name == after_name, User.id > after_id)
+                )
             )
-        ).all()
 
-        # Extract friend IDs
-        friend_ids = []
-        for request in friend_requests:
-            friend_id = request.receiver_id if request.requester_id == user_id else request.requester_id
-            friend_ids.append(friend_id)
+        return query.order_by(sort_name, User.id).limit(limit).all()
 
-        # Get friend details
-        return db.query(User).filter(
-            User.id.in_(friend_ids)
-        ).offset(skip).limit(limit).all()
\ No newline at end of file
+    @staticmethod
+    async def count_friends(db: Session, user_id: int) -> int:
+        return db.query(func.count()).select_from(Friendship).filter(
+            Friendship.user_id == user_id
+        ).scalar()
+
+    @staticmethod
+    async def get_upcoming_birthdays(
+            db: Session,
+            user_id: int,
+            key_ranges: List[Tuple[int, int]],
+            limit: int = 50
+    ) -> List[User]:
+        """
+        Friends whose birthday_key falls in the given inclusive ranges, in
+        calendar order starting from the first range (so a window that
+        wraps the year lists December before January)
+        """
+        start_key = key_ranges[0][0]
+        return db.query(User) \
+            .join(Friendship, Friendship.friend_id == User.id) \
+            .filter(
+                Friendship.user_id == user_id,
+                or_(*[User.birthday_key.between(low, high) for low, high in key_ranges])
+            ) \
+            .order_by(
+                case((User.birthday_key >= start_key, 0), else_=1),
+                User.birthday_key,
+                User.id
+            ) \
+            .limit(limit) \
+            .all()
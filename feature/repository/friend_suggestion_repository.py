@@ -0,0 +1,62 @@
+# feature/repository/friend_suggestion_repository.py
+from sqlalchemy.orm import Session
+from typing import Dict, Iterator, List, Tuple
+from ..models.contact import ContactRegistry
+from ..models.friend import FriendRequest, FriendRequestStatus, FriendSuggestion, Friendship
+from app.models.user import User
+
+
+class FriendSuggestionRepository:
+    """
+    Reads for the batch suggestion engine (streamed, synchronous: the engine
+    runs on a worker thread) and the stored top-K rows served to clients.
+    """
+
+    @staticmethod
+    def iter_friendships(db: Session, batch_size: int = 10000) -> Iterator[Tuple[int, int]]:
+        return db.query(Friendship.user_id, Friendship.friend_id).yield_per(batch_size)
+
+    @staticmethod
+    def iter_registered_contacts(db: Session, batch_size: int = 10000) -> Iterator[Tuple[int, int]]:
+        """(owner_id, registered_user_id) for every registry row that matched a user"""
+        return db.query(
+            ContactRegistry.owner_id,
+            ContactRegistry.registered_user_id
+        ).filter(
+            ContactRegistry.registered_user_id.isnot(None)
+        ).yield_per(batch_size)
+
+    @staticmethod
+    def iter_pending_requests(db: Session, batch_size: int = 10000) -> Iterator[Tuple[int, int]]:
+        return db.query(
+            FriendRequest.requester_id,
+            FriendRequest.receiver_id
+        ).filter(
+            FriendRequest.status == FriendRequestStatus.PENDING
+        ).yield_per(batch_size)
+
+    @staticmethod
+    def replace_for_users(db: Session, user_ids: List[int], rows: List[Dict]) -> None:
+        """Swap in new suggestions for a batch of users (no commit)"""
+        if user_ids:
+            db.query(FriendSuggestion).filter(
+                FriendSuggestion.user_id.in_(user_ids)
+            ).delete(synchronize_session=False)
+        if rows:
+            db.bulk_insert_mappings(FriendSuggestion, rows)
+
+    @staticmethod
+    def delete_older_runs(db: Session, run_id: int) -> int:
+        """Drop suggestions of users who got none in this run (no commit)"""
+        return db.query(FriendSuggestion).filter(
+            FriendSuggestion.run_id < run_id
+        ).delete(synchronize_session=False)
+
+    @staticmethod
+    async def get_suggestions(db: Session, user_id: int, limit: int) -> List[Tuple[FriendSuggestion, User]]:
+        return db.query(FriendSuggestion, User) \
+            .join(User, User.id == FriendSuggestion.suggested_user_id) \
+            .filter(
+            FriendSuggestion.user_id == user_id,
+            User.is_active == True
+        ).order_by(FriendSuggestion.rank).limit(limit).all()
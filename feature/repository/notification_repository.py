@@ -0,0 +1,38 @@
+# feature/repository/notification_repository.py
+from sqlalchemy.orm import Session
+from typing import Dict, List
+from ..models.notification import Notification
+
+
+class NotificationRepository:
+    @staticmethod
+    async def bulk_create(db: Session, rows: List[Dict], batch_size: int = 1000) -> int:
+        """Insert notification rows in batches (no commit)"""
+        for i in range(0, len(rows), batch_size):
+            db.bulk_insert_mappings(Notification, rows[i:i + batch_size])
+        return len(rows)
+
+    @staticmethod
+    async def get_notifications(db: Session, user_id: int, skip: int = 0, limit: int = 20) -> List[Notification]:
+        return db.query(Notification).filter(
+            Notification.user_id == user_id
+        ).order_by(
+            Notification.created_at.desc(),
+            Notification.id
+        ).offset(skip).limit(limit).all()
+
+    @staticmethod
+    async def count_unread(db: Session, user_id: int) -> int:
+        return db.query(Notification).filter(
+            Notification.user_id == user_id,
+            Notification.is_read.is_(False)
+        ).count()
+
+    @staticmethod
+    async def mark_all_read(db: Session, user_id: int) -> int:
+        updated = db.query(Notification).filter(
+            Notification.user_id == user_id,
+            Notification.is_read.is_(False)
+        ).update({'is_read': True}, synchronize_session=False)
+        db.commit()
+        return updated
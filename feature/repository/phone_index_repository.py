@@ -0,0 +1,82 @@
+# feature/repository/phone_index_repository.py
+from sqlalchemy.orm import Session
+from sqlalchemy import func
+from typing import Dict, Iterable, Iterator, List, Tuple
+from ..models.contact import UserPhoneIndex
+from ..utils.phone_utils import PhoneUtils
+from app.models.user import User
+
+
+class PhoneIndexRepository:
+    """
+    Maintains the user_phone_index table. These helpers are synchronous
+    because they are also called from UserService, and they never commit:
+    PhoneIndexService commits them together with the user change.
+    """
+
+    @staticmethod
+    def replace_user_keys(db: Session, user_id: int, phone: str) -> Tuple[List[str], List[str]]:
+        """Drop a user's old phone keys and index the current phone"""
+        old_keys = [key for (key,) in db.query(UserPhoneIndex.phone_key).filter(
+            UserPhoneIndex.user_id == user_id
+        ).all()]
+        if old_keys:
+            db.query(UserPhoneIndex).filter(
+                UserPhoneIndex.user_id == user_id
+            ).delete(synchronize_session=False)
+
+        keys = PhoneUtils.get_index_keys(phone)
+        if keys:
+            db.bulk_insert_mappings(UserPhoneIndex, [
+                {'phone_key': key, 'user_id': user_id} for key in keys
+            ])
+        return old_keys, keys
+
+    @staticmethod
+    def iter_entries(db: Session, batch_size: int = 10000) -> Iterator[Tuple[str, int]]:
+        """Stream every (phone_key, user_id) pair, oldest account first"""
+        return db.query(
+            UserPhoneIndex.phone_key,
+            UserPhoneIndex.user_id
+        ).order_by(UserPhoneIndex.user_id).yield_per(batch_size)
+
+    @staticmethod
+    def get_key_owners(db: Session, phone_keys: Iterable[str]) -> Dict[str, int]:
+        """The oldest account indexed under each of the given keys"""
+        phone_keys = list(phone_keys)
+        if not phone_keys:
+            return {}
+        return dict(db.query(
+            UserPhoneIndex.phone_key,
+            func.min(UserPhoneIndex.user_id)
+        ).filter(
+            UserPhoneIndex.phone_key.in_(phone_keys)
+        ).group_by(UserPhoneIndex.phone_key).all())
+
+    @staticmethod
+    def rebuild(db: Session, batch_size: int = 5000) -> int:
+        """Rebuild the whole index from users.phone, paging by primary key"""
+        db.query(UserPhoneIndex).delete(synchronize_session=False)
+
+        indexed = 0
+        last_id = 0
+        while True:
+            users = db.query(User.id, User.phone).filter(
+                User.phone.isnot(None),
+                User.id > last_id
+            ).order_by(User.id).limit(batch_size).all()
+
+            if not users:
+                break
+
+            mappings = {}
+            for user_id, phone in users:
+                for key in PhoneUtils.get_index_keys(phone):
+                    mappings[(key, user_id)] = {'phone_key': key, 'user_id': user_id}
+            if mappings:
+                db.bulk_insert_mappings(UserPhoneIndex, list(mappings.values()))
+
+            indexed += len(users)
+            last_id = users[-1].id
+
+        return indexed
@@ -15,10 +15,49 @@ class UserMatchInfo(BaseModel):
     contact_name: str = Field(..., description="Name from phone contacts")
     user_id: str = Field(..., description="Matched user's ID")
     profile_picture: Optional[str] = Field(None, description="User's profile picture URL")
-    mutual_friends: int = Field(default=0, description="Number of mutual connections")
+    mutual_friends: int = Field(default=0, description="Friends in common")
+    mutual_contacts: int = Field(default=0, description="Registered contacts in common")
     matched_phone: str = Field(..., description="Phone number of the matched user")
     input_phone: str = Field(..., description="Phone number provided for matching")
     first_name: str = Field(..., description="First name of the matched user")
 
 class ContactSyncResponse(SuccessResponse[List[UserMatchInfo]]):
-    """Response model for contact sync results"""
\ No newline at end of file
+    """Response model for contact sync results"""
+
+class ContactDeltaSyncRequest(BaseModel):
+    fingerprint: str = Field(..., description="Fingerprint returned by the client's last successful sync")
+    added: List[ContactInfo] = Field(default_factory=list, description="Contacts added or renamed since the last sync")
+    removed: List[str] = Field(default_factory=list, description="Phone numbers removed since the last sync")
+
+class ContactDeltaSyncResult(BaseModel):
+    full_sync_required: bool = Field(default=False, description="Fingerprint mismatch; client must re-upload all contacts")
+    fingerprint: Optional[str] = Field(None, description="Server fingerprint of the synced contact set")
+    matches: List[UserMatchInfo] = Field(default_factory=list, description="Matches among the added contacts")
+
+class ContactDeltaSyncResponse(SuccessResponse[ContactDeltaSyncResult]):
+    """Response model for delta contact sync results"""
+
+class ContactSyncJobInfo(BaseModel):
+    id: str = Field(..., description="Job ID to poll")
+    status: str = Field(..., description="queued, running, completed or failed")
+    total_contacts: int
+    processed_contacts: int = Field(..., description="Contacts processed so far (resume offset)")
+    chunks_completed: int
+    match_count: int
+    error: Optional[str] = None
+    created_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+class ContactSyncJobResults(BaseModel):
+    job: ContactSyncJobInfo
+    matches: List[UserMatchInfo] = Field(default_factory=list, description="Matches from the returned chunks")
+    last_chunk: int = Field(..., description="Pass as after_chunk to fetch the next results")
+
+class ContactSyncJobResponse(SuccessResponse[ContactSyncJobInfo]):
+    """Response model for contact sync job status"""
+
+class ContactSyncJobResultsResponse(SuccessResponse[ContactSyncJobResults]):
+    """Response model for contact sync job results"""
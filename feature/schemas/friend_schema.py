@@ -32,6 +32,7 @@ class FriendInfo(BaseModel):
     date_of_birth: Optional[date] = None
     last_seen: Optional[datetime] = None
     default_room_id: Optional[str] = None
+    mutual_friends: int = Field(default=0, description="Friends in common with the current user")
 
     class Config:
         from_attributes = True
@@ -39,6 +40,14 @@ class FriendInfo(BaseModel):
 class FriendRequestCreate(BaseModel):
     receiver_id: int = Field(..., description="ID of the user to send friend request to")
 
+class FriendRequestBulkCreate(BaseModel):
+    receiver_ids: List[int] = Field(..., min_length=1, max_length=100, description="IDs of the users to send friend requests to")
+
+class FriendRequestBulkResult(BaseModel):
+    receiver_id: int
+    status: str = Field(..., description="sent, not_found, self, blocked, already_friends or already_sent")
+    request_id: Optional[str] = Field(None, description="ID of the created request when sent")
+
 class BlockUserRequest(BaseModel):
     user_id: int = Field(..., description="ID of the user to block")
     reason: Optional[str] = Field(None, max_length=255)
@@ -62,10 +71,64 @@ class FriendRequestListResponse(SuccessResponse[List[FriendRequestInfo]]):
     """Response model for list of friend requests"""
     pass
 
+class FriendRequestBulkResponse(SuccessResponse[List[FriendRequestBulkResult]]):
+    """Response model for bulk friend requests, one outcome per receiver"""
+    pass
+
 class FriendListResponse(SuccessResponse[List[FriendInfo]]):
     """Response model for list of friends"""
     pass
 
+class FriendPage(BaseModel):
+    items: List[FriendInfo]
+    next_cursor: Optional[str] = Field(None, description="Pass as after to fetch the next page; null on the last page")
+    total: int = Field(..., description="Total number of friends")
+
+class FriendPageResponse(SuccessResponse[FriendPage]):
+    """Response model for a cursor-paginated page of friends"""
+    pass
+
+class UpcomingBirthdayInfo(FriendInfo):
+    next_birthday: date = Field(..., description="Next celebration; Feb 29 birthdays fall on Feb 28 in non-leap years")
+    days_until: int = Field(..., description="Days from today, 0 when the birthday is today")
+    turning_age: Optional[int] = None
+
+class UpcomingBirthdayListResponse(SuccessResponse[List[UpcomingBirthdayInfo]]):
+    """Response model for friends' upcoming birthdays"""
+    pass
+
+class MutualFriendsInfo(BaseModel):
+    user_id: int
+    count: int = Field(..., description="Friends in common with the current user")
+    names: List[str] = Field(default_factory=list, description="First names of the first few mutual friends")
+
+class MutualFriendsListResponse(SuccessResponse[List[MutualFriendsInfo]]):
+    """Response model for mutual friend counts"""
+    pass
+
+class SocialCounts(BaseModel):
+    friend_count: int
+    incoming_pending_count: int
+    outgoing_pending_count: int
+
+    class Config:
+        from_attributes = True
+
+class SocialCountsResponse(SuccessResponse[SocialCounts]):
+    """Response model for friend and pending request badge counts"""
+    pass
+
+class FriendSuggestionInfo(BaseModel):
+    user: UserBasicInfo
+    mutual_friends: int = Field(default=0, description="Friends in common")
+    shared_contacts: int = Field(default=0, description="Registered contacts in common")
+    in_contacts: bool = Field(default=False, description="The user is in your address book")
+    score: float
+
+class FriendSuggestionListResponse(SuccessResponse[List[FriendSuggestionInfo]]):
+    """Response model for friend suggestions"""
+    pass
+
 class BlockedUserInfo(BaseModel):
     id: str
     blocked_user: UserBasicInfo
@@ -0,0 +1,23 @@
+# feature/schemas/notification_schema.py
+from pydantic import BaseModel, Field
+from typing import List, Optional
+from datetime import datetime
+from app.schemas.response import SuccessResponse
+
+class NotificationInfo(BaseModel):
+    id: str
+    type: str
+    actor_user_id: Optional[int] = None
+    message: str
+    is_read: bool
+    created_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+class NotificationFeed(BaseModel):
+    notifications: List[NotificationInfo] = Field(default_factory=list)
+    unread_count: int = Field(..., description="Unread notifications across the whole feed")
+
+class NotificationFeedResponse(SuccessResponse[NotificationFeed]):
+    """Response model for the notification feed"""
@@ -147,6 +147,9 @@ class RoomInfo(BaseModel):
     room_metadata: Dict[str, Any]
     participants: List[RoomParticipantInfo] = []  # Set default empty list
     participant_count: Optional[int] = 0  # Make optional with default 0
+    approved_count: int = 0
+    pending_count: int = 0
+    total_count: int = 0
     celebrant_id: Optional[str] = None
     celebrant_birthday: Optional[date] = None
     class Config:
@@ -171,10 +174,17 @@ class RoomStats(BaseModel):
 # List Response for Rooms with Pagination
 class PaginatedResponse(BaseModel):
     items: List[RoomInfo]
-    total: int
+    total: Optional[int] = Field(None, description="Null when requested with include_total=false")
     page: int
     size: int
-    pages: int
+    pages: Optional[int] = None
+    total_is_estimate: bool = Field(False, description="True when total is capped by the estimate count mode")
+    has_more: bool = False
+
+# Cursor-paginated List Response for Rooms
+class RoomPage(BaseModel):
+    items: List[RoomInfo]
+    next_cursor: Optional[str] = Field(None, description="Pass as after to fetch the next page; null on the last page")
 
 # Response Models
 class RoomResponse(SuccessResponse[RoomInfo]):
@@ -185,6 +195,10 @@ class RoomListResponse(SuccessResponse[PaginatedResponse]):
     """Response model for list of rooms with pagination"""
     pass
 
+class RoomPageResponse(SuccessResponse[RoomPage]):
+    """Response model for a cursor-paginated page of rooms"""
+    pass
+
 class RoomStatsResponse(SuccessResponse[RoomStats]):
     """Response model for room statistics"""
     pass
@@ -215,10 +229,12 @@ class ParticipantInfo(BaseModel):
 
 class ParticipantPaginatedResponse(BaseModel):
     items: List[ParticipantInfo]
-    total: int
+    total: Optional[int] = Field(None, description="Null when requested with include_total=false")
     page: int
     size: int
-    pages: int
+    pages: Optional[int] = None
+    total_is_estimate: bool = Field(False, description="True when total is capped by the estimate count mode")
+    has_more: bool = False
 
 class ParticipantListResponse(SuccessResponse[ParticipantPaginatedResponse]):
     """Response model for list of participants"""
@@ -0,0 +1,174 @@
+# feature/services/block_set_cache.py
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, FrozenSet, Iterable, Optional, Set
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from ..repository.cache_generation_repository import CacheGenerationRepository
+from ..repository.friend_repository import FriendRepository
+from ..utils.bloom_filter import BloomFilter
+
+BLOCKED_USERS_GENERATION = "blocked_users"
+
+
+class BlockSetCache:
+    """
+    Answers "which of these users are blocked with X" (in either direction).
+
+    A process-wide Bloom filter over every blocked pair settles the common
+    case - nobody is blocked - without touching the database. Only when the
+    filter reports a possible hit is X's block set loaded (one query) into a
+    small LRU. The shared generation counter is checked at most every
+    BLOCK_SET_CACHE_TTL_SECONDS; pairs blocked or unblocked elsewhere since
+    are read from the cache change log and patched in. The filter is only
+    rebuilt when that log has a gap or the filter is full.
+    """
+
+    def __init__(
+            self,
+            ttl_seconds: int = settings.BLOCK_SET_CACHE_TTL_SECONDS,
+            max_entries: int = settings.BLOCK_SET_CACHE_MAX_ENTRIES
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._filter: Optional[BloomFilter] = None
+        self._capacity = 0
+        self._pair_count = 0
+        self._sets: "OrderedDict[int, FrozenSet[int]]" = OrderedDict()
+        self._generation: Optional[int] = None
+        self._checked_at = 0.0
+        self.filter_negatives = 0
+        self.set_lookups = 0
+
+    @staticmethod
+    def _pair_key(user_id: int, other_id: int) -> int:
+        # Order-independent, so one entry covers both directions
+        low, high = (user_id, other_id) if user_id < other_id else (other_id, user_id)
+        return (low << 32) | high
+
+    @staticmethod
+    def change_key(blocker_id: int, blocked_id: int) -> str:
+        """How a block or unblock of the pair is recorded in the cache change log"""
+        return f"{blocker_id}:{blocked_id}"
+
+    def _rebuild(self, db: Session) -> None:
+        generation = CacheGenerationRepository.get_generation(db, BLOCKED_USERS_GENERATION)
+
+        pairs = [self._pair_key(blocker_id, blocked_id) for blocker_id, blocked_id in FriendRepository.iter_block_pairs(db)]
+        # Leave room for blocks patched in by this process before the next rebuild
+        self._capacity = max(2 * len(pairs), 1024)
+        bloom = BloomFilter(self._capacity)
+        for key in pairs:
+            bloom.add(key)
+
+        self._filter = bloom
+        self._pair_count = len(pairs)
+        self._sets.clear()
+        self._generation = generation
+
+    def _catch_up(self, db: Session, generation: int) -> bool:
+        """Patch in the pairs changed since our generation; False if the log cannot tell us"""
+        changes = CacheGenerationRepository.get_changes(db, BLOCKED_USERS_GENERATION, self._generation, generation)
+        if changes is None:
+            return False
+
+        for change in changes:
+            blocker_id, blocked_id = (int(user_id) for user_id in change.split(":"))
+            # Unblocked pairs are added too: a filter false positive is harmless
+            self._filter.add(self._pair_key(blocker_id, blocked_id))
+            self._pair_count += 1
+            self._forget(blocker_id, blocked_id)
+        self._generation = generation
+        return self._pair_count <= self._capacity
+
+    def _ensure_fresh(self, db: Session) -> None:
+        now = time.monotonic()
+        if self._generation is not None and now - self._checked_at < self.ttl_seconds:
+            return
+
+        with self._lock:
+            if self._generation is None:
+                self._rebuild(db)
+            elif now - self._checked_at >= self.ttl_seconds:
+                generation = CacheGenerationRepository.get_generation(db, BLOCKED_USERS_GENERATION)
+                if generation != self._generation and not self._catch_up(db, generation):
+                    self._rebuild(db)
+            self._checked_at = now
+
+    async def _get_block_set(self, db: Session, user_id: int) -> FrozenSet[int]:
+        with self._lock:
+            block_set = self._sets.get(user_id)
+            if block_set is not None:
+                self._sets.move_to_end(user_id)
+                return block_set
+
+        block_set = frozenset(await FriendRepository.get_block_set(db, user_id))
+        with self._lock:
+            self._sets[user_id] = block_set
+            if len(self._sets) > self.max_entries:
+                self._sets.popitem(last=False)
+        return block_set
+
+    async def is_blocked_many(self, db: Session, user_id: int, target_ids: Iterable[int]) -> Set[int]:
+        """The subset of target_ids that user_id blocked or was blocked by"""
+        self._ensure_fresh(db)
+
+        bloom = self._filter
+        candidates = {
+            target_id for target_id in target_ids
+            if self._pair_key(user_id, target_id) in bloom
+        }
+        if not candidates:
+            self.filter_negatives += 1
+            return set()
+
+        self.set_lookups += 1
+        return candidates & await self._get_block_set(db, user_id)
+
+    async def is_blocked(self, db: Session, user_id: int, target_id: int) -> bool:
+        return bool(await self.is_blocked_many(db, user_id, [target_id]))
+
+    def apply_block(self, blocker_id: int, blocked_id: int, generation: int) -> None:
+        """Patch the cache after this process committed a new block"""
+        with self._lock:
+            if self._generation is None:
+                return  # Not loaded yet; the first check reads the committed state
+
+            self._filter.add(self._pair_key(blocker_id, blocked_id))
+            self._pair_count += 1
+            self._forget(blocker_id, blocked_id)
+            if self._pair_count > self._capacity:
+                self._generation = None  # Filter is full; rebuild a larger one on next use
+            elif generation == self._generation + 1:
+                self._generation = generation
+
+    def apply_unblock(self, blocker_id: int, blocked_id: int, generation: int) -> None:
+        """Patch the cache after this process committed an unblock"""
+        with self._lock:
+            if self._generation is None:
+                return
+
+            # The pair stays set in the filter (a false positive until the next
+            # rebuild); the exact block sets decide
+            self._forget(blocker_id, blocked_id)
+            if generation == self._generation + 1:
+                self._generation = generation
+
+    def _forget(self, *user_ids: int) -> None:
+        for user_id in user_ids:
+            self._sets.pop(user_id, None)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "filter_keys": self._pair_count,
+            "filter_bits": self._filter.size if self._filter else 0,
+            "cached_sets": len(self._sets),
+            "filter_negatives": self.filter_negatives,
+            "set_lookups": self.set_lookups,
+            "generation": self._generation or 0,
+        }
+
+
+block_set_cache = BlockSetCache()
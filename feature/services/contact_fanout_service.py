@@ -0,0 +1,56 @@
+# feature/services/contact_fanout_service.py
+from sqlalchemy.orm import Session
+from app.models.user import User
+from ..models.notification import NotificationType
+from ..repository.contact_repository import ContactRepository
+from ..repository.contact_graph_repository import ContactGraphRepository
+from ..repository.notification_repository import NotificationRepository
+
+
+class ContactFanoutService:
+    """
+    Tells existing users that someone in their contacts just joined. Owners
+    are found through the normalized_phone index on contact_registry, so a
+    new user costs one SELECT, one UPDATE and a batched INSERT instead of
+    waiting for every owner to re-sync.
+    """
+
+    def __init__(self):
+        self.repository = ContactRepository()
+        self.contact_graph = ContactGraphRepository()
+        self.notifications = NotificationRepository()
+
+    async def fanout_new_user(self, db: Session, user: User) -> int:
+        """Link registry rows holding the user's phone, notify their owners and commit"""
+        if not user.phone:
+            return 0
+
+        try:
+            holders = await self.repository.get_unlinked_holders(db, user.phone, user.id)
+            if not holders:
+                return 0
+
+            await self.repository.link_registered_user(db, user.phone, user.id)
+
+            # One notification per owner, named the way the owner saved the contact
+            names = {}
+            for owner_id, contact_name in holders:
+                names.setdefault(owner_id, contact_name)
+            await self.notifications.bulk_create(db, [
+                {
+                    'user_id': owner_id,
+                    'type': NotificationType.CONTACT_JOINED,
+                    'actor_user_id': user.id,
+                    'message': f"{contact_name or user.phone} joined",
+                    'is_read': False
+                } for owner_id, contact_name in names.items()
+            ])
+
+            # Their stored contact arrays no longer include everyone registered
+            await self.contact_graph.invalidate(db, list(names))
+            db.commit()
+            return len(names)
+
+        except Exception as e:
+            db.rollback()
+            raise ValueError(f"Contact fanout failed: {str(e)}")
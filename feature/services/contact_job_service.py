@@ -0,0 +1,163 @@
+# feature/services/contact_job_service.py
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import List, Optional, Tuple
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.database import get_db
+from ..models.contact_job import ContactSyncJob, ContactSyncJobStatus
+from ..repository.contact_job_repository import ContactJobRepository
+from ..schemas.contact_schema import ContactInfo, ContactSyncJobResults, ContactSyncJobInfo, UserMatchInfo
+from .contact_service import ContactService
+
+
+class ContactSyncJobRunner:
+    """
+    Runs large contact uploads on a thread pool. Every chunk is committed
+    together with its registry upserts and the job's resume offset, so a job
+    left behind by a restarted worker continues from its last chunk once it
+    is considered stale. Finished jobs are purged after the retention period.
+    """
+
+    def __init__(
+            self,
+            max_workers: int = settings.CONTACT_SYNC_JOB_WORKERS,
+            stale_seconds: int = settings.CONTACT_SYNC_JOB_STALE_SECONDS,
+            retention_hours: int = settings.CONTACT_SYNC_JOB_RETENTION_HOURS
+    ):
+        self.max_workers = max_workers
+        self.stale_seconds = stale_seconds
+        self.retention_hours = retention_hours
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _stale_before(self) -> datetime:
+        return datetime.utcnow() - timedelta(seconds=self.stale_seconds)
+
+    def submit(self, job_id: str) -> None:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="contact-sync-job"
+                )
+            self._executor.submit(self._run_in_thread, job_id)
+
+    def _run_in_thread(self, job_id: str) -> None:
+        # Each worker thread drives the async service code on its own loop
+        asyncio.run(self._run(job_id))
+
+    async def _run(self, job_id: str) -> None:
+        with get_db() as db:
+            if not await ContactJobRepository.claim_job(db, job_id, self._stale_before()):
+                return
+
+            job = await ContactJobRepository.get_job(db, job_id)
+            contact_service = ContactService()
+            try:
+                offset = job.processed_contacts
+                contacts = [ContactInfo(**contact) for contact in job.contacts[offset:]]
+                chunk_index = job.chunks_completed
+
+                async for chunk_matches in contact_service.iter_sync_chunks(db, job.owner_id, contacts):
+                    offset = min(offset + contact_service.chunk_size, job.total_contacts)
+                    await ContactJobRepository.add_chunk(
+                        db, job, chunk_index, jsonable_encoder(chunk_matches), offset
+                    )
+                    db.commit()  # Checkpoint: registry upserts, matches and offset together
+                    chunk_index += 1
+
+                await contact_service.finish_full_sync(
+                    db, job.owner_id, [contact['phone_number'] for contact in job.contacts]
+                )
+                await ContactJobRepository.mark_finished(db, job_id, ContactSyncJobStatus.COMPLETED)
+
+            except Exception as e:
+                db.rollback()
+                await ContactJobRepository.mark_finished(
+                    db, job_id, ContactSyncJobStatus.FAILED, f"Contact sync failed: {str(e)}"
+                )
+
+    async def resume_pending_jobs(self) -> int:
+        """Submit queued jobs and jobs orphaned by a stopped worker"""
+        with get_db() as db:
+            job_ids = await ContactJobRepository.get_runnable_job_ids(db, self._stale_before())
+        for job_id in job_ids:
+            self.submit(job_id)
+        return len(job_ids)
+
+    async def purge_expired_jobs(self) -> int:
+        """Delete finished jobs (and their results) older than the retention period"""
+        with get_db() as db:
+            return await ContactJobRepository.purge_finished_jobs(
+                db, datetime.utcnow() - timedelta(hours=self.retention_hours)
+            )
+
+    async def watch_stale_jobs(self) -> None:
+        """Periodically pick up jobs whose worker stopped checkpointing and purge expired ones"""
+        while True:
+            await asyncio.sleep(self.stale_seconds)
+            try:
+                await self.resume_pending_jobs()
+            except Exception as e:
+                print(f"Warning: could not resume contact sync jobs: {str(e)}")
+            try:
+                await self.purge_expired_jobs()
+            except Exception as e:
+                print(f"Warning: could not purge contact sync jobs: {str(e)}")
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                # Unfinished jobs keep their offset and are resumed later
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+
+contact_sync_job_runner = ContactSyncJobRunner()
+
+
+class ContactSyncJobService:
+    def __init__(self, runner: ContactSyncJobRunner = contact_sync_job_runner):
+        self.repository = ContactJobRepository()
+        self.runner = runner
+
+    async def submit_job(
+            self,
+            db: Session,
+            owner_id: int,
+            contacts: List[ContactInfo]
+    ) -> ContactSyncJob:
+        job = await self.repository.create_job(db, owner_id, jsonable_encoder(contacts))
+        self.runner.submit(job.id)
+        return job
+
+    async def get_job(self, db: Session, owner_id: int, job_id: str) -> Tuple[bool, str, Optional[ContactSyncJob]]:
+        job = await self.repository.get_job(db, job_id)
+        if not job or job.owner_id != owner_id:
+            return False, "Contact sync job not found", None
+        return True, "Contact sync job retrieved successfully", job
+
+    async def get_results(
+            self,
+            db: Session,
+            owner_id: int,
+            job_id: str,
+            after_chunk: int = -1,
+            limit: int = 20
+    ) -> Tuple[bool, str, Optional[ContactSyncJobResults]]:
+        success, message, job = await self.get_job(db, owner_id, job_id)
+        if not success:
+            return False, message, None
+
+        chunks = await self.repository.get_chunks(db, job_id, after_chunk, limit)
+        matches = [UserMatchInfo(**match) for chunk in chunks for match in chunk.matches]
+
+        return True, "Contact sync job results retrieved successfully", ContactSyncJobResults(
+            job=ContactSyncJobInfo.model_validate(job),
+            matches=matches,
+            last_chunk=chunks[-1].chunk_index if chunks else after_chunk
+        )
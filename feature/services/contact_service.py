@@ -1,91 +1,81 @@
 # feature/services/contact_service.py
-from typing import List, Dict
+from typing import AsyncIterator, List, Dict, Optional
 from sqlalchemy.orm import Session
-from ..models.contact import ContactRegistry
-from ..schemas.contact_schema import ContactInfo, UserMatchInfo
+from ..schemas.contact_schema import ContactInfo, UserMatchInfo, ContactDeltaSyncResult
 from ..repository.contact_repository import ContactRepository
+from ..repository.contact_graph_repository import ContactGraphRepository
+from ..utils.phone_utils import PhoneUtils
+from ..utils.phone_normalizer import PhoneNormalizer
+from .mutual_friend_service import mutual_friend_service
+from .phone_index_cache import phone_index_cache
 from app.models.user import User
 
 class ContactService:
     def __init__(self):
         self.repository = ContactRepository()
-        self.chunk_size = 100  # Configurable chunk size
-        self.user_batch_size = 5000  # Load users in batches
+        self.contact_graph = ContactGraphRepository()
+        self.phone_index = phone_index_cache
+        self.mutual_friends = mutual_friend_service
+        self.chunk_size = 500  # Contacts matched and upserted per statement
     
     @staticmethod
     def normalize_phone(phone: str) -> str:
         """Remove all non-digit characters from phone number"""
-        return ''.join(filter(str.isdigit, phone))
+        return PhoneUtils.normalize_phone(phone)
     
     @staticmethod
-    def get_phone_variants(phone: str) -> List[str]:
-        """Generate possible phone number variants for matching"""
-        normalized = ContactService.normalize_phone(phone)
-        variants = [normalized]
-        
-        # If more than 10 digits, try without country code
-        if len(normalized) > 10:
-            variants.append(normalized[-10:])  # Last 10 digits
-            variants.append(normalized[-9:])   # Last 9 digits
-        
-        # If exactly 10 digits, try with common country codes
-        if len(normalized) == 10:
-            variants.append(f"1{normalized}")   # US/Canada
-            variants.append(f"91{normalized}")  # India
-        
-        return variants
-    
-    def _build_phone_index(self, db: Session) -> Dict[str, User]:
-        """Build an efficient phone-to-user lookup map"""
-        phone_to_user = {}
-        
-        # Query users in batches to manage memory
-        offset = 0
-        while True:
-            users = db.query(User).filter(
-                User.phone.isnot(None)
-            ).offset(offset).limit(self.user_batch_size).all()
-            
-            if not users:
-                break
-                
-            for user in users:
-                normalized = self.normalize_phone(user.phone)
-                if len(normalized) >= 8:  # Valid phone length
-                    # Index the normalized number
-                    phone_to_user[normalized] = user
-                    
-                    # Also index common variants
-                    if len(normalized) > 10:
-                        phone_to_user[normalized[-10:]] = user
-                        phone_to_user[normalized[-9:]] = user
-            
-            offset += self.user_batch_size
-        
-        return phone_to_user
+    def get_owner_normalizer(db: Session, owner_id: int) -> PhoneNormalizer:
+        """Normalizer that reads the owner's local numbers in the owner's own country"""
+        owner_phone = db.query(User.phone).filter(User.id == owner_id).scalar()
+        return PhoneNormalizer.for_region(PhoneUtils.region_for_phone(owner_phone))
+
+    def _match_chunk(self, db: Session, canonical: Dict[str, Optional[str]]) -> Dict[str, tuple]:
+        """Resolve a chunk of contacts (raw number -> E.164) via the phone index cache and one user query"""
+        # One canonical key per contact, so a single cache probe each
+        key_to_user_id = self.phone_index.lookup(db, {key for key in canonical.values() if key})
+        matched_ids = {
+            phone_number: key_to_user_id[key]
+            for phone_number, key in canonical.items()
+            if key in key_to_user_id
+        }
+
+        if not matched_ids:
+            return {}
+
+        users = db.query(
+            User.id,
+            User.first_name,
+            User.phone,
+            User.profile_picture_url
+        ).filter(User.id.in_(set(matched_ids.values()))).all()
+        users_by_id = {user.id: user for user in users}
+
+        return {
+            phone_number: users_by_id[user_id]
+            for phone_number, user_id in matched_ids.items()
+            if user_id in users_by_id
+        }
     
     async def _process_contact_chunk(
         self, db: Session, owner_id: int, 
-        contacts: List[ContactInfo], 
-        phone_to_user: Dict[str, User]
+        contacts: List[ContactInfo],
+        normalizer: PhoneNormalizer
     ) -> List[UserMatchInfo]:
         """Process a chunk of contacts efficiently"""
         matches = []
         contact_updates = []
+        phone_numbers = [contact.phone_number for contact in contacts]
+        canonical = dict(zip(phone_numbers, normalizer.normalize_batch(phone_numbers)))
+        matched_users = self._match_chunk(db, canonical)
         
         for contact in contacts:
-            matched_user = None
-            
-            # Try each variant until we find a match
-            for variant in self.get_phone_variants(contact.phone_number):
-                if variant in phone_to_user:  # O(1) lookup!
-                    matched_user = phone_to_user[variant]
-                    break
+            matched_user = matched_users.get(contact.phone_number)
             
             # Prepare bulk update data
             contact_updates.append({
                 'owner_id': owner_id,
                 'phone_number': contact.phone_number,
+                'normalized_phone': canonical[contact.phone_number],
                 'contact_name': contact.name,
                 'registered_user_id': matched_user.id if matched_user else None
             })
@@ -102,8 +92,18 @@ class ContactService:
                     first_name=matched_user.first_name
                 ))
         
+        # Rows this chunk unmatches or points at another user
+        previous = await self.repository.get_registered_user_ids(db, owner_id, phone_numbers)
+        repointed = any(
+            previous.get(update['phone_number']) not in (None, update['registered_user_id'])
+            for update in contact_updates
+        )
+        
         # Bulk update contact registry
         await self._bulk_upsert_contacts(db, contact_updates)
+        if repointed:
+            # Merging cannot take ids out of the owner's array; rebuild it from the registry
+            await self.contact_graph.invalidate(db, [owner_id])
         
         # Calculate mutual friends if needed
         if matches:
@@ -116,40 +116,13 @@ class ContactService:
         db: Session,
         contact_updates: List[Dict]
     ) -> None:
-        """Efficiently bulk update contact registry"""
+        """Upsert a chunk of registry rows in one statement (committed by the caller)"""
         if not contact_updates:
             return
         
-        # Get existing contacts
-        phone_numbers = [c['phone_number'] for c in contact_updates]
-        existing = db.query(ContactRegistry).filter(
-            ContactRegistry.owner_id == contact_updates[0]['owner_id'],
-            ContactRegistry.phone_number.in_(phone_numbers)
-        ).all()
-        
-        existing_map = {c.phone_number: c for c in existing}
-        
-        # Separate updates and inserts
-        updates = []
-        inserts = []
-        
-        for update in contact_updates:
-            if update['phone_number'] in existing_map:
-                # Update existing
-                contact = existing_map[update['phone_number']]
-                contact.contact_name = update['contact_name']
-                contact.registered_user_id = update['registered_user_id']
-                updates.append(contact)
-            else:
-                # New contact
-                inserts.append(ContactRegistry(**update))
-        
-        # Bulk operations
-        if inserts:
-            db.bulk_save_objects(inserts)
-        
-        # Updates are already tracked by SQLAlchemy
-        db.commit()
+        # A number listed twice in one upload keeps its last name
+        deduped = {c['phone_number']: c for c in contact_updates}
+        await self.repository.bulk_upsert_contacts(db, list(deduped.values()))
     
     async def _add_mutual_friends_batch(
         self,
@@ -157,35 +130,41 @@ class ContactService:
         owner_id: int,
         matches: List[UserMatchInfo]
     ) -> List[UserMatchInfo]:
-        """Calculate mutual friends for all matches in one query"""
+        """Calculate mutual contacts (stored adjacency arrays) and mutual friends for all matches"""
         matched_user_ids = [int(match.user_id) for match in matches]
         
-        # Single query for all contacts
-        contacts = db.query(
-            ContactRegistry.owner_id,
-            ContactRegistry.registered_user_id
-        ).filter(
-            ContactRegistry.owner_id.in_([owner_id] + matched_user_ids),
-            ContactRegistry.registered_user_id.isnot(None)
-        ).all()
+        # One primary-key lookup for the owner and every matched user
+        adjacency = await self.contact_graph.get_adjacency(db, [owner_id] + matched_user_ids)
         
-        # Build contact sets
-        contact_map = {}
-        for owner, registered in contacts:
-            if owner not in contact_map:
-                contact_map[owner] = set()
-            contact_map[owner].add(registered)
+        # Keep the owner's array current with this chunk's matches
+        owner_contacts = await self.contact_graph.add_contacts(
+            db, owner_id, adjacency[owner_id], matched_user_ids
+        )
+        owner_set = set(owner_contacts)
         
-        owner_contacts = contact_map.get(owner_id, set())
+        # Set intersection iterates each packed array in C
+        for match in matches:
+            user_contacts = adjacency.get(int(match.user_id), ())
+            match.mutual_contacts = len(owner_set.intersection(user_contacts))
         
-        # Update mutual friends count
+        mutual_counts = await self.mutual_friends.count_mutual_friends(db, owner_id, matched_user_ids)
         for match in matches:
-            user_id = int(match.user_id)
-            user_contacts = contact_map.get(user_id, set())
-            match.mutual_friends = len(owner_contacts & user_contacts)
+            match.mutual_friends = mutual_counts.get(int(match.user_id), 0)
         
         return matches
 
+    async def iter_sync_chunks(
+        self,
+        db: Session,
+        owner_id: int,
+        contacts: List[ContactInfo]
+    ) -> AsyncIterator[List[UserMatchInfo]]:
+        """Process contacts chunk by chunk, yielding each chunk's matches as soon as they are ready"""
+        normalizer = self.get_owner_normalizer(db, owner_id)
+        for i in range(0, len(contacts), self.chunk_size):
+            chunk = contacts[i:i + self.chunk_size]
+            yield await self._process_contact_chunk(db, owner_id, chunk, normalizer)
+
     async def sync_contacts(
         self,
         db: Session,
@@ -194,21 +173,90 @@ class ContactService:
     ) -> List[UserMatchInfo]:
         """Optimized contact sync with batch processing"""
         try:
-            # Build phone index once (not for each contact!)
-            phone_to_user = self._build_phone_index(db)
-            
             matches = []
             
             # Process contacts in chunks
-            for i in range(0, len(contacts), self.chunk_size):
-                chunk = contacts[i:i + self.chunk_size]
-                chunk_matches = await self._process_contact_chunk(
-                    db, owner_id, chunk, phone_to_user
-                )
+            async for chunk_matches in self.iter_sync_chunks(db, owner_id, contacts):
                 matches.extend(chunk_matches)
             
+            # Storing the fingerprint commits the whole sync as one transaction
+            await self.finish_full_sync(db, owner_id, [contact.phone_number for contact in contacts])
             return matches
             
         except Exception as e:
+            db.rollback()
             raise ValueError(f"Contact sync failed: {str(e)}")
 
+    async def finish_full_sync(self, db: Session, owner_id: int, phone_numbers: List[str]) -> str:
+        """
+        Make the uploaded address book the owner's whole contact set: drop
+        registry rows it no longer lists, then store the fingerprint,
+        committing the sync
+        """
+        uploaded = set(phone_numbers)
+        stale = [(phone, registered_user_id)
+                 for phone, _, registered_user_id in await self.repository.get_owner_phone_numbers(db, owner_id)
+                 if phone not in uploaded]
+        for i in range(0, len(stale), self.chunk_size):
+            await self.repository.delete_contacts(db, owner_id, [phone for phone, _ in stale[i:i + self.chunk_size]])
+        if any(registered_user_id for _, registered_user_id in stale):
+            await self.contact_graph.invalidate(db, [owner_id])
+        return await self.refresh_fingerprint(db, owner_id)
+
+    async def refresh_fingerprint(self, db: Session, owner_id: int) -> str:
+        """Recompute and store the fingerprint of the owner's registry contacts, committing the sync"""
+        rows = await self.repository.get_owner_phone_numbers(db, owner_id)
+        # The canonical form the registry stores; digits only for numbers that have none
+        fingerprint = PhoneUtils.fingerprint(
+            normalized or PhoneUtils.normalize_phone(phone) for phone, normalized, _ in rows
+        )
+        await self.repository.save_sync_state(db, owner_id, fingerprint, len(rows))
+        return fingerprint
+
+    async def get_fingerprint(self, db: Session, owner_id: int) -> Optional[str]:
+        state = await self.repository.get_sync_state(db, owner_id)
+        return state.fingerprint if state else None
+
+    async def sync_contacts_delta(
+        self,
+        db: Session,
+        owner_id: int,
+        fingerprint: str,
+        added: List[ContactInfo],
+        removed: List[str]
+    ) -> ContactDeltaSyncResult:
+        """
+        Apply only the contacts added/removed since the client's last sync.
+        If the client's fingerprint does not match the server's, nothing is
+        applied and the client is told to fall back to a full sync.
+        """
+        try:
+            server_fingerprint = await self.get_fingerprint(db, owner_id)
+            if server_fingerprint is None or server_fingerprint != fingerprint:
+                return ContactDeltaSyncResult(
+                    full_sync_required=True,
+                    fingerprint=server_fingerprint
+                )
+
+            if not added and not removed:
+                return ContactDeltaSyncResult(fingerprint=server_fingerprint)
+
+            if removed:
+                # Match removals on the canonical number too, however the client formatted them
+                normalizer = self.get_owner_normalizer(db, owner_id)
+                removed_keys = [key for key in normalizer.normalize_batch(removed) if key]
+                await self.repository.delete_contacts(db, owner_id, removed, removed_keys)
+                await self.contact_graph.invalidate(db, [owner_id])
+
+            matches = []
+            async for chunk_matches in self.iter_sync_chunks(db, owner_id, added):
+                matches.extend(chunk_matches)
+
+            return ContactDeltaSyncResult(
+                fingerprint=await self.refresh_fingerprint(db, owner_id),
+                matches=matches
+            )
+
+        except Exception as e:
+            db.rollback()
+            raise ValueError(f"Contact delta sync failed: {str(e)}")
@@ -0,0 +1,112 @@
+# feature/services/count_cache.py
+import enum
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Tuple
+from sqlalchemy.orm import Query
+from app.core.config import settings
+
+
+class CountMode(str, enum.Enum):
+    EXACT = "exact"
+    ESTIMATE = "estimate"
+
+
+class CountCache:
+    """
+    Totals for paginated listings, so a page fetch does not always pay for
+    a full COUNT over the filtered set.
+
+    Totals are cached per (scope, key) - key being the caller's user and a
+    hash of its filters - for COUNT_CACHE_TTL_SECONDS. Writes in this
+    process invalidate a whole scope at once by bumping its version; the
+    TTL bounds how long other workers' writes go unseen. In estimate mode
+    at most COUNT_ESTIMATE_CAP + 1 rows are counted; larger sets report the
+    cap and are flagged as estimates.
+    """
+
+    def __init__(
+            self,
+            ttl_seconds: int = settings.COUNT_CACHE_TTL_SECONDS,
+            max_entries: int = settings.COUNT_CACHE_MAX_ENTRIES,
+            estimate_cap: int = settings.COUNT_ESTIMATE_CAP
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.estimate_cap = estimate_cap
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Tuple[str, Hashable], Tuple[int, bool, int, float]]" = OrderedDict()
+        self._versions: Dict[str, int] = {}
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def filter_key(*parts: Any) -> str:
+        """Stable hash of the filters that shape a listing"""
+        raw = json.dumps(parts, sort_keys=True, separators=(",", ":"), default=str)
+        return hashlib.sha1(raw.encode()).hexdigest()
+
+    def _cached(self, scope: str, key: Hashable, mode: CountMode):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get((scope, key))
+            if entry is None:
+                return None
+            total, is_estimate, version, stored_at = entry
+            if version != self._versions.get(scope, 0) or now - stored_at >= self.ttl_seconds:
+                del self._entries[(scope, key)]
+                return None
+            if is_estimate and mode == CountMode.EXACT:
+                return None
+            self._entries.move_to_end((scope, key))
+            return total, is_estimate
+
+    def _store(self, scope: str, key: Hashable, total: int, is_estimate: bool, version: int) -> None:
+        with self._lock:
+            if version != self._versions.get(scope, 0):
+                return  # A write landed while counting; the result may already be stale
+            self._entries[(scope, key)] = (total, is_estimate, version, time.monotonic())
+            self._entries.move_to_end((scope, key))
+            if len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def count(self, scope: str, key: Hashable, query: Query, mode: CountMode = CountMode.EXACT) -> Tuple[int, bool]:
+        """(total, is_estimate) for the rows of query"""
+        cached = self._cached(scope, key, mode)
+        if cached is not None:
+            self.hits += 1
+            return cached
+        self.misses += 1
+
+        with self._lock:
+            version = self._versions.get(scope, 0)
+
+        query = query.order_by(None)
+        if mode == CountMode.ESTIMATE:
+            total = query.limit(self.estimate_cap + 1).count()
+            is_estimate = total > self.estimate_cap
+            total = min(total, self.estimate_cap)
+        else:
+            total, is_estimate = query.count(), False
+
+        self._store(scope, key, total, is_estimate, version)
+        return total, is_estimate
+
+    def invalidate(self, *scopes: str) -> None:
+        """Forget every cached total in the given scopes"""
+        with self._lock:
+            for scope in scopes:
+                self._versions[scope] = self._versions.get(scope, 0) + 1
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+count_cache = CountCache()
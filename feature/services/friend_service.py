@@ -1,6 +1,7 @@
 # feature/services/friend_service.py
 from sqlalchemy.orm import Session
-from sqlalchemy import func, String
+from sqlalchemy import Row, func, String
+from datetime import date
 from typing import List, Optional, Tuple
 from ..repository.friend_repository import FriendRepository
 from ..models.friend import FriendRequest, BlockedUser, FriendRequestStatus
@@ -13,14 +14,30 @@ from ..schemas.friend_schema import (
     FriendInfo,
     FriendRequestInfo,
     BlockedUserInfo,
-    FriendListResponse
+    FriendListResponse,
+    FriendPage,
+    FriendSuggestionInfo,
+    MutualFriendsInfo,
+    FriendRequestBulkResult,
+    UpcomingBirthdayInfo,
+    UserBasicInfo
 )
+from ..repository.friend_suggestion_repository import FriendSuggestionRepository
+from ..utils.birthday_utils import BirthdayUtils
+from ..utils.cursor import CursorUtils
+from ..repository.cache_generation_repository import CacheGenerationRepository
+from .block_set_cache import block_set_cache, BLOCKED_USERS_GENERATION
+from .friend_set_cache import friend_set_cache
+from .mutual_friend_service import mutual_friend_service
 from ..models.friend import FriendRequest, BlockedUser, FriendRequestStatus
 from app.models.user import User
 
 class FriendService:
     def __init__(self):
         self.repository = FriendRepository()
+        self.friend_sets = friend_set_cache
+        self.block_sets = block_set_cache
+        self.mutual_friends = mutual_friend_service
 
     async def create_friend_request(
             self,
@@ -39,7 +56,7 @@ class FriendService:
                 return False, "Cannot send friend request to yourself", None
 
             # Check if already blocked
-            is_blocked = await self.repository.is_blocked(db, requester_id, receiver_id)
+            is_blocked = await self.block_sets.is_blocked(db, requester_id, receiver_id)
             if is_blocked:
                 return False, "Cannot send friend request to this user", None
 
@@ -61,21 +78,82 @@ class FriendService:
             db.rollback()
             return False, f"Error creating friend request: {str(e)}", None
 
+    async def create_friend_requests_bulk(
+            self,
+            db: Session,
+            requester_id: int,
+            receiver_ids: List[int]
+    ) -> List[FriendRequestBulkResult]:
+        """
+        Send friend requests to many users at once. Receivers, blocks,
+        friendships and pending requests are each checked with one set
+        query, and all new requests are inserted in a single commit.
+        """
+        try:
+            receiver_ids = list(dict.fromkeys(receiver_ids))  # De-duplicate, keep order
+            others = [receiver_id for receiver_id in receiver_ids if receiver_id != requester_id]
+
+            existing_ids = {user_id for (user_id,) in db.query(User.id).filter(User.id.in_(others)).all()}
+            blocked_ids = await self.block_sets.is_blocked_many(db, requester_id, existing_ids)
+            friend_ids = set(await self.friend_sets.get(db, requester_id))
+            pending_ids = await self.repository.get_pending_receiver_ids(db, requester_id, list(existing_ids))
+
+            outcomes = {}
+            for receiver_id in receiver_ids:
+                if receiver_id == requester_id:
+                    outcomes[receiver_id] = "self"
+                elif receiver_id not in existing_ids:
+                    outcomes[receiver_id] = "not_found"
+                elif receiver_id in blocked_ids:
+                    outcomes[receiver_id] = "blocked"
+                elif receiver_id in friend_ids:
+                    outcomes[receiver_id] = "already_friends"
+                elif receiver_id in pending_ids:
+                    outcomes[receiver_id] = "already_sent"
+                else:
+                    outcomes[receiver_id] = "sent"
+
+            request_ids = await self.repository.bulk_create_friend_requests(
+                db, requester_id, [receiver_id for receiver_id, outcome in outcomes.items() if outcome == "sent"]
+            )
+
+            return [
+                FriendRequestBulkResult(
+                    receiver_id=receiver_id,
+                    status=outcome,
+                    request_id=request_ids.get(receiver_id)
+                ) for receiver_id, outcome in outcomes.items()
+            ]
+
+        except Exception as e:
+            db.rollback()
+            raise ValueError(f"Error creating friend requests: {str(e)}")
+
+    @staticmethod
+    def _to_request_infos(rows: List[Row]) -> List[FriendRequestInfo]:
+        """Build FriendRequestInfo from the repository's column-projected request rows"""
+        columns = FriendRepository.REQUEST_USER_COLUMNS
+        return [
+            FriendRequestInfo(
+                id=row.id,
+                requester=UserBasicInfo(**{column: getattr(row, f'requester_{column}') for column in columns}),
+                receiver=UserBasicInfo(**{column: getattr(row, f'receiver_{column}') for column in columns}),
+                status=row.status,
+                created_at=row.created_at,
+                updated_at=row.updated_at
+            ) for row in rows
+        ]
+
     async def get_incoming_requests(
             self,
             db: Session,
             user_id: int,
             skip: int = 0,
             limit: int = 10
-    ) -> List[FriendRequest]:
+    ) -> List[FriendRequestInfo]:
         try:
-            requests = await self.repository.get_incoming_requests(db, user_id, skip, limit)
-            # Validate that requester data is loaded
-            for request in requests:
-                if not request.requester:
-                    # Log or handle missing requester
-                    print(f"Warning: Missing requester for request {request.id}")
-            return requests
+            rows = await self.repository.get_incoming_requests(db, user_id, skip, limit)
+            return self._to_request_infos(rows)
         except Exception as e:
             db.rollback()
             raise ValueError(f"Error fetching incoming requestss: {str(e)}")
@@ -86,8 +164,9 @@ class FriendService:
             user_id: int,
             skip: int = 0,
             limit: int = 10
-    ) -> List[FriendRequest]:
-        return await self.repository.get_outgoing_requests(db, user_id, skip, limit)
+    ) -> List[FriendRequestInfo]:
+        rows = await self.repository.get_outgoing_requests(db, user_id, skip, limit)
+        return self._to_request_infos(rows)
 
     async def handle_friend_request(
             self,
@@ -108,7 +187,14 @@ class FriendService:
                 return False, "Request is not pending", None
 
             status = FriendRequestStatus.ACCEPTED if action == "accept" else FriendRequestStatus.DECLINED
+            if status == FriendRequestStatus.ACCEPTED:
+                # Committed together with the status change below
+                await self.repository.add_friendship(db, request.requester_id, request.receiver_id)
             updated_request = await self.repository.update_request_status(db, request, status)
+            if not updated_request:
+                return False, "Request already handled", None
+            if status == FriendRequestStatus.ACCEPTED:
+                self.friend_sets.add_friendship(request.requester_id, request.receiver_id)
 
             action_text = "accepted" if action == "accept" else "declined"
             return True, f"Friend request {action_text} successfully", updated_request
@@ -134,9 +220,11 @@ class FriendService:
             if request.status != FriendRequestStatus.PENDING:
                 return False, "Request cannot be canceled"
 
-            await self.repository.update_request_status(
+            canceled = await self.repository.update_request_status(
                 db, request, FriendRequestStatus.CANCELED
             )
+            if not canceled:
+                return False, "Request already handled"
             return True, "Friend request canceled successfully"
 
         except Exception as e:
@@ -161,14 +249,22 @@ class FriendService:
                 return False, "Cannot block yourself", None
 
             # Check if already blocked
-            is_blocked = await self.repository.is_blocked(db, blocker_id, blocked_id)
+            is_blocked = await self.block_sets.is_blocked(db, blocker_id, blocked_id)
             if is_blocked:
                 return False, "User is already blocked", None
 
-            # Block user
+            # Block user and bump the cache generation in one transaction
             blocked = await self.repository.block_user(
                 db, blocker_id, blocked_id, reason
             )
+            generation = CacheGenerationRepository.bump_generation(db, BLOCKED_USERS_GENERATION)
+            CacheGenerationRepository.record_changes(
+                db, BLOCKED_USERS_GENERATION, generation, [self.block_sets.change_key(blocker_id, blocked_id)]
+            )
+            db.commit()
+            db.refresh(blocked)
+            self.block_sets.apply_block(blocker_id, blocked_id, generation)
+            self.friend_sets.invalidate(blocker_id, blocked_id)
 
             return True, "User blocked successfully", blocked
 
@@ -186,9 +282,19 @@ class FriendService:
             if blocker_id == blocked_id:
                 return False, "Cannot unblock yourself"
 
+            # Only an actual delete bumps the generation, so a no-op unblock
+            # cannot make every worker rebuild its block filter
             success = await self.repository.unblock_user(db, blocker_id, blocked_id)
             if not success:
+                db.rollback()
                 return False, "User was not blocked"
+            generation = CacheGenerationRepository.bump_generation(db, BLOCKED_USERS_GENERATION)
+            CacheGenerationRepository.record_changes(
+                db, BLOCKED_USERS_GENERATION, generation, [self.block_sets.change_key(blocker_id, blocked_id)]
+            )
+            db.commit()
+            self.block_sets.apply_unblock(blocker_id, blocked_id, generation)
+            self.friend_sets.invalidate(blocker_id, blocked_id)
 
             return True, "User unblocked successfully"
 
@@ -196,6 +302,45 @@ class FriendService:
             db.rollback()
             return False, f"Error unblocking user: {str(e)}"
 
+    async def _to_friend_infos(self, db: Session, user_id: int, friends: List[User]) -> List[FriendInfo]:
+        """Attach each friend's default room and mutual friend count (batched) and build FriendInfo rows"""
+        # Extract friend IDs for batch query
+        friend_ids = [friend.id for friend in friends]
+        if not friend_ids:
+            return []
+
+        # Batch query for all default rooms at once
+        default_rooms = db.query(
+            Room.owner_id,
+            Room.id
+        ).filter(
+            Room.owner_id.in_(friend_ids),
+            Room.celebrant_id == func.cast(Room.owner_id, String),  # owner is celebrant
+            Room.privacy_type == RoomPrivacy.PUBLIC,
+            Room.is_archived == False
+        ).all()
+
+        # Create a mapping of user_id to default_room_id for O(1) lookup
+        default_room_map = {
+            room.owner_id: room.id for room in default_rooms
+        }
+        mutual_counts = await self.mutual_friends.count_mutual_friends(db, user_id, friend_ids)
+
+        # Build response with default room IDs
+        return [
+            FriendInfo(
+                id=friend.id,
+                first_name=friend.first_name,
+                last_name=friend.last_name,
+                profile_picture_url=friend.profile_picture_url,
+                date_of_birth=friend.date_of_birth,
+                is_active=friend.is_active,
+                last_seen=friend.updated_at,
+                default_room_id=default_room_map.get(friend.id),  # Add this field
+                mutual_friends=mutual_counts.get(friend.id, 0)
+            ) for friend in friends
+        ]
+
     async def get_friends(
             self,
             db: Session,
@@ -204,41 +349,101 @@ class FriendService:
             limit: int = 10
     ) -> List[FriendInfo]:
         try:
-            # Get friends from repository (existing logic)
-            friends = await self.repository.get_friends(db, user_id, skip, limit)
-            
-            # Extract friend IDs for batch query
-            friend_ids = [friend.id for friend in friends]
-            
-            # Batch query for all default rooms at once
-            default_rooms = db.query(
-                Room.owner_id,
-                Room.id
-            ).filter(
-                Room.owner_id.in_(friend_ids),
-                Room.celebrant_id == func.cast(Room.owner_id, String),  # owner is celebrant
-                Room.privacy_type == RoomPrivacy.PUBLIC,
-                Room.is_archived == False
-            ).all()
-            
-            # Create a mapping of user_id to default_room_id for O(1) lookup
-            default_room_map = {
-                room.owner_id: room.id for room in default_rooms
-            }
-            
-            # Build response with default room IDs
+            friend_ids = await self.friend_sets.get(db, user_id)
+            friends = await self.repository.get_users_by_ids(db, list(friend_ids[skip:skip + limit]))
+            return await self._to_friend_infos(db, user_id, friends)
+        except Exception as e:
+            db.rollback()
+            raise ValueError(f"Error fetching friends: {str(e)}")
+
+    async def get_friends_page(
+            self,
+            db: Session,
+            user_id: int,
+            after: Optional[str] = None,
+            limit: int = 10
+    ) -> FriendPage:
+        """Keyset page of friends ordered by first name, then id"""
+        after_key = tuple(CursorUtils.decode(after, 2)) if after else None
+        try:
+            # Fetch one extra row to know whether another page follows
+            friends = await self.repository.get_friends_after(db, user_id, after_key, limit + 1)
+            has_more = len(friends) > limit
+            friends = friends[:limit]
+
+            last = friends[-1] if friends else None
+            return FriendPage(
+                items=await self._to_friend_infos(db, user_id, friends),
+                next_cursor=CursorUtils.encode(last.first_name or '', last.id) if has_more else None,
+                total=await self.repository.count_friends(db, user_id)
+            )
+        except Exception as e:
+            db.rollback()
+            raise ValueError(f"Error fetching friends: {str(e)}")
+
+    async def get_suggestions(
+            self,
+            db: Session,
+            user_id: int,
+            limit: int = 20
+    ) -> List[FriendSuggestionInfo]:
+        """Stored suggestions, skipping anyone befriended or blocked since the last engine run"""
+        try:
+            rows = await FriendSuggestionRepository.get_suggestions(db, user_id, limit * 2)
+            candidate_ids = [suggestion.suggested_user_id for suggestion, _ in rows]
+
+            friend_ids = set(await self.friend_sets.get(db, user_id))
+            blocked_ids = await self.block_sets.is_blocked_many(db, user_id, candidate_ids)
+
             return [
-                FriendInfo(
-                    id=friend.id,
-                    first_name=friend.first_name,
-                    last_name=friend.last_name,
-                    profile_picture_url=friend.profile_picture_url,
-                    date_of_birth=friend.date_of_birth,
-                    is_active=friend.is_active,
-                    last_seen=friend.updated_at,
-                    default_room_id=default_room_map.get(friend.id)  # Add this field
-                ) for friend in friends
-            ]
+                FriendSuggestionInfo(
+                    user=UserBasicInfo.model_validate(user),
+                    mutual_friends=suggestion.mutual_friends,
+                    shared_contacts=suggestion.shared_contacts,
+                    in_contacts=suggestion.in_contacts,
+                    score=suggestion.score
+                ) for suggestion, user in rows
+                if user.id not in friend_ids and user.id not in blocked_ids
+            ][:limit]
+        except Exception as e:
+            db.rollback()
+            raise ValueError(f"Error fetching friend suggestions: {str(e)}")
+
+    async def get_upcoming_birthdays(
+            self,
+            db: Session,
+            user_id: int,
+            days: int = 30,
+            limit: int = 50
+    ) -> List[UpcomingBirthdayInfo]:
+        """Friends with a birthday within the next `days` days, soonest first"""
+        try:
+            today = date.today()
+            key_ranges = BirthdayUtils.window_ranges(today, days)
+            friends = await self.repository.get_upcoming_birthdays(db, user_id, key_ranges, limit)
+
+            upcoming = []
+            for info in await self._to_friend_infos(db, user_id, friends):
+                next_birthday = BirthdayUtils.next_birthday(info.date_of_birth, today)
+                upcoming.append(UpcomingBirthdayInfo(
+                    **info.model_dump(),
+                    next_birthday=next_birthday,
+                    days_until=(next_birthday - today).days,
+                    turning_age=BirthdayUtils.turning_age(info.date_of_birth, next_birthday)
+                ))
+            return upcoming
+        except Exception as e:
+            db.rollback()
+            raise ValueError(f"Error fetching upcoming birthdays: {str(e)}")
+
+    async def get_mutual_friends(
+            self,
+            db: Session,
+            user_id: int,
+            target_ids: List[int]
+    ) -> List[MutualFriendsInfo]:
+        try:
+            return await self.mutual_friends.get_mutual_friends(db, user_id, target_ids)
         except Exception as e:
             db.rollback()
-            raise ValueError(f"Error fetching friends: {str(e)}")
\ No newline at end of file
+            raise ValueError(f"Error fetching mutual friends: {str(e)}")
@@ -0,0 +1,112 @@
+# feature/services/friend_set_cache.py
+import sys
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from typing import Dict, Iterable, Tuple
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from ..repository.friend_repository import FriendRepository
+from ..utils.id_array import IdArrayUtils
+
+
+class FriendSetCache:
+    """
+    Process-wide LRU cache of each user's friend ids as sorted int32 arrays.
+
+    Entries are patched when this process accepts a friend request and
+    dropped on block/unblock; the TTL bounds how long a change made by
+    another worker can go unseen. Least recently used entries are evicted
+    once the arrays exceed FRIEND_SET_CACHE_MAX_BYTES.
+    """
+
+    ENTRY_OVERHEAD = 100  # OrderedDict slot, tuple and timestamp, roughly
+
+    def __init__(
+            self,
+            max_bytes: int = settings.FRIEND_SET_CACHE_MAX_BYTES,
+            ttl_seconds: int = settings.FRIEND_SET_CACHE_TTL_SECONDS
+    ):
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[int, Tuple[array, float]]" = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @classmethod
+    def _size(cls, ids: array) -> int:
+        return sys.getsizeof(ids) + cls.ENTRY_OVERHEAD
+
+    def _store(self, user_id: int, ids: array, loaded_at: float) -> None:
+        """Insert or replace an entry and evict down to the memory cap (lock held)"""
+        previous = self._entries.pop(user_id, None)
+        if previous is not None:
+            self._bytes -= self._size(previous[0])
+
+        self._entries[user_id] = (ids, loaded_at)
+        self._bytes += self._size(ids)
+
+        while self._bytes > self.max_bytes and len(self._entries) > 1:
+            _, (evicted, _) = self._entries.popitem(last=False)
+            self._bytes -= self._size(evicted)
+            self.evictions += 1
+
+    async def get(self, db: Session, user_id: int) -> array:
+        """Sorted friend ids of a user, loaded from friendships on a miss"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None and now - entry[1] < self.ttl_seconds:
+                self._entries.move_to_end(user_id)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+
+        ids = IdArrayUtils.from_ids(await FriendRepository.get_friend_ids(db, user_id))
+        with self._lock:
+            self._store(user_id, ids, now)
+        return ids
+
+    def peek_many(self, user_ids: Iterable[int]) -> Dict[int, array]:
+        """Fresh cached entries among user_ids, without loading the missing ones"""
+        now = time.monotonic()
+        with self._lock:
+            found = {}
+            for user_id in user_ids:
+                entry = self._entries.get(user_id)
+                if entry is not None and now - entry[1] < self.ttl_seconds:
+                    found[user_id] = entry[0]
+            self.hits += len(found)
+            return found
+
+    def add_friendship(self, user_id: int, friend_id: int) -> None:
+        """Patch cached entries after this process committed a new friendship"""
+        with self._lock:
+            for owner, friend in ((user_id, friend_id), (friend_id, user_id)):
+                entry = self._entries.get(owner)
+                if entry is not None:
+                    self._store(owner, IdArrayUtils.merge(entry[0], [friend]), entry[1])
+
+    def invalidate(self, *user_ids: int) -> None:
+        with self._lock:
+            for user_id in user_ids:
+                entry = self._entries.pop(user_id, None)
+                if entry is not None:
+                    self._bytes -= self._size(entry[0])
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+friend_set_cache = FriendSetCache()
@@ -0,0 +1,158 @@
+# feature/services/friend_suggestion_engine.py
+import asyncio
+import heapq
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List, Set, Tuple
+from app.core.config import settings
+from app.core.database import get_db
+from ..repository.cache_generation_repository import CacheGenerationRepository
+from ..repository.friend_repository import FriendRepository
+from ..repository.friend_suggestion_repository import FriendSuggestionRepository
+
+FRIEND_SUGGESTION_RUN = "friend_suggestions"
+
+
+class FriendSuggestionEngine:
+    """
+    Periodically ranks "people you may know" for every user with friends or
+    synced contacts and stores the top K, so serving them is one indexed read.
+
+    The friendship and contact graphs are loaded once per run as adjacency
+    sets. Candidates are scored from:
+    - friends of friends (mutual friend count)
+    - other owners whose address books overlap the user's (shared contacts)
+    - registered users in the user's own address book
+    Existing friends, pending requests in either direction and blocked pairs
+    are excluded. Only one worker runs each interval (see claim_run).
+    """
+
+    MUTUAL_FRIEND_WEIGHT = 3.0
+    SHARED_CONTACT_WEIGHT = 1.0
+    IN_CONTACTS_WEIGHT = 5.0
+    MAX_CONTACT_HOLDERS = 1000  # A number saved by more owners than this says little about any of them
+    WRITE_BATCH_USERS = 500
+
+    def __init__(
+            self,
+            top_k: int = settings.FRIEND_SUGGESTION_TOP_K,
+            interval_seconds: int = settings.FRIEND_SUGGESTION_INTERVAL_SECONDS
+    ):
+        self.top_k = top_k
+        self.interval_seconds = interval_seconds
+
+    @staticmethod
+    def _load_graph(db) -> Tuple[Dict[int, Set[int]], Dict[int, Set[int]], Dict[int, Set[int]]]:
+        friends = defaultdict(set)
+        for user_id, friend_id in FriendSuggestionRepository.iter_friendships(db):
+            friends[user_id].add(friend_id)
+
+        contacts = defaultdict(set)
+        for owner_id, registered_user_id in FriendSuggestionRepository.iter_registered_contacts(db):
+            if owner_id != registered_user_id:
+                contacts[owner_id].add(registered_user_id)
+
+        excluded = defaultdict(set)
+        for pairs in (
+                FriendSuggestionRepository.iter_pending_requests(db),
+                FriendRepository.iter_block_pairs(db)
+        ):
+            for a, b in pairs:
+                excluded[a].add(b)
+                excluded[b].add(a)
+
+        return friends, contacts, excluded
+
+    def rank(
+            self,
+            friends: Dict[int, Set[int]],
+            contacts: Dict[int, Set[int]],
+            excluded: Dict[int, Set[int]]
+    ) -> Iterator[Tuple[int, List[Dict]]]:
+        """Yield (user_id, top K suggestion rows) for every user with friends or contacts"""
+        holders = defaultdict(list)
+        for owner_id, contact_ids in contacts.items():
+            for contact_id in contact_ids:
+                holders[contact_id].append(owner_id)
+
+        no_ids = frozenset()
+        for user_id in sorted(friends.keys() | contacts.keys()):
+            user_friends = friends.get(user_id, no_ids)
+            user_contacts = contacts.get(user_id, no_ids)
+
+            mutual = Counter()
+            for friend_id in user_friends:
+                mutual.update(friends.get(friend_id, no_ids))
+
+            shared = Counter()
+            for contact_id in user_contacts:
+                contact_holders = holders[contact_id]
+                if len(contact_holders) <= self.MAX_CONTACT_HOLDERS:
+                    shared.update(contact_holders)
+
+            candidates = (mutual.keys() | shared.keys() | user_contacts) \
+                - user_friends - excluded.get(user_id, no_ids)
+            candidates.discard(user_id)
+            if not candidates:
+                yield user_id, []
+                continue
+
+            top = heapq.nlargest(self.top_k, (
+                (
+                    self.MUTUAL_FRIEND_WEIGHT * mutual[candidate]
+                    + self.SHARED_CONTACT_WEIGHT * shared[candidate]
+                    + (self.IN_CONTACTS_WEIGHT if candidate in user_contacts else 0.0),
+                    -candidate,  # Ties go to older accounts
+                    candidate
+                ) for candidate in candidates
+            ))
+            yield user_id, [
+                {
+                    'user_id': user_id,
+                    'suggested_user_id': candidate,
+                    'rank': rank,
+                    'score': score,
+                    'mutual_friends': mutual[candidate],
+                    'shared_contacts': shared[candidate],
+                    'in_contacts': candidate in user_contacts,
+                } for rank, (score, _, candidate) in enumerate(top)
+            ]
+
+    def run_once(self, run_id: int) -> int:
+        """Recompute and store suggestions for everyone; returns the number of users ranked"""
+        with get_db() as db:
+            friends, contacts, excluded = self._load_graph(db)
+
+            ranked = 0
+            user_ids, rows = [], []
+            for user_id, suggestions in self.rank(friends, contacts, excluded):
+                user_ids.append(user_id)
+                rows.extend(dict(row, run_id=run_id) for row in suggestions)
+                if len(user_ids) >= self.WRITE_BATCH_USERS:
+                    FriendSuggestionRepository.replace_for_users(db, user_ids, rows)
+                    db.commit()
+                    ranked += len(user_ids)
+                    user_ids, rows = [], []
+
+            FriendSuggestionRepository.replace_for_users(db, user_ids, rows)
+            FriendSuggestionRepository.delete_older_runs(db, run_id)
+            db.commit()
+            return ranked + len(user_ids)
+
+    async def run_periodically(self) -> None:
+        """Run the engine once per interval across all workers"""
+        # Poll more often than the interval so a stopped worker's turn is not lost
+        poll_seconds = min(self.interval_seconds, 600)
+        while True:
+            try:
+                with get_db() as db:
+                    due_before = datetime.utcnow() - timedelta(seconds=self.interval_seconds)
+                    run_id = CacheGenerationRepository.claim_run(db, FRIEND_SUGGESTION_RUN, due_before)
+                if run_id:
+                    await asyncio.to_thread(self.run_once, run_id)
+            except Exception as e:
+                print(f"Warning: could not run friend suggestions: {str(e)}")
+            await asyncio.sleep(poll_seconds)
+
+
+friend_suggestion_engine = FriendSuggestionEngine()
@@ -0,0 +1,73 @@
+# feature/services/mutual_friend_service.py
+from collections import defaultdict
+from typing import Dict, List
+from sqlalchemy.orm import Session
+from ..repository.friend_repository import FriendRepository
+from ..schemas.friend_schema import MutualFriendsInfo
+from .friend_set_cache import friend_set_cache
+
+
+class MutualFriendService:
+    """
+    Mutual friend counts between one viewer and a batch of other users.
+
+    Targets whose friend sets are already in the friend set cache are
+    intersected in memory with the viewer's set; the rest are answered by a
+    single self-join on friendships, so a batch never costs more than one
+    query plus (when names are asked for) one name lookup.
+    """
+
+    def __init__(self):
+        self.repository = FriendRepository()
+        self.friend_sets = friend_set_cache
+
+    async def get_mutual_friend_ids(self, db: Session, viewer_id: int, target_ids: List[int]) -> Dict[int, List[int]]:
+        """Sorted ids of the friends the viewer shares with each target"""
+        target_ids = [target_id for target_id in dict.fromkeys(target_ids) if target_id != viewer_id]
+        if not target_ids:
+            return {}
+
+        viewer_friends = set(await self.friend_sets.get(db, viewer_id))
+        mutual = {target_id: [] for target_id in target_ids}
+        if not viewer_friends:
+            return mutual
+
+        cached = self.friend_sets.peek_many(target_ids)
+        for target_id, friend_ids in cached.items():
+            mutual[target_id] = sorted(viewer_friends.intersection(friend_ids))
+
+        uncached = [target_id for target_id in target_ids if target_id not in cached]
+        pairs = defaultdict(list)
+        for target_id, friend_id in await self.repository.get_mutual_friend_pairs(db, viewer_id, uncached):
+            pairs[target_id].append(friend_id)
+        for target_id, friend_ids in pairs.items():
+            mutual[target_id] = sorted(friend_ids)
+
+        return mutual
+
+    async def count_mutual_friends(self, db: Session, viewer_id: int, target_ids: List[int]) -> Dict[int, int]:
+        mutual = await self.get_mutual_friend_ids(db, viewer_id, target_ids)
+        return {target_id: len(friend_ids) for target_id, friend_ids in mutual.items()}
+
+    async def get_mutual_friends(
+            self,
+            db: Session,
+            viewer_id: int,
+            target_ids: List[int],
+            sample_size: int = 3
+    ) -> List[MutualFriendsInfo]:
+        """Counts plus the first few mutual friends' names, in target order"""
+        mutual = await self.get_mutual_friend_ids(db, viewer_id, target_ids)
+        sample_ids = {friend_id for friend_ids in mutual.values() for friend_id in friend_ids[:sample_size]}
+        names = await self.repository.get_user_names(db, list(sample_ids))
+
+        return [
+            MutualFriendsInfo(
+                user_id=target_id,
+                count=len(friend_ids),
+                names=[names[friend_id] for friend_id in friend_ids[:sample_size] if names.get(friend_id)]
+            ) for target_id, friend_ids in mutual.items()
+        ]
+
+
+mutual_friend_service = MutualFriendService()
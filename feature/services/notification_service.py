@@ -0,0 +1,19 @@
+# feature/services/notification_service.py
+from sqlalchemy.orm import Session
+from ..repository.notification_repository import NotificationRepository
+from ..schemas.notification_schema import NotificationFeed, NotificationInfo
+
+
+class NotificationService:
+    def __init__(self):
+        self.repository = NotificationRepository()
+
+    async def get_feed(self, db: Session, user_id: int, skip: int = 0, limit: int = 20) -> NotificationFeed:
+        notifications = await self.repository.get_notifications(db, user_id, skip, limit)
+        return NotificationFeed(
+            notifications=[NotificationInfo.model_validate(n) for n in notifications],
+            unread_count=await self.repository.count_unread(db, user_id)
+        )
+
+    async def mark_all_read(self, db: Session, user_id: int) -> int:
+        return await self.repository.mark_all_read(db, user_id)
@@ -7,6 +7,9 @@ from feature.utils.otp_generator import OTPUtils
 from app.core.security import create_jwt_token
 from app.core.config import settings
 from app.models.user import User
+from feature.services.phone_index_service import PhoneIndexService
+from feature.services.contact_fanout_service import ContactFanoutService
+from feature.utils.phone_utils import PhoneUtils
 
 
 class OTPService:
@@ -14,6 +17,7 @@ class OTPService:
         self.sms_adapter = SMSAdapter()
         self.max_attempts = 3
         self.otp_expiry_minutes = 5
+        self.contact_fanout = ContactFanoutService()
 
     async def generate_and_send_otp(self, db: Session, phone_number: str) -> Tuple[bool, str, Optional[str]]:
         # Check if there's an active OTP
@@ -79,13 +83,14 @@ class OTPService:
             # Mark OTP as verified
             await OTPRepository.mark_as_verified(db, otp_record)
 
-            # Find or create user with the verified phone number
-            user = db.query(User).filter(User.phone == phone_number).first()
+            # Find or create user with the verified phone number, stored in E.164
+            phone = PhoneUtils.to_e164(phone_number) or phone_number
+            user = db.query(User).filter(User.phone == phone).first()
 
             if not user:
                 # Create new user with updated field structure
                 user = User(
-                    phone=phone_number,
+                    phone=phone,
                     phone_verified="verified",
                     account_status="registered",
                     email=None,
@@ -95,8 +100,15 @@ class OTPService:
                     is_active=True
                 )
                 db.add(user)
-                db.commit()
+                db.flush()  # Assigns user.id for the phone index
+                PhoneIndexService.index_user(db, user)  # Commits the new user with its index
                 db.refresh(user)
+
+                # Let users who already have this number in their contacts know
+                try:
+                    await self.contact_fanout.fanout_new_user(db, user)
+                except ValueError as e:
+                    print(f"Warning: {str(e)}")
             else:
                 # Update existing user's fields
                 user.phone_verified = "verified"
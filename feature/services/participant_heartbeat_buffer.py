@@ -0,0 +1,45 @@
+# feature/services/participant_heartbeat_buffer.py
+from datetime import datetime
+from typing import Dict, Tuple
+from sqlalchemy import bindparam, or_
+from sqlalchemy.sql import Executable
+from app.core.config import settings
+from ..models.room import RoomParticipant
+from .write_behind_buffer import WriteBehindBuffer
+
+
+class ParticipantHeartbeatBuffer(WriteBehindBuffer):
+    """
+    Write-behind buffer for room_participants.last_active_at, keyed by
+    (room_id, user_id).
+
+    When a whole room heartbeats at once (the "happy birthday" moment) each
+    participant costs a dict write; every PARTICIPANT_HEARTBEAT_FLUSH_SECONDS
+    the dirty pairs are written with one executemany UPDATE. Pairs that are
+    not participants simply match no row.
+    """
+
+    name = "participant heartbeat"
+
+    def __init__(self, flush_seconds: int = settings.PARTICIPANT_HEARTBEAT_FLUSH_SECONDS):
+        super().__init__(flush_seconds)
+
+    def _statement(self) -> Executable:
+        participants = RoomParticipant.__table__
+        return participants.update() \
+            .where(
+                participants.c.room_id == bindparam('b_room_id'),
+                participants.c.user_id == bindparam('b_user_id'),
+                or_(
+                    participants.c.last_active_at.is_(None),
+                    participants.c.last_active_at < bindparam('b_active_at')
+                )
+            ) \
+            .values(last_active_at=bindparam('b_active_at'), updated_at=participants.c.updated_at)
+
+    def _params(self, key: Tuple[str, int], at: datetime) -> Dict:
+        room_id, user_id = key
+        return {'b_room_id': room_id, 'b_user_id': user_id, 'b_active_at': at}
+
+
+participant_heartbeat_buffer = ParticipantHeartbeatBuffer()
@@ -0,0 +1,145 @@
+# feature/services/phone_index_cache.py
+import threading
+import time
+from array import array
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Optional
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from ..repository.cache_generation_repository import CacheGenerationRepository
+from ..repository.phone_index_repository import PhoneIndexRepository
+
+PHONE_INDEX_GENERATION = "user_phone_index"
+
+
+class PhoneIndexCache:
+    """
+    Process-wide phone key -> user_id map used by contact sync.
+
+    The bulk of the index lives in two parallel sorted int64 arrays (about
+    16 bytes per key instead of a dict of strings); writes made by this
+    process go into a small overlay dict until the next rebuild. Every
+    PHONE_INDEX_CACHE_TTL_SECONDS the shared generation counter is checked;
+    keys other workers changed since are read from the cache change log and
+    patched into the overlay. The arrays are only rebuilt when that log has
+    a gap or the overlay has grown too large.
+    """
+
+    def __init__(self, ttl_seconds: int = settings.PHONE_INDEX_CACHE_TTL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._base = (array('q'), array('q'))  # sorted encoded keys, matching user_ids
+        self._overlay: Dict[int, int] = {}  # encoded key -> user_id, 0 marks a removed key
+        self._generation: Optional[int] = None
+        self._checked_at = 0.0
+
+    @staticmethod
+    def _encode(phone_key: str) -> Optional[int]:
+        # Keys are E.164 ("+<digits>"); the leading 1 keeps any leading zero significant
+        digits = phone_key[1:] if phone_key.startswith("+") else phone_key
+        if not digits.isdigit() or len(digits) > 18:
+            return None
+        return int("1" + digits)
+
+    def _get_base(self, encoded: int) -> int:
+        keys, user_ids = self._base
+        i = bisect_left(keys, encoded)
+        if i < len(keys) and keys[i] == encoded:
+            return user_ids[i]
+        return 0
+
+    def _get(self, encoded: int) -> int:
+        if encoded in self._overlay:
+            return self._overlay[encoded]
+        return self._get_base(encoded)
+
+    def _rebuild(self, db: Session) -> None:
+        generation = CacheGenerationRepository.get_generation(db, PHONE_INDEX_GENERATION)
+
+        entries = {}
+        for phone_key, user_id in PhoneIndexRepository.iter_entries(db):
+            encoded = self._encode(phone_key)
+            if encoded is not None:
+                entries.setdefault(encoded, user_id)  # Oldest account wins a shared key
+
+        keys = sorted(entries)
+        self._base = (array('q', keys), array('q', (entries[key] for key in keys)))
+        self._overlay = {}
+        self._generation = generation
+
+    def _catch_up(self, db: Session, generation: int) -> bool:
+        """Patch in the keys changed since our generation; False if the log cannot tell us"""
+        phone_keys = CacheGenerationRepository.get_changes(db, PHONE_INDEX_GENERATION, self._generation, generation)
+        if phone_keys is None:
+            return False
+
+        owners = PhoneIndexRepository.get_key_owners(db, phone_keys)
+        for phone_key in phone_keys:
+            encoded = self._encode(phone_key)
+            if encoded is not None:
+                self._overlay[encoded] = owners.get(phone_key, 0)
+        self._generation = generation
+        # A large overlay costs more memory and lookups than a rebuild
+        return len(self._overlay) <= max(1024, len(self._base[0]) // 4)
+
+    def _ensure_fresh(self, db: Session) -> None:
+        now = time.monotonic()
+        if self._generation is not None and now - self._checked_at < self.ttl_seconds:
+            return
+
+        with self._lock:
+            if self._generation is None:
+                self._rebuild(db)
+            elif now - self._checked_at >= self.ttl_seconds:
+                generation = CacheGenerationRepository.get_generation(db, PHONE_INDEX_GENERATION)
+                if generation != self._generation and not self._catch_up(db, generation):
+                    self._rebuild(db)
+            self._checked_at = now
+
+    def lookup(self, db: Session, phone_keys: Iterable[str]) -> Dict[str, int]:
+        """Resolve phone keys to user ids, skipping keys that are not indexed"""
+        self._ensure_fresh(db)
+
+        found = {}
+        for phone_key in phone_keys:
+            encoded = self._encode(phone_key)
+            if encoded is None:
+                continue
+            user_id = self._get(encoded)
+            if user_id:
+                found[phone_key] = user_id
+        return found
+
+    def apply(self, user_id: int, old_keys: List[str], new_keys: List[str], generation: int) -> None:
+        """Patch the cache after this process committed a phone index change"""
+        with self._lock:
+            if self._generation is None:
+                return  # Not loaded yet; the first lookup reads the committed state
+
+            for phone_key in old_keys:
+                encoded = self._encode(phone_key)
+                if encoded is not None and self._get(encoded) == user_id:
+                    self._overlay[encoded] = 0
+
+            for phone_key in new_keys:
+                encoded = self._encode(phone_key)
+                if encoded is not None and not self._get(encoded):
+                    self._overlay[encoded] = user_id
+
+            # Nobody else wrote in between, so we are still current
+            if generation == self._generation + 1:
+                self._generation = generation
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._generation = None
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "keys": len(self._base[0]),
+            "overlay_keys": len(self._overlay),
+            "generation": self._generation or 0,
+        }
+
+
+phone_index_cache = PhoneIndexCache()
@@ -0,0 +1,19 @@
+# feature/services/phone_index_service.py
+from sqlalchemy.orm import Session
+from app.models.user import User
+from ..repository.cache_generation_repository import CacheGenerationRepository
+from ..repository.phone_index_repository import PhoneIndexRepository
+from .phone_index_cache import phone_index_cache, PHONE_INDEX_GENERATION
+
+
+class PhoneIndexService:
+    @staticmethod
+    def index_user(db: Session, user: User) -> None:
+        """Re-index a user's phone after creation or a phone change and commit"""
+        old_keys, new_keys = PhoneIndexRepository.replace_user_keys(db, user.id, user.phone)
+        generation = CacheGenerationRepository.bump_generation(db, PHONE_INDEX_GENERATION)
+        CacheGenerationRepository.record_changes(db, PHONE_INDEX_GENERATION, generation, old_keys + new_keys)
+        db.commit()
+
+        # Only patch the in-process cache once the rows are committed
+        phone_index_cache.apply(user.id, old_keys, new_keys, generation)
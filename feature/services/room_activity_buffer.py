@@ -0,0 +1,39 @@
+# feature/services/room_activity_buffer.py
+from datetime import datetime
+from typing import Dict
+from sqlalchemy import bindparam, or_
+from sqlalchemy.sql import Executable
+from app.core.config import settings
+from ..models.room import Room
+from .write_behind_buffer import WriteBehindBuffer
+
+
+class RoomActivityBuffer(WriteBehindBuffer):
+    """
+    Write-behind buffer for rooms.last_activity.
+
+    Reads only record the touch in memory; touches of the same room are
+    coalesced to the latest timestamp and written every
+    ROOM_ACTIVITY_FLUSH_SECONDS (and on shutdown) as one batched UPDATE,
+    so busy rooms are no longer row-locked by every view.
+    """
+
+    name = "room activity"
+
+    def __init__(self, flush_seconds: int = settings.ROOM_ACTIVITY_FLUSH_SECONDS):
+        super().__init__(flush_seconds)
+
+    def _statement(self) -> Executable:
+        rooms = Room.__table__
+        return rooms.update() \
+            .where(
+                rooms.c.id == bindparam('room_id'),
+                or_(rooms.c.last_activity.is_(None), rooms.c.last_activity < bindparam('touched_at'))
+            ) \
+            .values(last_activity=bindparam('touched_at'), updated_at=rooms.c.updated_at)  # Not an edit of the room
+
+    def _params(self, room_id: str, at: datetime) -> Dict:
+        return {'room_id': room_id, 'touched_at': at}
+
+
+room_activity_buffer = RoomActivityBuffer()
@@ -1,18 +1,123 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, func, desc
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy import and_, or_, func, desc, exists
 from datetime import datetime
 from typing import Optional, Tuple, List, Dict
 from ..models.room import Room, RoomStatus, RoomPrivacy, RoomType, RoomParticipant
 from ..schemas.room_schema import (
-    RoomCreate, RoomUpdate, RoomFilter, RoomStats, PaginatedResponse, ParticipantPaginatedResponse, ParticipantInfo
+    RoomCreate, RoomUpdate, RoomFilter, RoomStats, PaginatedResponse, RoomPage, ParticipantPaginatedResponse, ParticipantInfo
 )
 from datetime import date, datetime
 from sqlalchemy import and_, or_, func, desc
 from app.models.user import User
 # Import friend models and constants
 from ..models.friend import FriendRequest, FriendRequestStatus
+from .block_set_cache import block_set_cache
+from .friend_set_cache import friend_set_cache
+from .count_cache import count_cache, CountMode
+from .room_activity_buffer import room_activity_buffer
+from .participant_heartbeat_buffer import participant_heartbeat_buffer
+from ..utils.cursor import CursorUtils
+
+# Count cache scopes of the paginated room listings
+ROOM_LIST_COUNTS = "rooms"
+ROOM_INVITATION_COUNTS = "room_invitations"
+ROOM_JOIN_REQUEST_COUNTS = "room_join_requests"
+ROOM_COUNT_SCOPES = (ROOM_LIST_COUNTS, ROOM_INVITATION_COUNTS, ROOM_JOIN_REQUEST_COUNTS)
+
+# Participant statuses with a counter column on rooms
+PARTICIPANT_COUNTERS = {"approved": Room.approved_count, "pending": Room.pending_count}
+PARTICIPANT_ACTION_STATUSES = {"approve": "approved", "reject": "rejected", "ban": "banned"}
 
 class RoomService:
+    @staticmethod
+    def _page_totals(
+            scope: str,
+            key: str,
+            query,
+            page_size: int,
+            include_total: bool,
+            count_mode: CountMode
+    ) -> Dict:
+        """total / pages fields of a paginated response, via the count cache"""
+        if not include_total:
+            return {}
+        total, is_estimate = count_cache.count(scope, key, query, count_mode)
+        return {
+            "total": total,
+            "pages": (total + page_size - 1) // page_size,
+            "total_is_estimate": is_estimate
+        }
+
+    @staticmethod
+    def _shift_participant_counts(
+            db: Session,
+            room_id: str,
+            old_status: Optional[str],
+            new_status: Optional[str],
+            count: int = 1,
+            added: bool = False
+    ) -> bool:
+        """
+        Move `count` participants from old_status to new_status in the room's
+        counters with one atomic UPDATE (no commit); `added` marks them as new
+        rows, which also counts them in total_count. Newly approved
+        participants only fit while approved_count stays within
+        max_participants; returns False, changing nothing, if they don't.
+        """
+        deltas = {Room.total_count: count} if added else {}
+        for status, sign in ((old_status, -count), (new_status, count)):
+            column = PARTICIPANT_COUNTERS.get(status)
+            if column is not None:
+                deltas[column] = deltas.get(column, 0) + sign
+        deltas = {column: delta for column, delta in deltas.items() if delta}
+        if not deltas:
+            return True
+
+        query = db.query(Room).filter(Room.id == room_id)
+        if deltas.get(Room.approved_count, 0) > 0:
+            query = query.filter(
+                or_(
+                    Room.max_participants.is_(None),
+                    Room.max_participants == 0,
+                    Room.approved_count + deltas[Room.approved_count] <= Room.max_participants
+                )
+            )
+        values = {column: column + delta for column, delta in deltas.items()}
+        # Counter moves are not edits of the room: keep the onupdate columns as they are
+        values[Room.updated_at] = Room.updated_at
+        values[Room.last_activity] = Room.last_activity
+        updated = query.update(values, synchronize_session=False)
+        return updated > 0
+
+    @staticmethod
+    def _move_participants(
+            db: Session,
+            room_id: str,
+            user_ids: List[int],
+            old_status: Optional[str],
+            new_status: str
+    ) -> Optional[int]:
+        """
+        Set new_status on the given participants still in old_status and shift
+        the room counters by the rows actually changed (no commit). Only one
+        of two concurrent updates of the same row sees it in old_status, so
+        counters cannot be moved twice. Returns the rows changed, or None if
+        the approvals do not fit max_participants (the caller rolls back).
+        """
+        current = RoomParticipant.status.is_(None) if old_status is None else RoomParticipant.status == old_status
+        moved = db.query(RoomParticipant).filter(
+            RoomParticipant.room_id == room_id,
+            RoomParticipant.user_id.in_(user_ids),
+            current
+        ).update(
+            {"status": new_status, "updated_at": datetime.utcnow()},
+            synchronize_session=False
+        )
+        if moved and not RoomService._shift_participant_counts(db, room_id, old_status, new_status, moved):
+            return None
+        return moved
+
     @staticmethod
     async def create_room(
             db: Session,
@@ -103,7 +208,9 @@ class RoomService:
                 last_active_at=datetime.utcnow()
             )
             db.add(participant)
+            RoomService._shift_participant_counts(db, room.id, None, "approved", added=True)
             db.commit()
+            count_cache.invalidate(*ROOM_COUNT_SCOPES)
 
             return True, "Room created successfully", room
 
@@ -137,6 +244,7 @@ class RoomService:
             # Update the room status to active
             room.status = RoomStatus.ACTIVE
             db.commit()
+            count_cache.invalidate(*ROOM_COUNT_SCOPES)
             db.refresh(room)
 
             return True, "Room activated successfully", room
@@ -151,7 +259,9 @@ class RoomService:
             room_id: str,
             owner_id: int,
             page: int = 1,
-            page_size: int = 10
+            page_size: int = 10,
+            include_total: bool = True,
+            count_mode: CountMode = CountMode.EXACT
     ) -> ParticipantPaginatedResponse:
         """Get users who have requested to join a room (pending status)."""
         try:
@@ -171,14 +281,17 @@ class RoomService:
                 RoomParticipant.status == "pending"
             )
 
-            # Calculate total before pagination
-            total = query.count()
+            totals = RoomService._page_totals(
+                ROOM_JOIN_REQUEST_COUNTS, room_id, query, page_size, include_total, count_mode
+            )
 
-            # Apply pagination
+            # Apply pagination, fetching one extra row to know whether another page follows
             participants = query.order_by(RoomParticipant.joined_at.desc()) \
                 .offset((page - 1) * page_size) \
-                .limit(page_size) \
+                .limit(page_size + 1) \
                 .all()
+            has_more = len(participants) > page_size
+            participants = participants[:page_size]
 
             # Format response data
             items = []
@@ -195,10 +308,10 @@ class RoomService:
 
             return ParticipantPaginatedResponse(
                 items=items,
-                total=total,
                 page=page,
                 size=page_size,
-                pages=(total + page_size - 1) // page_size
+                has_more=has_more,
+                **totals
             )
 
         except Exception as e:
@@ -235,9 +348,15 @@ class RoomService:
             if not room.is_active():
                 return False, "Cannot invite users to inactive room", None
 
+            # Users blocked with the sender (either way) are skipped, checked in one call
+            blocked_ids = await block_set_cache.is_blocked_many(db, sender_id, user_ids)
+
             # Process each user invitation
             success_count = 0
             for user_id in user_ids:
+                if user_id in blocked_ids:
+                    continue
+
                 # Check if user exists
                 user = db.query(User).filter(User.id == user_id).first()
                 if not user:
@@ -268,7 +387,9 @@ class RoomService:
                 db.add(participant)
                 success_count += 1
 
+            RoomService._shift_participant_counts(db, room_id, None, "pending", success_count, added=True)
             db.commit()
+            count_cache.invalidate(*ROOM_COUNT_SCOPES)
             db.refresh(room)
 
             return True, f"Successfully invited {success_count} users", room
@@ -281,7 +402,9 @@ class RoomService:
             db: Session,
             user_id: int,
             page: int = 1,
-            page_size: int = 10
+            page_size: int = 10,
+            include_total: bool = True,
+            count_mode: CountMode = CountMode.EXACT
     ) -> PaginatedResponse:
         """Get all rooms where the user has a pending invitation."""
         try:
@@ -295,144 +418,168 @@ class RoomService:
                 )
             )
 
-            # Calculate total before pagination
-            total = query.count()
+            totals = RoomService._page_totals(
+                ROOM_INVITATION_COUNTS, str(user_id), query, page_size, include_total, count_mode
+            )
 
             # Apply pagination and ordering
             query = query.order_by(desc(Room.created_at)) \
                 .offset((page - 1) * page_size) \
-                .limit(page_size)
+                .limit(page_size + 1)
 
             rooms = query.all()
 
             return PaginatedResponse(
-                items=rooms,
-                total=total,
+                items=rooms[:page_size],
                 page=page,
                 size=page_size,
-                pages=(total + page_size - 1) // page_size
+                has_more=len(rooms) > page_size,
+                **totals
             )
 
         except Exception as e:
             raise ValueError(f"Error getting pending invitations: {str(e)}")
 
+    @staticmethod
+    async def _filter_rooms(db: Session, query, user_id: int, filter_params: RoomFilter):
+        """
+        Apply listing filters without joining participants: membership is an
+        EXISTS semi-join, so every room appears once and no DISTINCT is needed
+        """
+        # Base filters
+        if not filter_params.is_archived:
+            query = query.filter(Room.is_archived == False)
+
+        # Apply my_rooms filter
+        if filter_params.my_rooms:
+            is_participant = exists().where(
+                RoomParticipant.room_id == Room.id,
+                RoomParticipant.user_id == user_id,
+                RoomParticipant.status.in_(["approved", "pending"])
+            )
+            query = query.filter(
+                or_(
+                    Room.owner_id == user_id,
+                    is_participant
+                )
+            )
+
+        # Apply room type filter
+        if filter_params.room_type:
+            query = query.filter(Room.room_type.in_(filter_params.room_type))
+
+        # Apply status filter
+        if filter_params.status:
+            query = query.filter(Room.status.in_(filter_params.status))
+
+        # Apply date range filter
+        if filter_params.from_date:
+            query = query.filter(Room.activation_time >= filter_params.from_date)
+        if filter_params.to_date:
+            query = query.filter(Room.expiration_time <= filter_params.to_date)
+
+        # Apply birthday date range filter
+        if filter_params.birthday_from_date:
+            query = query.filter(Room.celebrant_birthday >= filter_params.birthday_from_date)
+        if filter_params.birthday_to_date:
+            query = query.filter(Room.celebrant_birthday <= filter_params.birthday_to_date)
+
+        # Apply text search if provided
+        if filter_params.query:
+            search = f"%{filter_params.query}%"
+            query = query.filter(
+                or_(
+                    Room.room_name.ilike(search),
+                    Room.description.ilike(search)
+                )
+            )
+
+        # Filter by owner if specified
+        if filter_params.owner_id:
+            query = query.filter(Room.owner_id == filter_params.owner_id)
+
+        # Filter by friends only if requested
+        if filter_params.friends_only:
+            # Rooms created by friends, plus the user's own rooms
+            friend_ids = await friend_set_cache.get(db, user_id)
+            query = query.filter(Room.owner_id.in_([user_id, *friend_ids]))
+
+        return query
+
     @staticmethod
     async def list_rooms(
             db: Session,
             user_id: int,
             filter_params: RoomFilter,
             page: int = 1,
-            page_size: int = 10
+            page_size: int = 10,
+            include_total: bool = True,
+            count_mode: CountMode = CountMode.EXACT
     ) -> PaginatedResponse:
         """List rooms with enhanced filtering and pagination."""
         try:
-            query = db.query(Room).outerjoin(RoomParticipant)
-
-            # Base filters
-            if not filter_params.is_archived:
-                query = query.filter(Room.is_archived == False)
-
-            # Apply my_rooms filter
-            if filter_params.my_rooms:
-                # Use subquery for better performance
-                participant_subquery = db.query(RoomParticipant.room_id).filter(
-                    RoomParticipant.user_id == user_id,
-                    RoomParticipant.status.in_(["approved", "pending"])
-                ).subquery()
-                
-                query = query.filter(
-                    or_(
-                        Room.owner_id == user_id,
-                        Room.id.in_(participant_subquery)
-                    )
-                )
-
-            # Apply room type filter
-            if filter_params.room_type:
-                query = query.filter(Room.room_type.in_(filter_params.room_type))
-
-            # Apply status filter
-            if filter_params.status:
-                query = query.filter(Room.status.in_(filter_params.status))
-
-            # Apply date range filter
-            if filter_params.from_date:
-                query = query.filter(Room.activation_time >= filter_params.from_date)
-            if filter_params.to_date:
-                query = query.filter(Room.expiration_time <= filter_params.to_date)
-
-            # Apply birthday date range filter
-            if filter_params.birthday_from_date:
-                query = query.filter(Room.celebrant_birthday >= filter_params.birthday_from_date)
-            if filter_params.birthday_to_date:
-                query = query.filter(Room.celebrant_birthday <= filter_params.birthday_to_date)
-
-            # Apply text search if provided
-            if filter_params.query:
-                search = f"%{filter_params.query}%"
-                query = query.filter(
-                    or_(
-                        Room.room_name.ilike(search),
-                        Room.description.ilike(search)
-                    )
-                )
-
-            # Filter by owner if specified
-            if filter_params.owner_id:
-                query = query.filter(Room.owner_id == filter_params.owner_id)
-
-            # Filter by friends only if requested
-            if filter_params.friends_only:
-                # Import FriendRepository here to avoid circular imports
-                from ..repository.friend_repository import FriendRepository
-
-                # Get all accepted friend requests where the user is either the requester or receiver
-                friend_requests = db.query(FriendRequest).filter(
-                    and_(
-                        or_(
-                            FriendRequest.requester_id == user_id,
-                            FriendRequest.receiver_id == user_id
-                        ),
-                        FriendRequest.status == FriendRequestStatus.ACCEPTED
-                    )
-                ).all()
-
-                # Extract friend IDs
-                friend_ids = []
-                for request in friend_requests:
-                    friend_id = request.receiver_id if request.requester_id == user_id else request.requester_id
-                    friend_ids.append(friend_id)
+            query = await RoomService._filter_rooms(db, db.query(Room), user_id, filter_params)
 
-                # Add current user's ID to the list to also show their own rooms
-                friend_ids.append(user_id)
-
-                # Filter rooms to only show those created by friends
-                if friend_ids:
-                    query = query.filter(Room.owner_id.in_(friend_ids))
-                else:
-                    # If user has no friends, only show their own rooms
-                    query = query.filter(Room.owner_id == user_id)
-
-            # Add distinct to avoid duplicates when using joins
-            if filter_params.my_rooms or filter_params.friends_only:
-                query = query.distinct()
-
-            # Calculate total before pagination
-            total = query.count()
+            # Filters such as my_rooms and friends_only depend on the user
+            totals = RoomService._page_totals(
+                ROOM_LIST_COUNTS,
+                count_cache.filter_key(user_id, filter_params.model_dump()),
+                query, page_size, include_total, count_mode
+            )
 
             # Apply pagination
             query = query.order_by(desc(Room.created_at)) \
                 .offset((page - 1) * page_size) \
-                .limit(page_size)
+                .limit(page_size + 1)
 
             rooms = query.all()
 
             return PaginatedResponse(
-                items=rooms,
-                total=total,
+                items=rooms[:page_size],
                 page=page,
                 size=page_size,
-                pages=(total + page_size - 1) // page_size
+                has_more=len(rooms) > page_size,
+                **totals
+            )
+
+        except Exception as e:
+            raise ValueError(f"Error listing rooms: {str(e)}")
+
+    @staticmethod
+    async def list_rooms_page(
+            db: Session,
+            user_id: int,
+            filter_params: RoomFilter,
+            after: Optional[str] = None,
+            limit: int = 20
+    ) -> RoomPage:
+        """Keyset page of rooms, newest first, ordered by (created_at, id)"""
+        if after:
+            after_created_at, after_id = CursorUtils.decode(after, 2)
+            try:
+                after_created_at = datetime.fromisoformat(after_created_at)
+            except (TypeError, ValueError):
+                raise ValueError("Invalid cursor")
+
+        try:
+            query = await RoomService._filter_rooms(db, db.query(Room), user_id, filter_params)
+            if after:
+                query = query.filter(
+                    or_(
+                        Room.created_at < after_created_at,
+                        and_(Room.created_at == after_created_at, Room.id < after_id)
+                    )
+                )
+
+            # Fetch one extra row to know whether another page follows
+            rooms = query.order_by(desc(Room.created_at), desc(Room.id)).limit(limit + 1).all()
+            has_more = len(rooms) > limit
+            rooms = rooms[:limit]
+
+            last = rooms[-1] if rooms else None
+            return RoomPage(
+                items=rooms,
+                next_cursor=CursorUtils.encode(last.created_at.isoformat(), last.id) if has_more else None
             )
 
         except Exception as e:
@@ -456,16 +603,8 @@ class RoomService:
                 return False, "Room is not active", None
 
             # Check if room has reached maximum participants
-            if room.max_participants:
-                participant_count = db.query(RoomParticipant) \
-                    .filter(
-                    and_(
-                        RoomParticipant.room_id == room_id,
-                        RoomParticipant.status == "approved"
-                    )
-                ).count()
-                if participant_count >= room.max_participants:
-                    return False, "Room has reached maximum participants", None
+            if room.max_participants and room.approved_count >= room.max_participants:
+                return False, "Room has reached maximum participants", None
 
             # Check if user is already a participant
             existing_participant = db.query(RoomParticipant).filter(
@@ -496,12 +635,16 @@ class RoomService:
                 last_active_at=datetime.utcnow()
             )
             db.add(participant)
+            # Claims a seat atomically, so concurrent joins cannot overshoot max_participants
+            if not RoomService._shift_participant_counts(db, room_id, None, status, added=True):
+                db.rollback()
+                return False, "Room has reached maximum participants", None
             db.commit()
+            count_cache.invalidate(*ROOM_COUNT_SCOPES)
 
-            # Update room's last activity
-            room.last_activity = datetime.utcnow()
-            db.commit()
+            # Update room's last activity through the write-behind buffer
             db.refresh(room)
+            set_committed_value(room, 'last_activity', room_activity_buffer.touch(room_id))
 
             success_message = "Successfully joined room" if status == "approved" else \
                 "Join request sent successfully"
@@ -523,18 +666,8 @@ class RoomService:
                 .first()
 
             if room:
-                # Get participant count
-                participant_count = db.query(RoomParticipant) \
-                    .filter(
-                    and_(
-                        RoomParticipant.room_id == room_id,
-                        RoomParticipant.status == "approved"
-                    )
-                ).count()
-
-                # Update last activity if accessed
-                room.last_activity = datetime.utcnow()
-                db.commit()
+                # Record the access in the write-behind buffer; show it without dirtying the room
+                set_committed_value(room, 'last_activity', room_activity_buffer.touch(room_id))
 
             return room
 
@@ -574,9 +707,16 @@ class RoomService:
             if not participant:
                 return False, "Participant not found", None
 
-            participant.status = new_status
-            participant.updated_at = datetime.utcnow()
+            moved = RoomService._move_participants(db, room_id, [user_id], participant.status, new_status)
+            if moved is None:
+                db.rollback()
+                return False, "Room has reached maximum participants", None
+            if not moved:
+                db.rollback()
+                return False, "Participant was updated by someone else, please retry", None
+
             db.commit()
+            count_cache.invalidate(*ROOM_COUNT_SCOPES)
 
             # Get updated room
             room = db.query(Room).filter(Room.id == room_id).first()
@@ -597,16 +737,10 @@ class RoomService:
             if not room:
                 return None
 
-            participants = db.query(RoomParticipant) \
-                .filter(RoomParticipant.room_id == room_id)
-
-            total_participants = participants.count()
-            active_participants = participants.filter(
-                RoomParticipant.status == "approved"
-            ).count()
-            pending_requests = participants.filter(
-                RoomParticipant.status == "pending"
-            ).count()
+            # Maintained counters
+            total_participants = room.total_count
+            active_participants = room.approved_count
+            pending_requests = room.pending_count
 
             capacity_used = (total_participants / room.max_participants * 100) \
                 if room.max_participants else 0
@@ -644,6 +778,7 @@ class RoomService:
 
             room.updated_at = datetime.utcnow()
             db.commit()
+            count_cache.invalidate(*ROOM_COUNT_SCOPES)
             db.refresh(room)
 
             return True, "Room updated successfully", room
@@ -674,18 +809,25 @@ class RoomService:
             if not admin_participant:
                 return False, "Not authorized for bulk updates", None
 
-            # Update participants
-            updated = db.query(RoomParticipant).filter(
-                and_(
-                    RoomParticipant.room_id == room_id,
-                    RoomParticipant.user_id.in_(user_ids)
-                )
-            ).update(
-                {"status": action, "updated_at": datetime.utcnow()},
-                synchronize_session=False
-            )
+            # The endpoint takes verbs (approve, reject, ban); store the matching status
+            new_status = PARTICIPANT_ACTION_STATUSES.get(action, action)
+
+            # Update participants one current status at a time, so each group's
+            # counter shift matches the rows that group's UPDATE really changed
+            current_statuses = db.query(RoomParticipant.status).filter(
+                RoomParticipant.room_id == room_id,
+                RoomParticipant.user_id.in_(user_ids)
+            ).distinct().all()
+            updated = 0
+            for (old_status,) in current_statuses:
+                moved = RoomService._move_participants(db, room_id, user_ids, old_status, new_status)
+                if moved is None:
+                    db.rollback()
+                    return False, "Room has reached maximum participants", None
+                updated += moved
 
             db.commit()
+            count_cache.invalidate(*ROOM_COUNT_SCOPES)
 
             return True, f"Updated {updated} participants", {"updated_count": updated}
 
@@ -711,6 +853,7 @@ class RoomService:
             room.is_archived = True
             room.updated_at = datetime.utcnow()
             db.commit()
+            count_cache.invalidate(*ROOM_COUNT_SCOPES)
             db.refresh(room)
 
             return True, "Room archived successfully", room
@@ -724,22 +867,21 @@ class RoomService:
             db: Session,
             room_id: str,
             user_id: int
-    ) -> bool:
-        """Update participant's last activity timestamp."""
-        try:
-            participant = db.query(RoomParticipant).filter(
-                and_(
+    ) -> Optional[datetime]:
+        """
+        Record a participant heartbeat; last_active_at is written in batches by the heartbeat buffer.
+        Returns None if the user is not a participant of the room.
+        """
+        key = (room_id, user_id)
+        # A pending key was checked when it was first touched in this interval; only
+        # verify membership once per key per flush so strangers never reach the buffer
+        if not participant_heartbeat_buffer.is_pending(key):
+            is_participant = db.query(
+                exists().where(
                     RoomParticipant.room_id == room_id,
                     RoomParticipant.user_id == user_id
                 )
-            ).first()
-
-            if participant:
-                participant.last_active_at = datetime.utcnow()
-                db.commit()
-                return True
-            return False
-
-        except Exception:
-            db.rollback()
-            return False
\ No newline at end of file
+            ).scalar()
+            if not is_participant:
+                return None
+        return participant_heartbeat_buffer.touch(key)
\ No newline at end of file
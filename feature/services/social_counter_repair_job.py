@@ -0,0 +1,55 @@
+# feature/services/social_counter_repair_job.py
+import asyncio
+from datetime import datetime, timedelta
+from app.core.config import settings
+from app.core.database import get_db
+from ..repository.cache_generation_repository import CacheGenerationRepository
+from ..repository.friend_repository import FriendRepository
+
+SOCIAL_COUNTER_REPAIR_RUN = "social_counter_repair"
+
+
+class SocialCounterRepairJob:
+    """
+    Recounts every user's friend_count and pending request counters.
+
+    The counters are kept current by FriendRepository in the same
+    transaction as each change; this job only catches drift (rows edited
+    outside the app, a crash between statements on a non-transactional
+    backend). Users are recounted in id ranges, one UPDATE and commit per
+    range, and only one worker runs each interval (see claim_run).
+    """
+
+    BATCH_SIZE = 5000
+
+    def __init__(self, interval_seconds: int = settings.SOCIAL_COUNTER_REPAIR_INTERVAL_SECONDS):
+        self.interval_seconds = interval_seconds
+
+    def run_once(self) -> int:
+        """Recount all users; returns the number of users whose counters were corrected"""
+        repaired = 0
+        with get_db() as db:
+            max_id = FriendRepository.get_max_user_id(db)
+            for first_id in range(1, max_id + 1, self.BATCH_SIZE):
+                repaired += FriendRepository.recount_social_counters(db, first_id, first_id + self.BATCH_SIZE - 1)
+                db.commit()
+        return repaired
+
+    async def run_periodically(self) -> None:
+        """Run the repair once per interval across all workers"""
+        poll_seconds = min(self.interval_seconds, 600)
+        while True:
+            try:
+                with get_db() as db:
+                    due_before = datetime.utcnow() - timedelta(seconds=self.interval_seconds)
+                    claimed = CacheGenerationRepository.claim_run(db, SOCIAL_COUNTER_REPAIR_RUN, due_before)
+                if claimed:
+                    repaired = await asyncio.to_thread(self.run_once)
+                    if repaired:
+                        print(f"Warning: repaired drifted social counters of {repaired} users")
+            except Exception as e:
+                print(f"Warning: could not repair social counters: {str(e)}")
+            await asyncio.sleep(poll_seconds)
+
+
+social_counter_repair_job = SocialCounterRepairJob()
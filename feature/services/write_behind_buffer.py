@@ -0,0 +1,102 @@
+# feature/services/write_behind_buffer.py
+import asyncio
+import threading
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Dict, Hashable, List, Optional
+from sqlalchemy.sql import Executable
+from app.core.database import get_db
+
+
+class WriteBehindBuffer(ABC):
+    """
+    Coalesces timestamp touches per key in memory and writes the latest one
+    for every dirty key with a single executemany UPDATE per flush.
+
+    Subclasses provide the statement and its parameters; the statement
+    should never move a timestamp backwards, so workers flushing out of
+    order are harmless. A failed flush puts its touches back; a crash
+    loses at most one interval.
+    """
+
+    name = "buffer"
+
+    def __init__(self, flush_seconds: int):
+        self.flush_seconds = flush_seconds
+        self._lock = threading.Lock()
+        self._pending: Dict[Hashable, datetime] = {}
+        self._pending_touches = 0
+        self.touches = 0
+        self.touches_flushed = 0
+        self.keys_flushed = 0
+        self.flushes = 0
+
+    @abstractmethod
+    def _statement(self) -> Executable:
+        """The UPDATE run with executemany over every dirty key"""
+
+    @abstractmethod
+    def _params(self, key: Hashable, at: datetime) -> Dict:
+        """Bind parameters of one key's row"""
+
+    def touch(self, key: Hashable, at: Optional[datetime] = None) -> datetime:
+        at = at or datetime.utcnow()
+        with self._lock:
+            self.touches += 1
+            self._pending_touches += 1
+            previous = self._pending.get(key)
+            if previous is None or at > previous:
+                self._pending[key] = at
+        return at
+
+    def is_pending(self, key: Hashable) -> bool:
+        """Whether the key was touched since the last flush"""
+        return key in self._pending
+
+    def _requeue(self, pending: Dict[Hashable, datetime], touches: int) -> None:
+        with self._lock:
+            self._pending_touches += touches
+            for key, at in pending.items():
+                previous = self._pending.get(key)
+                if previous is None or at > previous:
+                    self._pending[key] = at
+
+    def flush(self) -> int:
+        """Write all buffered touches in one executemany; returns the number of keys written"""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            touches, self._pending_touches = self._pending_touches, 0
+        if not pending:
+            return 0
+
+        rows: List[Dict] = [self._params(key, at) for key, at in pending.items()]
+        try:
+            with get_db() as db:
+                db.execute(self._statement(), rows)
+                db.commit()
+        except Exception:
+            self._requeue(pending, touches)
+            raise
+
+        self.flushes += 1
+        self.keys_flushed += len(pending)
+        self.touches_flushed += touches
+        return len(pending)
+
+    async def run_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_seconds)
+            try:
+                await asyncio.to_thread(self.flush)
+            except Exception as e:
+                print(f"Warning: could not flush {self.name}: {str(e)}")
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "pending": len(self._pending),
+            "touches": self.touches,
+            "keys_flushed": self.keys_flushed,
+            "flushes": self.flushes,
+            # Touches absorbed per row written; 1.0 means no coalescing
+            "coalescing_ratio": round(self.touches_flushed / self.keys_flushed, 2) if self.keys_flushed else 0.0,
+        }
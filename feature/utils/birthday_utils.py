@@ -0,0 +1,49 @@
+import calendar
+from datetime import date, timedelta
+from typing import List, Optional, Tuple
+
+
+class BirthdayUtils:
+    """Month-day birthday keys (month * 100 + day), as stored in users.birthday_key"""
+
+    @staticmethod
+    def key(day: date) -> int:
+        return day.month * 100 + day.day
+
+    @staticmethod
+    def window_ranges(start: date, days: int) -> List[Tuple[int, int]]:
+        """
+        Inclusive birthday_key ranges covering start .. start + days. A window
+        crossing New Year becomes two ranges. In non-leap years Feb 29
+        birthdays are celebrated on Feb 28.
+        """
+        start_key = BirthdayUtils.key(start)
+        if days >= 365:
+            # The whole year, still starting from today for ordering
+            return [(start_key, 1231)] + ([(101, start_key - 1)] if start_key > 101 else [])
+
+        end = start + timedelta(days=days)
+        end_key = BirthdayUtils.key(end)
+        if end_key == 228 and not calendar.isleap(end.year):
+            end_key = 229
+
+        if start_key <= end_key and start.year == end.year:
+            return [(start_key, end_key)]
+        return [(start_key, 1231), (101, end_key)]
+
+    @staticmethod
+    def next_birthday(date_of_birth: date, today: date) -> date:
+        """The next celebration of date_of_birth on or after today"""
+        for year in (today.year, today.year + 1):
+            day = date_of_birth.day
+            if date_of_birth.month == 2 and day == 29 and not calendar.isleap(year):
+                day = 28
+            birthday = date(year, date_of_birth.month, day)
+            if birthday >= today:
+                return birthday
+        return birthday
+
+    @staticmethod
+    def turning_age(date_of_birth: date, birthday: date) -> Optional[int]:
+        age = birthday.year - date_of_birth.year
+        return age if age > 0 else None
@@ -0,0 +1,24 @@
+import base64
+import json
+from typing import Any, List
+
+
+class CursorUtils:
+    """Opaque keyset pagination cursors: the sort key of the last row, base64 encoded"""
+
+    @staticmethod
+    def encode(*values: Any) -> str:
+        raw = json.dumps(list(values), separators=(",", ":"), default=str)
+        return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+    @staticmethod
+    def decode(cursor: str, size: int) -> List[Any]:
+        """Decode a cursor holding `size` values; raises ValueError if it is malformed"""
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        except (ValueError, UnicodeDecodeError):
+            raise ValueError("Invalid cursor")
+        if not isinstance(values, list) or len(values) != size:
+            raise ValueError("Invalid cursor")
+        return values
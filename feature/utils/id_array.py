@@ -0,0 +1,36 @@
+import sys
+from array import array
+from typing import Iterable
+
+
+class IdArrayUtils:
+    """Helpers for compact sorted arrays of integer user ids"""
+
+    TYPECODE = 'i'  # 32-bit, matches the Integer user id columns
+
+    @staticmethod
+    def from_ids(ids: Iterable[int]) -> array:
+        """Build a sorted, de-duplicated id array"""
+        return array(IdArrayUtils.TYPECODE, sorted(set(ids)))
+
+    @staticmethod
+    def pack(ids: array) -> bytes:
+        """Serialize an id array as little-endian bytes for storage"""
+        if sys.byteorder == 'big':
+            ids = array(IdArrayUtils.TYPECODE, ids)
+            ids.byteswap()
+        return ids.tobytes()
+
+    @staticmethod
+    def unpack(data: bytes) -> array:
+        ids = array(IdArrayUtils.TYPECODE)
+        if data:
+            ids.frombytes(data)
+            if sys.byteorder == 'big':
+                ids.byteswap()
+        return ids
+
+    @staticmethod
+    def merge(ids: array, new_ids: Iterable[int]) -> array:
+        """Return a sorted array with new_ids added (the input is not modified)"""
+        return IdArrayUtils.from_ids(list(ids) + list(new_ids))
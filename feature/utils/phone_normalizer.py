@@ -0,0 +1,137 @@
+import re
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# Country calling code -> allowed national significant number lengths.
+# Used to split international numbers written without a "+".
+CALLING_CODES: Dict[str, Tuple[int, ...]] = {
+    "1": (10,), "7": (10,), "20": (10,), "27": (9,), "30": (10,), "31": (9,),
+    "32": (8, 9), "33": (9,), "34": (9,), "36": (8, 9), "39": tuple(range(6, 12)),
+    "40": (9,), "41": (9,), "43": tuple(range(7, 14)), "44": (9, 10), "45": (8,),
+    "46": tuple(range(7, 11)), "47": (8,), "48": (9,), "49": tuple(range(6, 14)),
+    "51": (9,), "52": (10,), "54": (10,), "55": (10, 11), "56": (9,), "57": (10,),
+    "60": (9, 10), "61": (9,), "62": tuple(range(9, 13)), "63": (10,), "64": (8, 9, 10),
+    "65": (8,), "66": (9,), "81": (9, 10), "82": (9, 10), "84": (9, 10), "86": (10, 11),
+    "90": (10,), "91": (10,), "92": (10,), "93": (9,), "94": (9,), "95": (8, 9, 10),
+    "98": (10,), "212": (9,), "234": (10,), "254": (9,), "255": (9,), "256": (9,),
+    "351": (9,), "353": (9,), "358": tuple(range(6, 11)), "852": (8,), "880": (10,),
+    "886": (9,), "961": (7, 8), "962": (9,), "965": (8,), "966": (9,), "971": (8, 9),
+    "972": (9,), "974": (8,), "977": (10,),
+}
+
+# Region -> (calling code, national trunk prefix). Numbers read in the context
+# of a region missing here are only accepted in international form.
+REGIONS: Dict[str, Tuple[str, str]] = {
+    "US": ("1", "1"), "CA": ("1", "1"), "RU": ("7", "8"), "EG": ("20", "0"),
+    "ZA": ("27", "0"), "GR": ("30", ""), "NL": ("31", "0"), "BE": ("32", "0"),
+    "FR": ("33", "0"), "ES": ("34", ""), "HU": ("36", "06"), "IT": ("39", ""),
+    "RO": ("40", "0"), "CH": ("41", "0"), "AT": ("43", "0"), "GB": ("44", "0"),
+    "DK": ("45", ""), "SE": ("46", "0"), "NO": ("47", ""), "PL": ("48", ""),
+    "DE": ("49", "0"), "PE": ("51", "0"), "MX": ("52", ""), "AR": ("54", "0"),
+    "BR": ("55", "0"), "CL": ("56", ""), "CO": ("57", ""), "MY": ("60", "0"),
+    "AU": ("61", "0"), "ID": ("62", "0"), "PH": ("63", "0"), "NZ": ("64", "0"),
+    "SG": ("65", ""), "TH": ("66", "0"), "JP": ("81", "0"), "KR": ("82", "0"),
+    "VN": ("84", "0"), "CN": ("86", "0"), "TR": ("90", "0"), "IN": ("91", "0"),
+    "PK": ("92", "0"), "AF": ("93", "0"), "LK": ("94", "0"), "MM": ("95", "0"),
+    "IR": ("98", "0"), "MA": ("212", "0"), "NG": ("234", "0"), "KE": ("254", "0"),
+    "TZ": ("255", "0"), "UG": ("256", "0"), "PT": ("351", ""), "IE": ("353", "0"),
+    "FI": ("358", "0"), "HK": ("852", ""), "BD": ("880", "0"), "TW": ("886", "0"),
+    "LB": ("961", "0"), "JO": ("962", "0"), "KW": ("965", ""), "SA": ("966", "0"),
+    "AE": ("971", "0"), "IL": ("972", "0"), "QA": ("974", ""), "NP": ("977", "0"),
+}
+
+# Preferred region for a calling code shared by several regions
+_REGION_BY_CODE: Dict[str, str] = {}
+for _region, (_code, _trunk) in REGIONS.items():
+    _REGION_BY_CODE.setdefault(_code, _region)
+
+_MAX_CODE_LENGTH = max(len(code) for code in CALLING_CODES)
+_STRIP = re.compile(r"[^\d+\n]+")
+_STRIP_ONE = re.compile(r"[^\d+]+")
+
+
+class PhoneNormalizer:
+    """
+    Canonicalizes raw phone numbers to E.164 ("+<country code><number>").
+
+    Numbers without an international prefix are read in the context of a
+    region (normally the owner's own country), so a contact stored as
+    "098765 43210" by an Indian user and "+91 98765 43210" by anyone else
+    resolve to the same key.
+    """
+
+    def __init__(self, region: str):
+        self.region = region.upper()
+        self.country_code, self.trunk_prefix = REGIONS.get(self.region, ("", "0"))
+        self.national_lengths = CALLING_CODES.get(self.country_code, ())
+        self.intl_prefixes = ("011",) if self.country_code == "1" else ("00",)
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def for_region(region: str) -> "PhoneNormalizer":
+        """Shared normalizer instance per region"""
+        return PhoneNormalizer(region)
+
+    @staticmethod
+    def region_for_number(e164: Optional[str]) -> Optional[str]:
+        """Region of an already canonical number, by longest calling code prefix"""
+        if not e164 or not e164.startswith("+"):
+            return None
+        digits = e164[1:]
+        for length in range(_MAX_CODE_LENGTH, 0, -1):
+            region = _REGION_BY_CODE.get(digits[:length])
+            if region:
+                return region
+        return None
+
+    @staticmethod
+    def _split_international(digits: str) -> Optional[str]:
+        """Accept digits as <calling code><national number> if the lengths fit"""
+        for length in range(1, _MAX_CODE_LENGTH + 1):
+            national_lengths = CALLING_CODES.get(digits[:length])
+            if national_lengths and len(digits) - length in national_lengths:
+                return "+" + digits
+        return None
+
+    def _canonicalize(self, cleaned: str) -> Optional[str]:
+        if cleaned.startswith("+"):
+            digits = cleaned.replace("+", "")
+            return "+" + digits if 8 <= len(digits) <= 15 else None
+
+        digits = cleaned.replace("+", "")
+        for prefix in self.intl_prefixes:
+            if digits.startswith(prefix):
+                digits = digits[len(prefix):]
+                return "+" + digits if 8 <= len(digits) <= 15 else None
+
+        if self.country_code:
+            if len(digits) in self.national_lengths:
+                return "+" + self.country_code + digits
+
+            trunk = self.trunk_prefix
+            if trunk and digits.startswith(trunk) and len(digits) - len(trunk) in self.national_lengths:
+                return "+" + self.country_code + digits[len(trunk):]
+
+        # International number written without "+" or "00"
+        return self._split_international(digits)
+
+    def normalize(self, phone: Optional[str]) -> Optional[str]:
+        """Canonical E.164 form of one number, or None if it cannot be a phone number"""
+        if not phone:
+            return None
+        return self._canonicalize(_STRIP_ONE.sub("", phone))
+
+    def normalize_batch(self, phones: Sequence[str]) -> List[Optional[str]]:
+        """
+        Canonicalize many numbers at once. Punctuation is stripped from the
+        whole batch with a single regex pass before the per-number rules run.
+        """
+        if not phones:
+            return []
+
+        cleaned = _STRIP.sub("", "\n".join(phones)).split("\n")
+        if len(cleaned) != len(phones):  # A number contained a newline
+            cleaned = [_STRIP_ONE.sub("", phone) for phone in phones]
+
+        canonicalize = self._canonicalize
+        return [canonicalize(number) if number else None for number in cleaned]
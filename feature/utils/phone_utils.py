@@ -0,0 +1,34 @@
+import hashlib
+from typing import Iterable, List, Optional
+from app.core.config import settings
+from .phone_normalizer import PhoneNormalizer
+
+
+class PhoneUtils:
+    @staticmethod
+    def normalize_phone(phone: str) -> str:
+        """Remove all non-digit characters from phone number"""
+        return ''.join(filter(str.isdigit, phone))
+
+    @staticmethod
+    def to_e164(phone: Optional[str], region: Optional[str] = None) -> Optional[str]:
+        """Canonical E.164 form of a number, read in the given (or default) region"""
+        return PhoneNormalizer.for_region(region or settings.DEFAULT_PHONE_REGION).normalize(phone)
+
+    @staticmethod
+    def region_for_phone(phone: Optional[str]) -> str:
+        """Region implied by a user's canonical phone, used as context for their contacts"""
+        return PhoneNormalizer.region_for_number(phone) or settings.DEFAULT_PHONE_REGION
+
+    @staticmethod
+    def get_index_keys(phone: str) -> List[str]:
+        """The lookup key stored for a registered user's phone: its E.164 form"""
+        e164 = PhoneUtils.to_e164(phone)
+        return [e164] if e164 else []
+
+    @staticmethod
+    def fingerprint(phone_keys: Iterable[str]) -> str:
+        """SHA-256 of the sorted, de-duplicated phone keys (E.164 where known), one per line"""
+        keys = set(phone_keys)
+        keys.discard("")
+        return hashlib.sha256("\n".join(sorted(keys)).encode()).hexdigest()
@@ -28,6 +28,17 @@ from app.services.user_service import UserService
 from app.core.security import create_jwt_token
 from feature.controllers.otp_controller import router as otp_router
 from feature.controllers.friend_controller import router as friend_router
+from feature.controllers.notification_controller import router as notification_router
+from feature.services.contact_job_service import contact_sync_job_runner
+from feature.services.phone_index_cache import phone_index_cache
+from feature.services.friend_set_cache import friend_set_cache
+from feature.services.block_set_cache import block_set_cache
+from feature.services.count_cache import count_cache
+from feature.services.room_activity_buffer import room_activity_buffer
+from feature.services.participant_heartbeat_buffer import participant_heartbeat_buffer
+from feature.services.friend_suggestion_engine import friend_suggestion_engine
+from feature.services.social_counter_repair_job import social_counter_repair_job
+import asyncio
 
 # Add this with your other app.include_router calls
 
@@ -78,10 +89,38 @@ app.include_router(
     prefix=settings.API_V1_STR,
     tags=["Friends"]
 )
+app.include_router(
+    notification_router,
+    prefix=settings.API_V1_STR,
+    tags=["Notifications"]
+)
 
 @app.on_event("startup")
 async def startup_event():
     create_tables()
+    # Resume contact sync jobs interrupted by a restart, then keep watching
+    await contact_sync_job_runner.resume_pending_jobs()
+    app.state.contact_job_watcher = asyncio.create_task(contact_sync_job_runner.watch_stale_jobs())
+    app.state.friend_suggestion_task = asyncio.create_task(friend_suggestion_engine.run_periodically())
+    app.state.social_counter_repair_task = asyncio.create_task(social_counter_repair_job.run_periodically())
+    app.state.room_activity_task = asyncio.create_task(room_activity_buffer.run_periodically())
+    app.state.participant_heartbeat_task = asyncio.create_task(participant_heartbeat_buffer.run_periodically())
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    app.state.contact_job_watcher.cancel()
+    app.state.friend_suggestion_task.cancel()
+    app.state.social_counter_repair_task.cancel()
+    app.state.room_activity_task.cancel()
+    app.state.participant_heartbeat_task.cancel()
+    # Don't lose the last interval's room views and heartbeats
+    for buffer in (room_activity_buffer, participant_heartbeat_buffer):
+        try:
+            buffer.flush()
+        except Exception as e:
+            print(f"Warning: could not flush {buffer.name}: {str(e)}")
+    contact_sync_job_runner.shutdown()
 
 
 @app.post("/token", response_model=AuthResponse)
@@ -164,7 +203,15 @@ async def health_check():
         data={
             "status": "healthy",
             "timestamp": datetime.utcnow(),
-            "version": settings.VERSION
+            "version": settings.VERSION,
+            "caches": {
+                "phone_index": phone_index_cache.stats(),
+                "friend_sets": friend_set_cache.stats(),
+                "block_sets": block_set_cache.stats(),
+                "counts": count_cache.stats(),
+                "room_activity": room_activity_buffer.stats(),
+                "participant_heartbeats": participant_heartbeat_buffer.stats()
+            }
         }
     )
 
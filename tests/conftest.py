@@ -0,0 +1,72 @@
+import os
+import tempfile
+from datetime import datetime, timedelta
+
+# Settings are read when the app is first imported, so point it at a
+# throwaway SQLite database before anything imports app.core
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='birthday_app_tests_'), 'test.db')}")
+os.environ.setdefault("DATABASE_PASSWORD", "")
+os.environ.setdefault("TWILIO_ACCOUNT_SID", "test")
+os.environ.setdefault("TWILIO_AUTH_TOKEN", "test")
+os.environ.setdefault("TWILIO_FROM_NUMBER", "+10000000000")
+
+import pytest  # noqa: E402
+
+import main  # noqa: E402,F401  Registers every model with Base.metadata
+from app.core.database import Base, SessionLocal, create_tables  # noqa: E402
+from app.models.user import User  # noqa: E402
+from feature.models.room import Room, RoomParticipant, RoomPrivacy, RoomStatus  # noqa: E402
+from feature.services.phone_index_service import PhoneIndexService  # noqa: E402
+
+
+@pytest.fixture(scope="session", autouse=True)
+def tables():
+    create_tables()
+
+
+@pytest.fixture
+def db():
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.rollback()
+        for table in reversed(Base.metadata.sorted_tables):
+            # The process-wide caches compare their state against these; keep them monotonic
+            if table.name not in ("cache_generations", "cache_changes"):
+                session.execute(table.delete())
+        session.commit()
+        session.close()
+
+
+@pytest.fixture
+def users(db):
+    created = [User(phone=f"+91987654321{i}", first_name=f"user{i}") for i in range(4)]
+    db.add_all(created)
+    db.commit()
+    for user in created:
+        PhoneIndexService.index_user(db, user)
+    return created
+
+
+@pytest.fixture
+def room(db, users):
+    """An active public room owned by users[0] (its approved admin), for three participants"""
+    now = datetime.utcnow()
+    created = Room(
+        owner_id=users[0].id,
+        room_name="party",
+        privacy_type=RoomPrivacy.PUBLIC,
+        status=RoomStatus.ACTIVE,
+        max_participants=3,
+        approved_count=1,
+        total_count=1,
+        activation_time=now - timedelta(days=1),
+        expiration_time=now + timedelta(days=1),
+        last_activity=datetime(2026, 1, 1),
+    )
+    db.add(created)
+    db.flush()
+    db.add(RoomParticipant(room_id=created.id, user_id=users[0].id, is_admin=True, status="approved"))
+    db.commit()
+    return created
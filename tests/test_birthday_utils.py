@@ -0,0 +1,33 @@
+from datetime import date
+
+from feature.utils.birthday_utils import BirthdayUtils
+
+
+def test_window_within_one_month():
+    assert BirthdayUtils.window_ranges(date(2026, 3, 10), 7) == [(310, 317)]
+
+
+def test_window_crossing_new_year_is_split():
+    assert BirthdayUtils.window_ranges(date(2026, 12, 28), 7) == [(1228, 1231), (101, 104)]
+
+
+def test_window_ending_feb_28_in_non_leap_year_includes_feb_29():
+    assert BirthdayUtils.window_ranges(date(2026, 2, 20), 8) == [(220, 229)]
+
+
+def test_window_ending_feb_28_in_leap_year_stops_there():
+    assert BirthdayUtils.window_ranges(date(2028, 2, 20), 8) == [(220, 228)]
+
+
+def test_whole_year_window_starts_today():
+    assert BirthdayUtils.window_ranges(date(2026, 6, 15), 365) == [(615, 1231), (101, 614)]
+    assert BirthdayUtils.window_ranges(date(2026, 1, 1), 400) == [(101, 1231)]
+
+
+def test_zero_day_window_is_today_only():
+    assert BirthdayUtils.window_ranges(date(2026, 7, 4), 0) == [(704, 704)]
+
+
+def test_next_birthday_of_feb_29_in_non_leap_year():
+    assert BirthdayUtils.next_birthday(date(2000, 2, 29), date(2026, 2, 1)) == date(2026, 2, 28)
+    assert BirthdayUtils.next_birthday(date(2000, 2, 29), date(2026, 3, 1)) == date(2027, 2, 28)
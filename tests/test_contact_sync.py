@@ -0,0 +1,65 @@
+import asyncio
+
+from feature.models.contact import ContactAdjacency, ContactRegistry
+from feature.repository.contact_graph_repository import ContactGraphRepository
+from feature.schemas.contact_schema import ContactInfo
+from feature.services.contact_service import ContactService
+from feature.utils.id_array import IdArrayUtils
+
+
+def sync(db, owner, phone_numbers):
+    service = ContactService()
+    asyncio.run(service.sync_contacts(db, owner.id, [ContactInfo(name="n", phone_number=p) for p in phone_numbers]))
+    return asyncio.run(service.get_fingerprint(db, owner.id))
+
+
+def registry(db, owner):
+    db.expire_all()
+    return sorted(phone for (phone,) in db.query(ContactRegistry.phone_number).filter(
+        ContactRegistry.owner_id == owner.id
+    ).all())
+
+
+def test_full_sync_replaces_the_owner_contact_set(db, users):
+    sync(db, users[0], ["9876543211", "+91 98765 43212", "5550001"])
+    sync(db, users[0], ["9876543211", "+91 98765 43212"])
+
+    assert registry(db, users[0]) == ["+91 98765 43212", "9876543211"]
+
+
+def test_fingerprint_uses_canonical_numbers(db, users):
+    first = sync(db, users[0], ["9876543211"])
+    second = sync(db, users[0], ["+91 98765-43211"])
+
+    assert first == second
+
+
+def test_delta_removes_a_number_written_differently(db, users):
+    fingerprint = sync(db, users[0], ["9876543211", "+91 98765 43212"])
+
+    result = asyncio.run(ContactService().sync_contacts_delta(db, users[0].id, fingerprint, [], ["98765 43212"]))
+
+    assert not result.full_sync_required
+    assert registry(db, users[0]) == ["9876543211"]
+    assert result.fingerprint == sync(db, users[0], ["9876543211"])
+
+
+def stored_contacts(db, owner):
+    db.expire_all()
+    row = db.get(ContactAdjacency, owner.id)
+    return None if row is None else list(IdArrayUtils.unpack(row.contact_ids))
+
+
+def test_resync_merges_into_the_stored_array(db, users):
+    sync(db, users[0], [users[1].phone])
+    sync(db, users[0], [users[1].phone, users[2].phone])
+
+    assert stored_contacts(db, users[0]) == [users[1].id, users[2].id]
+
+
+def test_dropped_match_rebuilds_the_array(db, users):
+    sync(db, users[0], [users[1].phone, users[2].phone])
+    sync(db, users[0], [users[2].phone])
+
+    adjacency = asyncio.run(ContactGraphRepository.get_adjacency(db, [users[0].id]))
+    assert list(adjacency[users[0].id]) == [users[2].id]
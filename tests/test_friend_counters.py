@@ -0,0 +1,84 @@
+import asyncio
+
+from app.models.user import User
+from feature.models.friend import FriendRequestStatus
+from feature.repository.friend_repository import FriendRepository
+from feature.services.friend_service import FriendService
+
+
+def counters(db, user):
+    db.expire_all()
+    user = db.get(User, user.id)
+    return user.friend_count, user.incoming_pending_count, user.outgoing_pending_count
+
+
+def send_request(db, requester, receiver):
+    success, message, request = asyncio.run(FriendService().create_friend_request(db, requester.id, receiver.id))
+    assert success, message
+    return request
+
+
+def test_request_moves_pending_counters(db, users):
+    send_request(db, users[0], users[1])
+
+    assert counters(db, users[0]) == (0, 0, 1)
+    assert counters(db, users[1]) == (0, 1, 0)
+
+
+def test_accept_moves_counters_once(db, users):
+    request = send_request(db, users[0], users[1])
+
+    success, _, _ = asyncio.run(FriendService().handle_friend_request(db, request.id, users[1].id, "accept"))
+
+    assert success
+    assert counters(db, users[0]) == (1, 0, 0)
+    assert counters(db, users[1]) == (1, 0, 0)
+
+
+def test_stale_status_update_changes_nothing(db, users):
+    request = send_request(db, users[0], users[1])
+    stale = asyncio.run(FriendRepository.get_friend_request(db, request.id))
+    asyncio.run(FriendService().handle_friend_request(db, request.id, users[1].id, "accept"))
+
+    # A handler that read the request while it was still pending
+    assert asyncio.run(FriendRepository.update_request_status(db, stale, FriendRequestStatus.DECLINED)) is None
+
+    db.expire_all()
+    assert asyncio.run(FriendRepository.get_friend_request(db, request.id)).status == FriendRequestStatus.ACCEPTED
+    assert counters(db, users[0]) == (1, 0, 0)
+    assert counters(db, users[1]) == (1, 0, 0)
+
+
+def test_stale_accept_rolls_back_the_staged_friendship(db, users):
+    request = send_request(db, users[0], users[1])
+    stale = asyncio.run(FriendRepository.get_friend_request(db, request.id))
+    asyncio.run(FriendService().cancel_friend_request(db, request.id, users[0].id))
+
+    asyncio.run(FriendRepository.add_friendship(db, users[0].id, users[1].id))
+    assert asyncio.run(FriendRepository.update_request_status(db, stale, FriendRequestStatus.ACCEPTED)) is None
+
+    assert asyncio.run(FriendRepository.get_friend_ids(db, users[0].id)) == []
+    assert counters(db, users[0]) == (0, 0, 0)
+    assert counters(db, users[1]) == (0, 0, 0)
+
+
+def test_handled_request_cannot_be_canceled(db, users):
+    request = send_request(db, users[0], users[1])
+    asyncio.run(FriendService().handle_friend_request(db, request.id, users[1].id, "decline"))
+
+    success, _ = asyncio.run(FriendService().cancel_friend_request(db, request.id, users[0].id))
+
+    assert not success
+    assert counters(db, users[0]) == (0, 0, 0)
+    assert counters(db, users[1]) == (0, 0, 0)
+
+
+def test_recount_repairs_drift(db, users):
+    send_request(db, users[0], users[1])
+    db.query(User).update({User.outgoing_pending_count: 5}, synchronize_session=False)
+    db.commit()
+
+    assert FriendRepository.recount_social_counters(db, users[0].id, users[-1].id) == len(users)
+    db.commit()
+    assert counters(db, users[0]) == (0, 0, 1)
+    assert counters(db, users[2]) == (0, 0, 0)
@@ -0,0 +1,45 @@
+from feature.utils.phone_normalizer import PhoneNormalizer
+
+
+def test_normalize_batch_matches_normalize():
+    normalizer = PhoneNormalizer.for_region("IN")
+    phones = [
+        "+91 98765 43210",
+        "098765 43210",
+        "9876543210",
+        "0044 20 7946 0958",
+        "+1 (415) 555-0100",
+        "14155550100",
+        "*123#",
+        "121",
+    ]
+    assert normalizer.normalize_batch(phones) == [normalizer.normalize(phone) for phone in phones]
+
+
+def test_normalize_batch_reads_local_numbers_in_the_owner_region():
+    assert PhoneNormalizer.for_region("IN").normalize_batch(["098765 43210"]) == ["+919876543210"]
+    assert PhoneNormalizer.for_region("US").normalize_batch(["(415) 555-0100", "011 44 20 7946 0958"]) == [
+        "+14155550100",
+        "+442079460958",
+    ]
+
+
+def test_normalize_batch_keeps_positions_for_empty_and_invalid_numbers():
+    assert PhoneNormalizer.for_region("IN").normalize_batch(["", "abc", "9876543210", "12"]) == [
+        None,
+        None,
+        "+919876543210",
+        None,
+    ]
+
+
+def test_normalize_batch_handles_numbers_containing_newlines():
+    normalizer = PhoneNormalizer.for_region("IN")
+    assert normalizer.normalize_batch(["98765\n43210", "+14155550100"]) == [
+        normalizer.normalize("98765\n43210"),
+        "+14155550100",
+    ]
+
+
+def test_normalize_batch_empty():
+    assert PhoneNormalizer.for_region("IN").normalize_batch([]) == []
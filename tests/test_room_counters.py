@@ -0,0 +1,70 @@
+import asyncio
+
+from feature.models.room import Room, RoomParticipant
+from feature.services.room_service import RoomService
+
+
+def room_counters(db, room):
+    db.expire_all()
+    room = db.get(Room, room.id)
+    return room.approved_count, room.pending_count, room.total_count
+
+
+def add_pending(db, room, *users):
+    for user in users:
+        success, message, _ = asyncio.run(RoomService.join_room(db, room.id, user.id))
+        assert success, message
+
+
+def test_join_counts_pending_participants(db, room, users):
+    add_pending(db, room, users[1], users[2])
+
+    assert room_counters(db, room) == (1, 2, 3)
+
+
+def test_stale_approval_moves_counters_once(db, room, users):
+    add_pending(db, room, users[1])
+
+    assert RoomService._move_participants(db, room.id, [users[1].id], "pending", "approved") == 1
+    # A second admin that read the participant while it was still pending
+    assert RoomService._move_participants(db, room.id, [users[1].id], "pending", "approved") == 0
+    db.commit()
+
+    assert room_counters(db, room) == (2, 0, 2)
+
+
+def test_update_participant_enforces_capacity_and_rolls_back(db, room, users):
+    add_pending(db, room, users[1], users[2], users[3])
+    for user in users[1:3]:
+        success, message, _ = asyncio.run(RoomService.update_participant(db, room.id, users[0].id, user.id, "approved"))
+        assert success, message
+
+    success, message, _ = asyncio.run(RoomService.update_participant(db, room.id, users[0].id, users[3].id, "approved"))
+
+    assert not success
+    assert message == "Room has reached maximum participants"
+    db.expire_all()
+    participant = db.query(RoomParticipant).filter_by(room_id=room.id, user_id=users[3].id).one()
+    assert participant.status == "pending"
+    assert room_counters(db, room) == (3, 1, 4)
+
+
+def test_bulk_update_shifts_each_status_group(db, room, users):
+    add_pending(db, room, users[1], users[2], users[3])
+    asyncio.run(RoomService.update_participant(db, room.id, users[0].id, users[1].id, "approved"))
+
+    success, message, _ = asyncio.run(
+        RoomService.bulk_update_participants(db, room.id, users[0].id, [user.id for user in users[1:]], "reject")
+    )
+
+    assert success, message
+    assert room_counters(db, room) == (1, 0, 4)
+
+
+def test_stats_total_counts_every_participant(db, room, users):
+    add_pending(db, room, users[1], users[2])
+    asyncio.run(RoomService.update_participant(db, room.id, users[0].id, users[1].id, "rejected"))
+
+    stats = asyncio.run(RoomService.get_room_stats(db, room.id))
+
+    assert (stats.total_participants, stats.active_participants, stats.pending_requests) == (3, 1, 1)
@@ -0,0 +1,119 @@
+from datetime import datetime, timedelta
+
+import asyncio
+
+import pytest
+
+from feature.models.room import Room, RoomParticipant
+from feature.services import write_behind_buffer
+from feature.services.participant_heartbeat_buffer import ParticipantHeartbeatBuffer, participant_heartbeat_buffer
+from feature.services.room_activity_buffer import RoomActivityBuffer
+from feature.services.room_service import RoomService
+
+
+def last_activity(db, room_id):
+    db.expire_all()
+    return db.get(Room, room_id).last_activity.replace(tzinfo=None)
+
+
+def participant(db, room_id, user_id):
+    db.expire_all()
+    return db.query(RoomParticipant).filter_by(room_id=room_id, user_id=user_id).one()
+
+
+def test_flush_writes_latest_touch_per_key_once(db, room):
+    buffer = RoomActivityBuffer(flush_seconds=60)
+    first = datetime(2026, 5, 1, 12, 0)
+    buffer.touch(room.id, first + timedelta(minutes=5))
+    buffer.touch(room.id, first)  # Older touch does not win
+    buffer.touch(room.id, first + timedelta(minutes=2))
+
+    assert buffer.flush() == 1
+    assert last_activity(db, room.id) == first + timedelta(minutes=5)
+    assert buffer.stats() == {
+        "pending": 0,
+        "touches": 3,
+        "keys_flushed": 1,
+        "flushes": 1,
+        "coalescing_ratio": 3.0,
+    }
+    assert buffer.flush() == 0
+
+
+def test_flush_never_moves_a_timestamp_backwards(db, room):
+    buffer = RoomActivityBuffer(flush_seconds=60)
+    buffer.touch(room.id, datetime(2025, 1, 1))
+
+    buffer.flush()
+    assert last_activity(db, room.id) == datetime(2026, 1, 1)
+
+
+def test_failed_flush_requeues_its_touches(db, room, monkeypatch):
+    buffer = RoomActivityBuffer(flush_seconds=60)
+    touched_at = datetime(2026, 5, 1, 12, 0)
+    buffer.touch(room.id, touched_at)
+
+    def unavailable():
+        raise RuntimeError("database unavailable")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(write_behind_buffer, "get_db", unavailable)
+        with pytest.raises(RuntimeError):
+            buffer.flush()
+
+    assert buffer.stats()["pending"] == 1
+    assert buffer.stats()["flushes"] == 0
+
+    # A touch made meanwhile still wins if it is newer
+    buffer.touch(room.id, touched_at + timedelta(minutes=1))
+    assert buffer.flush() == 1
+    assert last_activity(db, room.id) == touched_at + timedelta(minutes=1)
+    assert buffer.stats()["coalescing_ratio"] == 2.0
+
+
+def test_heartbeat_flush_writes_latest_touch_per_participant(db, room, users):
+    db.add(RoomParticipant(room_id=room.id, user_id=users[1].id, status="approved"))
+    db.commit()
+    buffer = ParticipantHeartbeatBuffer(flush_seconds=60)
+    first = datetime(2026, 5, 1, 12, 0)
+    buffer.touch((room.id, users[0].id), first + timedelta(minutes=3))
+    buffer.touch((room.id, users[0].id), first)
+    buffer.touch((room.id, users[1].id), first + timedelta(minutes=1))
+
+    assert buffer.flush() == 2
+    assert participant(db, room.id, users[0].id).last_active_at.replace(tzinfo=None) == first + timedelta(minutes=3)
+    assert participant(db, room.id, users[1].id).last_active_at.replace(tzinfo=None) == first + timedelta(minutes=1)
+
+
+def test_heartbeat_flush_leaves_updated_at_alone(db, room, users):
+    row = participant(db, room.id, users[0].id)
+    row.updated_at = datetime(2026, 1, 1)
+    db.commit()
+    buffer = ParticipantHeartbeatBuffer(flush_seconds=60)
+    buffer.touch((room.id, users[0].id), datetime(2026, 5, 1, 12, 0))
+
+    buffer.flush()
+    row = participant(db, room.id, users[0].id)
+    assert row.last_active_at.replace(tzinfo=None) == datetime(2026, 5, 1, 12, 0)
+    assert row.updated_at.replace(tzinfo=None) == datetime(2026, 1, 1)
+
+
+def test_heartbeat_for_non_participant_matches_no_row(db, room, users):
+    buffer = ParticipantHeartbeatBuffer(flush_seconds=60)
+    buffer.touch((room.id, users[1].id), datetime(2026, 5, 1, 12, 0))
+
+    buffer.flush()
+    assert db.query(RoomParticipant).filter_by(room_id=room.id, user_id=users[1].id).count() == 0
+    assert participant(db, room.id, users[0].id).last_active_at is None
+
+
+def test_heartbeat_from_non_participant_is_not_buffered(db, room, users):
+    pending = participant_heartbeat_buffer.stats()["pending"]
+
+    assert asyncio.run(RoomService.update_participant_activity(db, room.id, users[1].id)) is None
+    assert asyncio.run(RoomService.update_participant_activity(db, "no-such-room", users[0].id)) is None
+    assert participant_heartbeat_buffer.stats()["pending"] == pending
+
+    assert asyncio.run(RoomService.update_participant_activity(db, room.id, users[0].id)) is not None
+    assert participant_heartbeat_buffer.is_pending((room.id, users[0].id))
+    participant_heartbeat_buffer.flush()